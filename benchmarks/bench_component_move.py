@@ -0,0 +1,48 @@
+"""Benchmark stacking the movement of one joint against a whole arm."""
+
+import argparse
+import time
+
+from johnnyv.core.Batch import Batch
+from johnnyv.core.Component import Component
+
+
+def microseconds(function, *args):
+    """
+    :param function: Callable to be measured.
+    :param args: Arguments of the callable.
+    :return: Duration of the call in microseconds.
+    """
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200, help='Number of measurements.')
+    args = parser.parse_args()
+
+    left_arm = Component('left_arm')
+    left_arm.error = lambda string: None
+    pins = [servo.pin for servo in left_arm.servos]
+    degrees = [max(servo.min_pulse, 90) for servo in left_arm.servos]
+    batch = Batch()
+
+    def measure(function, *arguments):
+        results = []
+        for _ in range(args.count):
+            results.append(microseconds(function, *arguments))
+            batch.discard()
+        return min(results)
+
+    single = measure(left_arm.move_servo, [(pins[0], degrees[0], False)], batch)
+    tuples = measure(left_arm.move_servo, [(pin, degree, False) for (pin, degree) in zip(pins, degrees)], batch)
+    bulk = measure(left_arm.move_servos, pins, degrees, batch)
+
+    print('one joint {0:6.1f} us, arm of {1} joints: move_servo {2:6.1f} us, move_servos {3:6.1f} us'.format(
+        single, len(pins), tuples, bulk))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
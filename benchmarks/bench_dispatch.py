@@ -0,0 +1,82 @@
+"""Benchmark the notification of servo observers after moves with many registered servos."""
+
+import argparse
+import time
+
+from johnnyv.core.Controller import Controller
+from johnnyv.core.ServoMotor import ServoMotor
+
+
+def servos(count):
+    """
+    :param count: Number of servos.
+    :return: List of servos, each one depending on its predecessor.
+    """
+    return [ServoMotor([pin - 1] if pin else [], pin, 180, 0, 180, 0, 1000, 90) for pin in range(count)]
+
+
+def legacy_register(observers):
+    """
+    :param observers: List of servos.
+    :return: List of the registered servos.
+
+    Registration as done before: a 'not in' check against a list per observer.
+    """
+    registered = []
+
+    for observer in observers:
+        if observer not in registered:
+            registered.append(observer)
+    return registered
+
+
+def legacy_dispatch(registered, pin, degree):
+    """
+    :param registered: List of registered servos.
+    :param pin: Pin of the moved servo.
+    :param degree: Degree of the movement.
+    :return: True for successful updating.
+
+    Notification as done before: every registered servo for every move.
+    """
+    for servo in registered:
+        servo.update(pin, degree)
+    return True
+
+
+def microseconds(function, *args):
+    """
+    :param function: Callable to be measured.
+    :param args: Arguments of the callable.
+    :return: Duration of the call in microseconds.
+    """
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=5, help='Number of measurements.')
+    args = parser.parse_args()
+
+    for count in (32, 256, 2048):
+        observers = servos(count)
+        legacy_registration = min(microseconds(legacy_register, observers) for _ in range(args.count))
+        registered = legacy_register(observers)
+        legacy = min(microseconds(legacy_dispatch, registered, count // 2, 90) for _ in range(args.count))
+
+        registration = []
+        for _ in range(args.count):
+            Controller.remove_all_servos()
+            registration.append(microseconds(Controller.add_servos, observers))
+        indexed = min(microseconds(Controller.update_servo_information, count // 2, 90) for _ in range(args.count))
+        Controller.remove_all_servos()
+
+        print('{0:5} servos: register legacy {1:9.1f} us, indexed {2:8.1f} us; '
+              'dispatch legacy {3:8.1f} us, indexed {4:6.1f} us'.format(count, legacy_registration, min(registration),
+                                                                       legacy, indexed))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
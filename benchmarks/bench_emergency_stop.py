@@ -0,0 +1,93 @@
+"""Benchmark the latency of SSC32U emergency stops under load against stops queued behind the command lock."""
+
+import argparse
+import random
+import threading
+import time
+
+from johnnyv.core.SSC32U import SSC32U
+from johnnyv.testing.SSC32UEmulator import SSC32UEmulator
+
+
+def queued_stop(ssc32u):
+    """
+    :param ssc32u: SSC32U instance.
+    :return: True for successful stopping.
+
+    Stop as sent before the priority lane: waits for the command lock like every other command.
+    """
+    return ssc32u.transfer(''.join('STOP ' + str(channel) + ' ' for channel in range(32)).encode() + b'\r')
+
+
+def priority_stop(ssc32u):
+    """
+    :param ssc32u: SSC32U instance.
+    :return: True for successful stopping.
+    """
+    return ssc32u.emergency_stop()
+
+
+def load(ssc32u, running):
+    """
+    :param ssc32u: SSC32U instance.
+    :param running: Event, the load stops once it is cleared.
+
+    Streams movements and queries like a running robot.
+    """
+    pulse = 1000
+
+    while running.is_set():
+        pulse = 3000 - pulse
+        ssc32u.exec_command(['16:' + str(pulse) + ':20', '17:' + str(pulse) + ':20'], wait=False)
+        ssc32u.get_baud()
+        ssc32u.is_done()
+
+
+def latency(stop, ssc32u, count):
+    """
+    :param stop: Callable stopping all channels of 'ssc32u'.
+    :param ssc32u: SSC32U instance.
+    :param count: Number of stops.
+    :return: Mean and maximum time from the call until the stop line has been written, in milliseconds.
+    """
+    running = threading.Event()
+    running.set()
+    thread = threading.Thread(target=load, args=(ssc32u, running))
+    thread.start()
+    samples = []
+
+    try:
+        for _ in range(count):
+            time.sleep(random.uniform(0.01, 0.05))
+            start = time.perf_counter()
+            stop(ssc32u)
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        running.clear()
+        thread.join()
+
+    return sum(samples) / len(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', help="Serial port or pySerial URL, an emulated board if omitted.")
+    parser.add_argument('--baud', type=int, default=9600, help='Baud rate of the emulated board.')
+    parser.add_argument('--count', type=int, default=50, help='Number of stops per lane.')
+    args = parser.parse_args()
+
+    emulator = None
+    if args.port is None:
+        emulator = SSC32UEmulator(args.baud)
+        args.port = emulator.start()
+
+    with SSC32U(args.port) as ssc32u:
+        print('STOP queued:   mean {0:8.2f} ms, max {1:8.2f} ms'.format(*latency(queued_stop, ssc32u, args.count)))
+        print('STOP priority: mean {0:8.2f} ms, max {1:8.2f} ms'.format(*latency(priority_stop, ssc32u, args.count)))
+
+    if emulator is not None:
+        emulator.stop()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark the import time of johnnyv and fail if it exceeds a budget or loads hardware or optional modules."""
+
+import argparse
+import json
+import subprocess
+import sys
+
+
+MODULE = 'johnnyv.core.JohnnyV'
+# Modules which must only be imported when the corresponding hardware or feature is used.
+LAZY_MODULES = ['serial', 'smbus', 'jsonschema', 'picamera', 'numpy', 'asyncio', 'concurrent.futures']
+
+SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{'ms': (time.perf_counter() - start) * 1000,
+                   'loaded': [name for name in {lazy!r} if name in sys.modules]}}))
+"""
+
+
+def import_time(module=MODULE):
+    """
+    :param module: Name of the module to be imported.
+    :return: Import time in milliseconds and the list of lazy modules which were loaded.
+
+    Imports the module in a fresh interpreter, so no module is cached.
+    """
+    output = subprocess.check_output([sys.executable, '-c', SNIPPET.format(module=module, lazy=LAZY_MODULES)])
+    result = json.loads(output.decode().strip().splitlines()[-1])
+    return result['ms'], result['loaded']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--module', default=MODULE, help='Module to be imported.')
+    parser.add_argument('--count', type=int, default=5, help='Number of fresh imports.')
+    parser.add_argument('--budget', type=float, default=100.0, help='Maximum median import time in milliseconds.')
+    args = parser.parse_args()
+
+    samples = []
+    loaded = set()
+
+    for _ in range(args.count):
+        milliseconds, modules = import_time(args.module)
+        samples.append(milliseconds)
+        loaded.update(modules)
+
+    median = sorted(samples)[len(samples) // 2]
+    print('import {0}: median {1:8.2f} ms, max {2:8.2f} ms'.format(args.module, median, max(samples)))
+
+    if loaded:
+        print('Loaded on import: ' + ', '.join(sorted(loaded)))
+    if loaded or median > args.budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
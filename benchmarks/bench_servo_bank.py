@@ -0,0 +1,92 @@
+"""Benchmark memory and limit check cost of servo objects against the ServoBank with several boards."""
+
+import argparse
+import sys
+import time
+
+import numpy
+
+from johnnyv.core.ServoBank import ServoBank
+from johnnyv.core.ServoMotor import ServoMotor
+
+
+class LegacyServo:
+    """
+    Servo as stored before: a Python object holding its settings.
+    """
+
+    def __init__(self, pin):
+        self.dependencies = []
+        self.pin = pin
+        self.max_pulse = 180
+        self.min_pulse = 0
+        self.pulse_span = 180
+        self.abs_max_pulse = 180
+        self.abs_min_pulse = 0
+        self.pulse_width = 1000
+        self.init_pulse = 90
+        self.current_position = 90.5
+
+
+def legacy_size(servos):
+    """
+    :param servos: List of LegacyServos.
+    :return: Bytes of the objects, their dictionaries and float positions.
+    """
+    return sum(sys.getsizeof(servo) + sys.getsizeof(servo.__dict__) + sys.getsizeof(servo.current_position)
+               for servo in servos)
+
+
+def bank_size(bank, servos):
+    """
+    :param bank: ServoBank of the servos.
+    :param servos: List of ServoMotors.
+    :return: Bytes of the arrays, the index of the servos and the views.
+    """
+    return bank.nbytes() + sys.getsizeof(bank.servos) + sum(sys.getsizeof(servo) for servo in servos)
+
+
+def microseconds(function, *args):
+    """
+    :param function: Callable to be measured.
+    :param args: Arguments of the callable.
+    :return: Duration of the call in microseconds.
+    """
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=20, help='Number of measurements.')
+    args = parser.parse_args()
+
+    for boards in (1, 2, 4, 8):
+        pins = range(boards * 32)
+        legacy = [LegacyServo(pin) for pin in pins]
+        bank = ServoBank()
+        servos = [ServoMotor([], pin, 180, 0, 180, 0, 1000, 90, bank) for pin in pins]
+
+        degrees = [90] * len(servos)
+
+        def legacy_check():
+            for (servo, degree) in zip(legacy, degrees):
+                if not servo.min_pulse <= degree <= servo.max_pulse:
+                    return False
+            return True
+
+        legacy_time = min(microseconds(legacy_check) for _ in range(args.count))
+        # Pose engine and trajectories hold their pins and degrees as arrays, components convert lists.
+        array_time = min(microseconds(bank.within_limits, numpy.array(pins), numpy.array(degrees, dtype=float))
+                         for _ in range(args.count))
+        list_time = min(microseconds(bank.within_limits, list(pins), degrees) for _ in range(args.count))
+
+        print('{0} boards, {1:3} servos: objects {2:6} bytes, check {3:6.1f} us; bank {4:6} bytes, '
+              'check {5:5.1f} us of arrays, {6:5.1f} us of lists'.format(boards, len(servos), legacy_size(legacy),
+                                                                        legacy_time, bank_size(bank, servos),
+                                                                        array_time, list_time))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
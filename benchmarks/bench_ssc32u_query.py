@@ -0,0 +1,60 @@
+"""Benchmark the round-trip latency of SSC32U queries with framed replies against reading as many bytes as written."""
+
+import argparse
+import time
+
+from johnnyv.core.SSC32U import SSC32U
+from johnnyv.testing.SSC32UEmulator import SSC32UEmulator
+
+
+def unframed_is_done(ssc32u):
+    """
+    :param ssc32u: SSC32U instance.
+    :return: True if previous commands are done.
+
+    Query as sent before framed replies: waits for as many bytes as were written.
+    """
+    return ssc32u.ser.read(ssc32u.ser.write('Q \r'.encode())).decode() == '.'
+
+
+def latency(query, ssc32u, count):
+    """
+    :param query: Callable sending a query to 'ssc32u'.
+    :param ssc32u: SSC32U instance.
+    :param count: Number of round-trips.
+    :return: Mean and maximum round-trip time in milliseconds.
+    """
+    samples = []
+
+    for _ in range(count):
+        start = time.perf_counter()
+        query(ssc32u)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return sum(samples) / len(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', help="Serial port or pySerial URL, an emulated board if omitted.")
+    parser.add_argument('--baud', type=int, default=9600, help='Baud rate of the emulated board.')
+    parser.add_argument('--count', type=int, default=5, help='Number of round-trips per query.')
+    args = parser.parse_args()
+
+    emulator = None
+    if args.port is None:
+        emulator = SSC32UEmulator(args.baud)
+        args.port = emulator.start()
+
+    with SSC32U(args.port) as ssc32u:
+        print('Q unframed: mean {0:8.2f} ms, max {1:8.2f} ms'.format(*latency(unframed_is_done, ssc32u, args.count)))
+        ssc32u.ser.reset_input_buffer()
+        print('Q framed:   mean {0:8.2f} ms, max {1:8.2f} ms'.format(*latency(SSC32U.is_done, ssc32u, args.count)))
+        print('R4 framed:  mean {0:8.2f} ms, max {1:8.2f} ms'.format(*latency(SSC32U.get_baud, ssc32u, args.count)))
+
+    if emulator is not None:
+        emulator.stop()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
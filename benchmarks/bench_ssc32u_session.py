@@ -0,0 +1,91 @@
+"""
+Benchmark commands/sec of a persistent SSC32U session against opening the port per command.
+
+Without --port the board is emulated, opening its pseudo-terminal costs microseconds, so the emulator adds an assumed
+latency of opening a USB serial adapter with --open-time. The speedup of an emulated run is therefore a model of that
+assumption, not a measurement, and is labelled as modelled. Use --open-time 0 to compare the bare pseudo-terminal, or
+pass the port of a real board to measure the actual cost.
+"""
+
+import argparse
+import time
+
+from johnnyv.core.SSC32U import SSC32U
+from johnnyv.testing.SSC32UEmulator import SSC32UEmulator
+
+
+COMMAND = ' #16 P1500 T1000 #17 P1500 T1000 \r'.encode()
+# Completion query of the board, its one byte reply proves that the command was received.
+QUERY = 'Q \r'.encode()
+
+
+def commands_per_second(ssc32u, count):
+    """
+    :param ssc32u: SSC32U instance to be measured.
+    :param count: Number of commands to be written.
+    :return: Completed commands per second.
+
+    Writes 'count' group move commands, each followed by a 'Q' query whose reply is awaited, so every command is a
+    completed transfer in both modes instead of a buffered write.
+    """
+    start = time.perf_counter()
+
+    for _ in range(count):
+        if len(ssc32u.transfer(COMMAND + QUERY, 1)) != 1:
+            raise RuntimeError('Board did not reply to the completion query.')
+
+    return count / (time.perf_counter() - start)
+
+
+def connect(port, baud, persistent):
+    """
+    :param port: Serial port or pySerial URL.
+    :param baud: Baud rate of the board.
+    :param persistent: True for a persistent session, False to open the port per command.
+    :return: SSC32U instance using the baud rate.
+    """
+    ssc32u = SSC32U(port, persistent=persistent)
+    ssc32u.set_baud(baud)
+    ssc32u.reconnect()
+    return ssc32u
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', help="Serial port or pySerial URL, an emulated board if omitted.")
+    parser.add_argument('--baud', type=int, default=115200, help='Baud rate of the board.')
+    parser.add_argument('--count', type=int, default=1000, help='Number of commands per run.')
+    parser.add_argument('--open-time', type=float, default=0.005,
+                        help='Assumed seconds the emulated board needs after the port is opened, ignored with --port.')
+    args = parser.parse_args()
+
+    emulator = None
+    label = 'measured on ' + str(args.port)
+    if args.port is None:
+        emulator = SSC32UEmulator(args.baud, args.open_time)
+        args.port = emulator.start()
+        if emulator.watch is None or args.open_time <= 0:
+            label = 'measured on an emulated board without open time'
+            if args.open_time > 0:
+                print('Opening the port is not detected on this platform, the open time is not modelled.')
+        else:
+            label = 'modelled with an assumed open time of {0} s on an emulated board'.format(args.open_time)
+
+    per_call = connect(args.port, args.baud, False)
+    per_call_rate = commands_per_second(per_call, args.count)
+    per_call.close()
+
+    with connect(args.port, args.baud, True) as session:
+        session_rate = commands_per_second(session, args.count)
+
+    print('Results ' + label + ':')
+    print('open per command:   {0:10.1f} commands/s'.format(per_call_rate))
+    print('persistent session: {0:10.1f} commands/s'.format(session_rate))
+    print('speedup:            {0:10.1f}x'.format(session_rate / per_call_rate))
+
+    if emulator is not None:
+        emulator.stop()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark planning a keyframe trajectory and the per-tick cost of streaming it to boards without transport."""
+
+import argparse
+import time
+
+from johnnyv.core.BoardRegistry import BoardRegistry
+from johnnyv.core.Controller import Controller
+from johnnyv.core.SSC32U import SSC32U
+from johnnyv.core.ServoBank import ServoBank
+from johnnyv.core.ServoMotor import ServoMotor
+from johnnyv.core.Trajectory import Trajectory
+
+
+class NullSerial:
+    """
+    Open serial connection which discards all writes, so only the cost of the robot code is measured.
+    """
+
+    def isOpen(self):
+        return True
+
+    def write(self, data):
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def registry(boards, baud):
+    """
+    :param boards: Number of boards.
+    :param baud: Baud rate of the boards, limits the rate of the trajectories.
+    :return: BoardRegistry of boards without transport, 32 channels each.
+    """
+    result = BoardRegistry()
+
+    for index in range(boards):
+        board = SSC32U('loop://')
+        board.set_baud(baud)
+        board.ser.close()
+        board.ser = NullSerial()
+        result.add('board' + str(index), board, index * 32)
+
+    return result
+
+
+def tick_times(trajectory):
+    """
+    :param trajectory: Trajectory prepared for the boards.
+    :return: List of the durations of Trajectory.tick() in microseconds, one per frame.
+
+    Every tick is started at the time of its frame, so no frame is skipped.
+    """
+    trajectory.stops = Controller.stops
+    ticks = []
+
+    for index in range(len(trajectory)):
+        trajectory.sent = index - 1
+        trajectory.start = time.perf_counter() - index / trajectory.rate
+        start = time.perf_counter()
+        trajectory.tick()
+        ticks.append((time.perf_counter() - start) * 1000000)
+
+    return ticks
+
+
+def line_sizes(trajectory):
+    """
+    :param trajectory: Trajectory prepared for the boards.
+    :return: List of the bytes written per tick, unchanged channels are not written.
+    """
+    return [sum(len(data) for (board, data, duration) in line) for line in trajectory.lines]
+
+
+def summary(ticks):
+    """
+    :param ticks: List of durations.
+    :return: Tuple of median and maximum.
+    """
+    return sorted(ticks)[len(ticks) // 2], max(ticks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rate', type=int, default=50, help='Setpoints per second.')
+    parser.add_argument('--seconds', type=float, default=10, help='Duration of the trajectory.')
+    parser.add_argument('--baud', type=int, default=115200, help='Baud rate of the boards.')
+    args = parser.parse_args()
+
+    for boards in (1, 8):
+        bank = ServoBank()
+        servos = {pin: ServoMotor([], pin, 180, 0, 180, 0, 1000, 90, bank) for pin in range(boards * 32)}
+        keyframes = [(args.seconds * (step + 1) / 10, {pin: (step * 37 + pin) % 180 for pin in servos})
+                     for step in range(10)]
+        Controller.boards = registry(boards, args.baud)
+
+        for interpolation in Trajectory.interpolations:
+            start = time.perf_counter()
+            trajectory = Trajectory(keyframes, servos, args.rate, interpolation)
+            planning = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            trajectory.prepare()
+            preparing = (time.perf_counter() - start) * 1000
+
+            print('{0:3} channels, {1:8}: {2} ticks at {3} Hz planned in {4:6.1f} ms, prepared in {5:6.1f} ms, '
+                  'tick median {6:6.1f} us, max {7:6.1f} us; bytes per tick median {8}, max {9}'
+                  .format(len(servos), interpolation, len(trajectory), trajectory.rate, planning, preparing,
+                          *(summary(tick_times(trajectory)) + summary(line_sizes(trajectory)))))
+
+        Controller.boards.close()
+        Controller.boards = None
+        Controller.forget_sent()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
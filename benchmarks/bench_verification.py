@@ -0,0 +1,99 @@
+"""Benchmark the validation of large generated configurations with many boards."""
+
+import argparse
+import copy
+import time
+
+from johnnyv.core.Configuration import Configuration
+from johnnyv.core.Verification import Verification
+
+
+def generate(boards, servos_per_component=8):
+    """
+    :param boards: Number of SSC32U boards, 1-8.
+    :param servos_per_component: Number of servos of every component.
+    :return: Valid configuration with a servo on every channel of all boards.
+    """
+    constants = copy.deepcopy(Configuration.constants())
+    template = next(servo for component in constants['components'].values()
+                    for servo in component['servo_list'].values())
+    components = {}
+
+    for pin in range(boards * 32):
+        component = components.setdefault('component_' + str(pin // servos_per_component),
+                                          {'servo_list': {}, 'motor_list': {}})
+        servo = dict(template, pin=pin, color_scheme='SCHEME' + str(pin % servos_per_component))
+        component['servo_list']['servo_' + str(pin)] = servo
+
+    constants['components'] = components
+    constants['ssc32u']['boards'] = {'board' + str(board): {'port': None, 'offset': board * 32}
+                                     for board in range(boards)}
+    return constants
+
+
+def legacy_validate(constants):
+    """
+    :param constants: Dictionary of a configuration.
+    :return: True if the configuration is valid.
+
+    Validation as done before: a new validator per call and several passes over the components.
+    """
+    from jsonschema import Draft4Validator, FormatChecker
+    from jsonschema.exceptions import best_match
+
+    if best_match(Draft4Validator(Configuration.schema(), format_checker=FormatChecker()).iter_errors(constants)):
+        return False
+
+    servo_lists = [value["servo_list"] for (key, value) in constants['components'].items()]
+    motor_lists = [value["motor_list"] for (key, value) in constants['components'].items()]
+    servo_pins = [value["pin"] for group in servo_lists for (key, value) in group.items()]
+    motor_pins = [value["pin"] for group in motor_lists for (key, value) in group.items()]
+
+    if len(servo_pins + motor_pins) != len(set(servo_pins + motor_pins)):
+        return False
+
+    for (key, value) in constants['components'].items():
+        servo_schemes = [value["color_scheme"] for (key, value) in value["servo_list"].items()]
+        motor_schemes = [value["color_scheme"] for (key, value) in value["motor_list"].items()]
+
+        if len(servo_schemes + motor_schemes) != len(set(servo_schemes + motor_schemes)):
+            return False
+
+    return True
+
+
+def milliseconds(function, *args):
+    """
+    :param function: Callable to be measured.
+    :param args: Arguments of the callable.
+    :return: Duration of the call in milliseconds.
+    """
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=5, help='Number of validations per measurement.')
+    args = parser.parse_args()
+
+    for boards in (1, 2, 4, 8):
+        constants = generate(boards)
+        Verification.clear()
+
+        legacy = min(milliseconds(legacy_validate, constants) for _ in range(args.count))
+        first = milliseconds(Verification.validate, constants)
+        repeated = min(milliseconds(Verification.validate, constants) for _ in range(args.count))
+        changed = []
+
+        for index in range(args.count):
+            constants['ssc32u']['timeout'] = 2.0 + index
+            changed.append(milliseconds(Verification.validate, constants))
+
+        print('{0} boards, {1:3} servos: legacy {2:8.2f} ms, first {3:8.2f} ms, changed {4:8.2f} ms, '
+              'repeated {5:8.3f} ms'.format(boards, boards * 32, legacy, first, min(changed), repeated))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
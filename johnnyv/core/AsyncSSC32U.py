@@ -0,0 +1,320 @@
+import asyncio
+import threading
+from johnnyv.core.Configuration import Configuration
+from johnnyv.core.MotionWait import MotionWait
+from johnnyv.core.Command import Command
+from johnnyv.core.SSC32U import SSC32U
+
+
+class AsyncSSC32U:
+    """
+    Asyncio driver for the Lynxmotion USB servo controller board.
+    Replies are collected by a reader registered at the event loop and lines are written in its executor, so
+    transfers and waiting for a movement never block other coroutines.
+    Use either this driver or SSC32U for a port, not both at once.
+    """
+
+    def __init__(self, port=None, loop=None, baud=None):
+        """
+        :param port: Serial port or pySerial URL of the board, i.e '/dev/ttyUSB0'.
+        :param loop: Event loop of the driver, the running event loop of open() if None.
+        :param baud: Baud rate of the board, the rate negotiated by SSC32U for the port or the configured baud rate
+                     if None.
+        """
+        settings = Configuration.section("ssc32u")
+        self.port = port if port is not None else "/dev/ttyUSB0"
+        self.baud = baud if baud is not None else SSC32U.negotiated.get(self.port, settings["baud"])
+        self.timeout = settings["timeout"]
+        self.execution_time = settings["execution_time"]
+        self.confirm_motion = settings.get("confirm_motion", False)
+        self.loop = loop
+        self.motion = None
+        self.ser = None
+        self.reader = False
+        self.buffer = bytearray()
+        self.received = None
+        self.lock = None
+        # Guards single writes only, so an emergency stop from another thread never splits a line.
+        self.write_lock = threading.Lock()
+        self.poll_interval = 0.001
+        self.probe_timeout = 0.2
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        return False
+
+    async def open(self):
+        """
+        :return: True if the serial connection is open.
+
+        Opens a non-blocking serial connection and registers its reader at the event loop.
+        """
+        import serial
+
+        if self.ser is None or not self.ser.isOpen():
+            if self.loop is None:
+                self.loop = asyncio.get_running_loop()
+            if self.lock is None:
+                self.received = asyncio.Event()
+                self.lock = asyncio.Lock()
+
+            try:
+                self.ser = serial.serial_for_url(self.port, baudrate=self.baud, timeout=0)
+            except serial.SerialException:
+                print("AsyncSSC32U initialization failed. Check parameters!")
+                raise
+
+            try:
+                self.loop.add_reader(self.ser.fileno(), self.on_readable)
+                self.reader = True
+            except (AttributeError, NotImplementedError, OSError, ValueError):
+                # URL handlers like 'loop://' have no file descriptor and are polled instead.
+                self.reader = False
+
+        return True
+
+    async def close(self):
+        """
+        :return: True if the serial connection is closed.
+
+        Removes the reader from the event loop and closes the serial connection.
+        """
+        if self.ser is not None and self.ser.isOpen():
+            if self.reader:
+                self.loop.remove_reader(self.ser.fileno())
+                self.reader = False
+            self.ser.close()
+
+        return True
+
+    def on_readable(self):
+        """
+        Moves available bytes from the serial connection into the receive buffer.
+        """
+        import serial
+
+        try:
+            self.buffer.extend(self.ser.read(self.ser.in_waiting or 1))
+        except serial.SerialException:
+            self.loop.remove_reader(self.ser.fileno())
+            self.reader = False
+        self.received.set()
+
+    async def read(self, reply, timeout=None):
+        """
+        :param reply: Format of the reply: the number of bytes or the terminating bytes.
+        :param timeout: Seconds to wait for the reply, self.timeout if None.
+        :return: Received bytes without terminator, incomplete if the timeout elapsed.
+
+        Waits for the reply of the board without blocking the event loop.
+        """
+        deadline = self.loop.time() + ((self.timeout if timeout is None else timeout) or 0)
+
+        while not self.is_complete(reply):
+            remaining = deadline - self.loop.time()
+            if remaining <= 0:
+                break
+
+            if self.reader:
+                self.received.clear()
+                try:
+                    await asyncio.wait_for(self.received.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                self.buffer.extend(self.ser.read(self.ser.in_waiting))
+                if not self.is_complete(reply):
+                    await asyncio.sleep(self.poll_interval)
+
+        if isinstance(reply, bytes):
+            index = self.buffer.find(reply)
+            size = len(self.buffer) if index < 0 else index + len(reply)
+            data = bytes(self.buffer[:size if index < 0 else index])
+        else:
+            size = reply
+            data = bytes(self.buffer[:size])
+
+        del self.buffer[:size]
+        return data
+
+    def is_complete(self, reply):
+        """
+        :param reply: Format of the reply: the number of bytes or the terminating bytes.
+        :return: True if the receive buffer holds the complete reply.
+        """
+        if isinstance(reply, bytes):
+            return reply in self.buffer
+        else:
+            return len(self.buffer) >= reply
+
+    async def transfer(self, data, reply=None, timeout=None):
+        """
+        :param data: Encoded command to be written to the board.
+        :param reply: Format of the reply: None for no reply, the number of bytes or the terminating bytes.
+        :param timeout: Seconds to wait for the reply, self.timeout if None.
+        :return: The received bytes without terminator if a reply is expected, True otherwise.
+
+        Writes a command to the board. Commands of concurrent coroutines are serialized.
+        """
+        await self.open()
+
+        async with self.lock:
+            if reply is None:
+                await self.loop.run_in_executor(None, self.write, data)
+                return True
+
+            # Discard stale bytes, i.e late replies of previous queries.
+            if not self.reader:
+                self.ser.reset_input_buffer()
+            self.buffer.clear()
+            await self.loop.run_in_executor(None, self.write, data)
+            return await self.read(reply, timeout)
+
+    def write(self, data):
+        """
+        :param data: Encoded command to be written to the board.
+        :return: Number of written bytes.
+
+        Blocking write of a whole line, run in the executor of the event loop by transfer().
+        """
+        with self.write_lock:
+            return self.ser.write(data)
+
+    async def check_connection(self):
+        """
+        :return: True if the connection was successful, False otherwise.
+
+        Checks connection to the SSC32-U board.
+        """
+        return await self.transfer('R0 \r'.encode(), SSC32U.terminator) != b""
+
+    async def is_done(self):
+        """
+        :return: True if previous command are done, False otherwise.
+
+        Method for checking if the board is done executing previous commands.
+        """
+        # Result '.' if previous move is completed
+        return await self.transfer('Q \r'.encode(), 1) == b'.'
+
+    async def get_baud(self):
+        """
+        :return: The value of the baud rate.
+
+        Get current baud rate.
+        """
+        return (await self.transfer('R4 \r'.encode(), SSC32U.terminator)).decode()
+
+    async def get_val_from_reg(self, reg):
+        """
+        :param reg: The register to get the value from.
+        :return: The value of the register.
+
+        Get value from of given register. See SSC32U.get_val_from_reg() for the allowed registers.
+        """
+        return (await self.transfer(('R ' + str(reg) + ' \r').encode(), SSC32U.terminator)).decode()
+
+    async def reset_reg_vals(self):
+        """
+        :return: True for successful restoring.
+
+        Coroutine version of SSC32U.reset_reg_vals(), no reply within self.probe_timeout counts as success.
+        """
+        return await self.transfer('RDFLT \r'.encode(), 1, self.probe_timeout) in (b'', SSC32U.terminator)
+
+    async def get_startup_string(self):
+        """
+        :return: Value of startup string.
+
+        Get startup string.
+        """
+        return (await self.transfer('SS \r'.encode(), SSC32U.terminator)).decode()
+
+    async def query_pulse_widths(self, pins):
+        """
+        :param pins: List of pins to be queried.
+        :return: Dictionary of pin and pulse width, 0 for channels without pulse.
+
+        Coroutine version of SSC32U.query_pulse_widths().
+        """
+        if not pins:
+            return {}
+
+        data = ''.join('QP ' + str(pin) + ' ' for pin in pins) + '\r'
+        reply = await self.transfer(data.encode(), len(pins))
+
+        if len(reply) != len(pins):
+            print('AsyncSSC32U: Incomplete pulse width reply.')
+            return {}
+
+        return {pin: value * 10 for (pin, value) in zip(pins, reply)}
+
+    async def stop_servo(self, pin):
+        """
+        :param pin: The pin of the servo to be stopped.
+        :return: True for successful stopping.
+
+        Method that stops the servo on pin 'pin' at its current position, on the priority lane of emergency_stop().
+        """
+        return self.emergency_stop([int(pin)])
+
+    def emergency_stop(self, pins=None):
+        """
+        :param pins: Channels to be stopped, None for all channels of the board.
+        :return: True for successful stopping, False if the connection is not open.
+
+        Synchronous version of SSC32U.emergency_stop(), callable from any thread. The line bypasses the command lock
+        and only waits for a running write. Waits on the last movement return False.
+        """
+        channels = range(32) if pins is None else pins
+        # ESC cancels a line the board is still receiving, like SSC32U.emergency_stop().
+        data = SSC32U.escape + ''.join('STOP ' + str(channel) + ' ' for channel in channels).encode() + \
+            SSC32U.terminator
+
+        if self.motion is not None:
+            self.motion.interrupt()
+
+        if self.ser is None or not self.ser.isOpen():
+            return False
+
+        with self.write_lock:
+            self.ser.write(data)
+            self.ser.flush()
+        return True
+
+    async def exec_command(self, parameters, wait=True):
+        """
+        :param parameters: A list of Commands. Strings with the format 'pin:pulse:time' are accepted as well.
+        :param wait: True if the coroutine should return after the movement is done.
+        :return: True for successful execution, False otherwise.
+
+        Execute command on servo. The movement is tracked by self.motion.
+        """
+        if parameters and parameters is not None:
+            commands = [elem if isinstance(elem, Command) else Command.parse(elem) for elem in parameters]
+
+            data = Command.encode(commands)
+
+            if await self.transfer(data):
+                # The board starts moving once the whole line has been transferred.
+                duration = max(command.time for command in commands) + len(data) * 10 / self.baud * 1000
+                self.motion = MotionWait(self, duration, self.confirm_motion, self.execution_time)
+
+                if wait:
+                    return await self.motion.async_wait()
+                return True
+
+    async def wait_for_motion(self):
+        """
+        :return: True if the last movement is done, False otherwise.
+
+        Waits until the last executed movement is done.
+        """
+        if self.motion is None:
+            return True
+        else:
+            return await self.motion.async_wait()
@@ -0,0 +1,124 @@
+from johnnyv.core.Controller import Controller
+from johnnyv.core.CommandBuffer import CommandBuffer
+from johnnyv.core.FrameQueue import FrameQueue
+
+
+class Batch:
+    """
+    Motion transaction of one robot frame.
+    Commands are collected independently of other threads and submitted atomically as one group move:
+
+        with robot.batch() as batch:
+            robot.components['head'].move_servo([(29, 90, False)], batch)
+
+    The batch is submitted to the FrameQueue of its robot on leaving the with-block and discarded if the block raises.
+    """
+
+    def __init__(self, wait=False, queue=None):
+        """
+        :param wait: True if submit() should return after the movement is done.
+        :param queue: FrameQueue executing the batch, i.e the queue of a JohnnyV. A private queue if None.
+        """
+        self.buffer = CommandBuffer()
+        self.updates = []
+        self.wait = wait
+        self.queue = queue if queue is not None else FrameQueue()
+        self.future = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.submit()
+        else:
+            self.discard()
+        return False
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def add(self, command_list):
+        """
+        :param command_list: List of Commands.
+        :return: True for successful adding.
+
+        Adds commands to the batch. A command on the same pin is replaced.
+        """
+        if Controller.check_commands(command_list):
+            return self.buffer.extend(command_list)
+        else:
+            return False
+
+    def add_servo(self, servo, degree):
+        """
+        :param servo: Desired servomotor.
+        :param degree: Desired degree.
+        :return: True for successful adding.
+
+        Adds a servo movement. The servo observers are updated once the batch has been executed.
+        """
+        try:
+            command = [Controller.get_servo_command(servo, degree)]
+        except ValueError as error:
+            print(error)
+            return False
+
+        self.updates.append((servo.pin, degree))
+        return self.add(command)
+
+    def add_servos(self, moves):
+        """
+        :param moves: List of servo and degree tuples.
+        :return: True for successful adding.
+
+        Adds the movements of several servos at once, see Component.move_servos().
+        """
+        try:
+            commands = Controller.get_servo_commands(moves)
+        except ValueError as error:
+            print(error)
+            return False
+
+        self.updates.extend((servo.pin, degree) for (servo, degree) in moves)
+        return self.add(commands)
+
+    def add_motor(self, motor, direction, percentage):
+        """
+        :param motor: Desired motor.
+        :param direction: Desired direction.
+        :param percentage: Desired PWM in percentage.
+        :return: True for successful adding.
+
+        Adds a motor movement.
+        """
+        try:
+            command = [Controller.get_motor_command(motor, direction, percentage)]
+        except ValueError as error:
+            print(error)
+            return False
+
+        return self.add(command)
+
+    def submit(self):
+        """
+        :return: True for successful execution if the batch waits, True for successful submission otherwise.
+
+        Hands the batch over to its FrameQueue and empties it, so it can be filled with the next frame.
+        """
+        updates, self.updates = self.updates, []
+        self.future = self.queue.submit(self.buffer.take(), updates)
+
+        if self.wait:
+            return self.future.result()
+        return True
+
+    def discard(self):
+        """
+        :return: True for successful discarding.
+
+        Drops all commands of the batch.
+        """
+        self.buffer.clear()
+        del self.updates[:]
+        return True
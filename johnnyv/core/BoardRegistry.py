@@ -0,0 +1,262 @@
+import threading
+import time
+from collections import OrderedDict
+from johnnyv.core.Configuration import Configuration
+from johnnyv.core.SSC32U import SSC32U
+from johnnyv.core.Command import Command
+
+
+class BoardRegistry:
+    """
+    Registry of all SSC32U boards of the robot.
+    Every board drives 32 channels starting at its pin offset, i.e pins 32-63 are channels 0-31 of a board
+    with offset 32. Batches are split per board, written in parallel and started together.
+    """
+
+    channels = 32
+    # Seconds a board waits for the others before a synchronized movement is abandoned.
+    release_timeout = 2.0
+
+    def __init__(self):
+        self.boards = OrderedDict()
+        self.offsets = {}
+        self.pins = {}
+        self.executor = None
+        # Stops use their own threads, so they never queue behind a movement waiting for its release.
+        self.stopper = None
+        # One synchronized movement at a time, so the tasks of two movements never share the executor.
+        self.release_lock = threading.Lock()
+        self.stop_latency = None
+
+    @staticmethod
+    def from_settings():
+        """
+        :return: Registry with a SSC32U board for every entry in the 'boards' setting.
+
+        Creates the boards of the 'ssc32u' settings. Without 'boards' a single board with offset 0 is created.
+        With 'negotiate_baud' the fastest baud rate is negotiated once per board, boards of a port whose rate was
+        negotiated already connect at that rate.
+        """
+        registry = BoardRegistry()
+        negotiate = Configuration.section("ssc32u").get("negotiate_baud", True)
+
+        for (key, value) in BoardRegistry.board_settings().items():
+            board = SSC32U(value["port"])
+
+            if negotiate and board.port not in SSC32U.negotiated:
+                board.negotiate_baud()
+
+            registry.add(key, board, value["offset"])
+
+        return registry
+
+    @staticmethod
+    def board_settings():
+        """
+        :return: Dictionary of board name and dictionary with 'port' and 'offset', the primary board first.
+
+        Reads the 'boards' of the 'ssc32u' settings without opening any board.
+        """
+        return Configuration.section("ssc32u").get("boards", {"main": {"port": None, "offset": 0}})
+
+    def add(self, name, board, offset):
+        """
+        :param name: Name of the board, i.e 'main'.
+        :param board: SSC32U instance.
+        :param offset: First pin of the board.
+        :return: True for successful adding.
+
+        Registers a board for the pins offset to offset + 31.
+        """
+        pins = range(offset, offset + BoardRegistry.channels)
+
+        if name in self.boards or any(pin in self.pins for pin in pins):
+            print('BoardRegistry: Board ' + str(name) + ' overlaps a registered board.')
+            return False
+
+        self.boards[name] = board
+        self.offsets[board] = offset
+        self.pins.update((pin, board) for pin in pins)
+        self.executor = None
+        self.stopper = None
+        return True
+
+    def primary(self):
+        """
+        :return: The first registered board.
+        """
+        return next(iter(self.boards.values()))
+
+    def board_of(self, pin):
+        """
+        :param pin: Pin of a servo or motor.
+        :return: Board driving the pin, None if no board is registered for it.
+        """
+        return self.pins.get(pin)
+
+    def split(self, command_list):
+        """
+        :param command_list: List of Commands with robot pins.
+        :return: Dictionary of board and Commands with the channels of that board.
+
+        Splits a batch per board. Commands of boards with offset 0 are passed on unchanged.
+        """
+        batches = OrderedDict()
+
+        for command in command_list:
+            board = self.pins.get(command.pin)
+
+            if board is None:
+                raise ValueError('BoardRegistry: No board registered for pin ' + str(command.pin) + '.')
+
+            offset = self.offsets[board]
+            batches.setdefault(board, []).append(
+                command if offset == 0 else Command(command.pin - offset, command.pulse, command.time))
+
+        return batches
+
+    def exec_command(self, command_list, wait=True):
+        """
+        :param command_list: List of Commands with robot pins.
+        :param wait: True if the method should return after the movements of all boards are done.
+        :return: True for successful execution on all boards.
+
+        Executes a batch on all boards involved. The lines are written in parallel without their carriage return,
+        which is written to all boards once every line has been transferred. A board starts moving at the carriage
+        return, so the movements start together even for lines of different length or boards with different baud
+        rates, see SSC32U.transfer_released().
+        """
+        try:
+            batches = self.split(command_list)
+        except ValueError as error:
+            print(error)
+            return False
+
+        if not batches:
+            return False
+
+        if len(batches) == 1:
+            (board, commands), = batches.items()
+            return board.exec_command(commands, wait)
+
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.executor = ThreadPoolExecutor(max_workers=len(self.boards))
+
+        with self.release_lock:
+            barrier = threading.Barrier(len(batches), timeout=BoardRegistry.release_timeout)
+            futures = [self.executor.submit(board.exec_command, commands, False, barrier)
+                       for (board, commands) in batches.items()]
+            results = [future.result() for future in futures]
+
+        if wait:
+            results.extend([board.wait_for_motion() for board in batches])
+
+        return all(results)
+
+    def encode(self, command_list):
+        """
+        :param command_list: List of Commands with robot pins.
+        :return: List of board, encoded line and largest time tuples, one per board involved.
+
+        Splits and encodes a batch in advance, so it can be written repeatedly with write_lines().
+        """
+        return [(board, Command.encode(commands), max(command.time for command in commands))
+                for (board, commands) in self.split(command_list).items()]
+
+    def write_lines(self, lines):
+        """
+        :param lines: List of board, encoded line and largest time tuples, see encode().
+        :return: True for successful writing on all boards.
+
+        Writes lines encoded in advance without waiting for the movements, i.e the frames of a Trajectory. The lines
+        are written one after another from the calling thread, which is cheaper than the synchronized start of
+        exec_command() for frames streamed at a fixed rate.
+        """
+        return all([board.exec_line(data, duration, wait=False) for (board, data, duration) in lines])
+
+    def wait_for_motion(self):
+        """
+        :return: True if the last movements of all boards are done.
+        """
+        return all([board.wait_for_motion() for board in self.boards.values()])
+
+    def finish_time(self):
+        """
+        :return: Expected finish time of the last movements of all boards in time.perf_counter() seconds,
+                 None if no movement was executed.
+        """
+        finishes = [board.motion.finish for board in self.boards.values() if board.motion is not None]
+        return max(finishes) if finishes else None
+
+    def emergency_stop(self, pins=None):
+        """
+        :param pins: List of robot pins to be stopped, None for all channels of all boards.
+        :return: True for successful stopping on all boards.
+
+        Stops the pins on the priority lane of their boards with one 'STOP' line per board. The lines of several
+        boards are written in parallel, each board stops as soon as its line arrived.
+        The time from the call until the last line has been written is stored in self.stop_latency (seconds).
+        """
+        start = time.perf_counter()
+
+        if pins is None:
+            batches = OrderedDict((board, None) for board in self.boards.values())
+        else:
+            batches = OrderedDict()
+            for pin in pins:
+                board = self.pins.get(pin)
+                if board is not None:
+                    batches.setdefault(board, []).append(pin - self.offsets[board])
+
+        if len(batches) > 1:
+            if self.stopper is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self.stopper = ThreadPoolExecutor(max_workers=len(self.boards))
+
+            futures = [self.stopper.submit(board.emergency_stop, channels) for (board, channels) in batches.items()]
+            results = [future.result() for future in futures]
+        else:
+            results = [board.emergency_stop(channels) for (board, channels) in batches.items()]
+
+        self.stop_latency = time.perf_counter() - start
+        return all(results)
+
+    def query_pulse_widths(self, pins):
+        """
+        :param pins: List of robot pins.
+        :return: Dictionary of pin and pulse width.
+
+        Queries the pulse widths with one batched query per board.
+        """
+        pulses = {}
+        batches = OrderedDict()
+
+        for pin in pins:
+            board = self.pins.get(pin)
+            if board is not None:
+                batches.setdefault(board, []).append(pin)
+
+        for board, board_pins in batches.items():
+            offset = self.offsets[board]
+            channels = board.query_pulse_widths([pin - offset for pin in board_pins])
+            pulses.update((channel + offset, pulse) for (channel, pulse) in channels.items())
+
+        return pulses
+
+    def close(self):
+        """
+        :return: True for successful closing.
+
+        Closes the serial connections of all boards.
+        """
+        for board in self.boards.values():
+            board.close()
+
+        for executor in (self.executor, self.stopper):
+            if executor is not None:
+                executor.shutdown()
+
+        self.executor = None
+        self.stopper = None
+        return True
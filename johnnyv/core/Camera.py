@@ -1,5 +1,5 @@
 import re
-import json
+from johnnyv.core.Configuration import Configuration
 from johnnyv.core.Controller import Controller
 
 
@@ -8,32 +8,41 @@ class Camera:
     RaspberryPi compatible camera
     """
 
-    constants = json.load(open('/home/link/JohnnyV/johnnyv/ext/Constants.json'))
-
     def __init__(self, camera_id):
         """
         :param camera_id: ID/Name of camera.
         """
         self.camera_id = camera_id
-        self.camera_specs = Camera.constants['cameras'][camera_id]
+        self.camera_specs = Configuration.cameras().get(camera_id)
 
         if self.camera_specs:
-            self.resolution = self.camera_specs["resolution"]
-            self.resolution_set = self.camera_specs["resolution_set"]
-            self.brightness = self.camera_specs["brightness"]
-            self.contrast = self.camera_specs["contrast"]
-            self.sharpness = self.camera_specs["sharpness"]
-            self.saturation = self.camera_specs["saturation"]
-            self.rotation = self.camera_specs["rotation"]
-            self.hflip = self.camera_specs["hflip"]
-            self.vflip = self.camera_specs["vflip"]
-            self.picture_extension = self.camera_specs["picture_extension"]
-            self.video_extension = self.camera_specs["video_extension"]
-            self.picture_path = self.camera_specs["picture_path"]
-            self.video_path = self.camera_specs["video_path"]
+            self.apply_record(self.camera_specs)
         else:
             print(self.camera_id+": No specifications found for given Camera-ID.")
 
+    def apply_record(self, record):
+        """
+        :param record: Changed CameraRecord of the camera.
+        :return: True for successful applying.
+
+        Applies a changed configuration to the camera.
+        """
+        self.camera_specs = record
+        self.resolution = record.resolution
+        self.resolution_set = list(record.resolution_set)
+        self.brightness = record.brightness
+        self.contrast = record.contrast
+        self.sharpness = record.sharpness
+        self.saturation = record.saturation
+        self.rotation = record.rotation
+        self.hflip = record.hflip
+        self.vflip = record.vflip
+        self.picture_extension = record.picture_extension
+        self.video_extension = record.video_extension
+        self.picture_path = record.picture_path
+        self.video_path = record.video_path
+        return True
+
     def capture(self, file_name):
         """
         :param file_name: Name of the picture that will be taken without extension.
@@ -0,0 +1,100 @@
+import numbers
+
+
+class Command:
+    """
+    Movement command for a single channel of the SSC32U board.
+    The command is validated once and holds its encoded representation, i.e b' #16 P1500 T1000'.
+    """
+
+    __slots__ = ('pin', 'pulse', 'time', 'data')
+    max_pin = 255
+
+    def __init__(self, pin, pulse, time):
+        """
+        :param pin: Pin of the robot, i.e 16. Pins above 31 belong to additional boards (see BoardRegistry).
+        :param pulse: Pulse width in microseconds, 500-2500.
+        :param time: Time for the movement in milliseconds, 0-65535.
+        """
+        for name, value, minimum, maximum in (('pin', pin, 0, Command.max_pin),
+                                              ('pulse', pulse, 500, 2500),
+                                              ('time', time, 0, 65535)):
+            if not isinstance(value, numbers.Integral) or isinstance(value, bool):
+                raise ValueError("Command: Unexpected input: " + str(value) + ". Expected: '" + name + "' integer")
+            if not minimum <= value <= maximum:
+                raise ValueError("Command: '" + name + "' " + str(value) + " is not in range of " + str(minimum) +
+                                 " and " + str(maximum) + ".")
+
+        self.pin = int(pin)
+        self.pulse = int(pulse)
+        self.time = int(time)
+        self.data = ' #{0} P{1} T{2}'.format(self.pin, self.pulse, self.time).encode()
+
+    def __eq__(self, other):
+        return isinstance(other, Command) and self.data == other.data
+
+    def __hash__(self):
+        return hash(self.data)
+
+    def __repr__(self):
+        return 'Command({0}, {1}, {2})'.format(self.pin, self.pulse, self.time)
+
+    @staticmethod
+    def from_arrays(pins, pulses, times):
+        """
+        :param pins: Sequence of pins.
+        :param pulses: Sequence of pulse widths, one per pin.
+        :param times: Sequence of times, one per pin.
+        :return: List of Commands.
+
+        Creates the Commands of parallel sequences, i.e computed by PoseEngine.
+        The ranges are checked once per sequence instead of once per value.
+        """
+        for name, values, minimum, maximum in (('pin', pins, 0, Command.max_pin),
+                                               ('pulse', pulses, 500, 2500),
+                                               ('time', times, 0, 65535)):
+            if len(values) != len(pins):
+                raise ValueError("Command: Expected " + str(len(pins)) + " values of '" + name + "'.")
+            if not all(type(value) is int or isinstance(value, numbers.Integral) and not isinstance(value, bool)
+                       for value in values):
+                raise ValueError("Command: Unexpected input. Expected: '" + name + "' integers")
+            if values and not minimum <= min(values) <= max(values) <= maximum:
+                raise ValueError("Command: '" + name + "' is not in range of " + str(minimum) +
+                                 " and " + str(maximum) + ".")
+
+        commands = []
+
+        for pin, pulse, time in zip(pins, pulses, times):
+            command = Command.__new__(Command)
+            command.pin = int(pin)
+            command.pulse = int(pulse)
+            command.time = int(time)
+            command.data = ' #{0} P{1} T{2}'.format(command.pin, command.pulse, command.time).encode()
+            commands.append(command)
+
+        return commands
+
+    @staticmethod
+    def parse(string):
+        """
+        :param string: Command in the format 'pin:pulse:time'.
+        :return: The corresponding Command.
+
+        Creates a Command from its string representation.
+        """
+        split_command = string.split(':')
+
+        if len(split_command) != 3 or not all(value.isdigit() for value in split_command):
+            raise ValueError("Command: Input does not fit command pattern 'pin:pulse:time': " + string)
+
+        return Command(int(split_command[0]), int(split_command[1]), int(split_command[2]))
+
+    @staticmethod
+    def encode(commands):
+        """
+        :param commands: List of Commands.
+        :return: Bytes of one SSC32U command line.
+
+        Joins the encoded commands to a single line terminated by a carriage return.
+        """
+        return b''.join(command.data for command in commands) + b' \r'
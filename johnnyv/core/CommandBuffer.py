@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+
+
+class CommandBuffer:
+    """
+    Execution stack that coalesces commands by pin.
+    Only the latest command per pin is kept (last writer wins), so all pending commands
+    are sent as one group move with a single entry per channel.
+    """
+
+    def __init__(self, window=None, flush=None):
+        """
+        :param window: Seconds after the first pending command at which the buffer is flushed, None disables it.
+        :param flush: Callable executing the pending commands when the window elapses, i.e Controller.execute_stack.
+        """
+        self.commands = OrderedDict()
+        self.lock = threading.RLock()
+        self.window = window
+        self.flush = flush
+        self.timer = None
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self.commands)
+
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self.commands.values()))
+
+    def set_window(self, window, flush=None):
+        """
+        :param window: Seconds after the first pending command at which the buffer is flushed, None disables it.
+        :param flush: Callable executing the pending commands when the window elapses.
+        :return: True for successful setting.
+
+        Method for setting the flush window of the buffer.
+        """
+        with self.lock:
+            self.window = window
+            if flush is not None:
+                self.flush = flush
+            if window is None:
+                self.cancel_timer()
+            return True
+
+    def extend(self, commands):
+        """
+        :param commands: List of Commands to be buffered.
+        :return: True for successful buffering.
+
+        Adds commands to the buffer. A pending command on the same pin is replaced.
+        """
+        with self.lock:
+            for command in commands:
+                if command.pin in self.commands:
+                    self.coalesced += 1
+                self.commands[command.pin] = command
+
+            if self.commands and self.window is not None and self.flush is not None and self.timer is None:
+                self.timer = threading.Timer(self.window, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+            return True
+
+    def take(self):
+        """
+        :return: List of pending Commands.
+
+        Removes and returns all pending commands.
+        """
+        with self.lock:
+            self.cancel_timer()
+            commands = list(self.commands.values())
+            self.commands.clear()
+            return commands
+
+    def clear(self, pins=None):
+        """
+        :param pins: Pins whose pending commands are discarded, None for all pins.
+        :return: True for successful clearing.
+
+        Discards pending commands.
+        """
+        with self.lock:
+            if pins is None:
+                self.take()
+            else:
+                for pin in pins:
+                    self.commands.pop(pin, None)
+                if not self.commands:
+                    self.cancel_timer()
+            return True
+
+    def cancel_timer(self):
+        """
+        Cancels a running flush timer.
+        """
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
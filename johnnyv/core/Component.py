@@ -1,7 +1,11 @@
-import json
 import numbers
+from collections import OrderedDict
 
+from johnnyv.core.Configuration import Configuration
+from johnnyv.core.Records import ServoRecord
+from johnnyv.core.ServoBank import ServoBank
 from johnnyv.core.ServoMotor import ServoMotor
+from johnnyv.core.Snapshot import Snapshot
 from johnnyv.core.GearedMotor import GearedMotor
 from johnnyv.core.Controller import Controller
 
@@ -11,239 +15,209 @@ class Component:
     Container class for all robot components
     """
 
-    constants = json.load(open('/home/pi/johnnyv/ext/Constants.json'))
-
     def __init__(self, component):
         """
         :param component: Name of component, i.e 'left_arm'.
         """
         self.component = str(component).lower()
-        self.servos = []
-        self.motors = []
-
-        tmp_servo_list = Component.constants['components'][self.component]['servo_list']
-        tmp_motor_list = Component.constants['components'][self.component]['motor_list']
-
-        if tmp_servo_list:
-            self.servos = [ServoMotor(value['dependencies'],
-                                      value['pin'],
-                                      value['max_pulse'],
-                                      value['min_pulse'],
-                                      value['abs_max_pulse'],
-                                      value['abs_min_pulse'],
-                                      value['pulse_width'],
-                                      value['init_pulse'])
-                           for (key, value) in tmp_servo_list.items()]
-
-        if tmp_motor_list:
-            self.motors = [GearedMotor(value['pin'],
-                                       value['init_percentage'],
-                                       value['init_direction'],
-                                       value['pulse_width']) for (key, value) in tmp_motor_list.items()]
-
+        self.bank = ServoBank.get_shared()
+        self.servos = [ServoMotor(list(servo.dependencies),
+                                  servo.pin,
+                                  servo.max_pulse,
+                                  servo.min_pulse,
+                                  servo.abs_max_pulse,
+                                  servo.abs_min_pulse,
+                                  servo.pulse_width,
+                                  servo.init_pulse,
+                                  self.bank) for servo in Configuration.servos(self.component)]
+
+        self.motors = [GearedMotor(motor.pin,
+                                   motor.init_percentage,
+                                   motor.init_direction,
+                                   motor.pulse_width) for motor in Configuration.motors(self.component)]
+
+        self.servo_index = {}
+        self.motor_index = {}
+        self.index()
         Controller.add_servos(self.servos)
 
+    def index(self):
+        """
+        :return: True for successful indexing.
+        Rebuilds the pin index of servos and motors, i.e after they were replaced.
+        """
+        self.servo_index = {servo.pin: servo for servo in self.servos}
+        self.motor_index = {motor.pin: motor for motor in self.motors}
+        return True
+
     def set_property(self, prop_list):
         """
         :param prop_list: List of properties to be set.
         :return: True for successful setting.
-        Sets desired properties to a servomotor.
-        """
-        if prop_list:
-            if isinstance(prop_list, list):
-                if all(isinstance(command, tuple) for command in prop_list):
-                    if all(len(command) == 3 for command in prop_list):
-                        if all(isinstance(number, numbers.Number) for command in prop_list for number in command[::2]):
-                            if all(isinstance(command[1], str) for command in prop_list):
-                                if self.servos:
-                                    for command in prop_list:
-                                        pin = command[0]
-                                        servo = next(servo for servo in self.servos if servo.pin == pin)
-
-                                        if servo:
-                                            servo_property = command[1]
-                                            new_value = command[2]
-                                            prop_list.remove(command)
-
-                                            if servo_property == 'max_pulse':
-                                                if new_value <= servo.abs_max_pulse:
-                                                    servo.max_pulse = new_value
-                                                else:
-                                                    self.error("'max_pulse' is greater than 'abs_max_pulse'.")
-                                                    return False
-
-                                            elif servo_property == 'min_pulse':
-                                                if new_value >= servo.abs_min_pulse:
-                                                    servo.min_pulse = new_value
-                                                else:
-                                                    self.error("'min_pulse' is less than 'abs_min_pulse'.")
-                                                    return False
-
-                                            elif servo_property == 'init_pulse':
-                                                if servo.abs_min_pulse <= new_value <= servo.abs_max_pulse:
-                                                    servo.init_pulse = new_value
-                                                else:
-                                                    self.error("'init_pulse' is not in allowed range.")
-                                                    return False
-
-                                            elif servo_property == 'pulse_width':
-                                                if new_value > 0:
-                                                    servo.pulse_width = new_value
-                                                else:
-                                                    self.error("'pulse_width' must be greater than 0.")
-                                                    return False
-
-                                            else:
-                                                self.error('Not settable Property given: ' + servo_property + '.')
-                                                return False
-
-                                if self.motors:
-                                    for command in prop_list:
-                                        pin = command[0]
-                                        motor = next(motor for motor in self.motors if motor.pin == pin)
-
-                                        if motor:
-                                            servo_property = command[1]
-                                            new_value = command[2]
-                                            prop_list.remove(command)
-
-                                            if servo_property == 'init_percentage':
-                                                if 0 <= new_value <= 100:
-                                                    motor.init_percentage = new_value
-                                                else:
-                                                    self.error("'percentage' must be between 0 and 100.")
-                                                    return False
-
-                                            elif servo_property == 'init_direction':
-                                                if new_value in [-1, 0, 1]:
-                                                    motor.init_direction = new_value
-                                                else:
-                                                    self.error("value of 'direction' must be -1, 0 or 1.")
-                                                    return False
-
-                                            elif servo_property == 'pulse_width':
-                                                if new_value >= 0:
-                                                    motor.pulse_width = new_value
-                                                else:
-                                                    self.error("'pulse_width' must be greater than 0.")
-                                                    return False
-                                            else:
-                                                self.error('Not settable Property given: ' + servo_property + '.')
-                                                return False
-
-                                if self.servos or self.motors:
-                                    return True
-                                else:
-                                    self.error('No servo or motor list available.')
-                                    return False
-                            else:
-                                self.error('Unexpected tuple element. Second element must be a string.')
-                                return False
-                        else:
-                            self.error('Unexpected tuple element. First & third Element must be a number')
-                            return False
-                    else:
-                        self.error('Unexpected tuple size. Expected tuple of three')
-                        return False
-                else:
-                    self.error('Unexpected list element. Expected list of tuples')
-                    return False
+        Sets desired properties to servomotors and motors, i.e [(19, 'max_pulse', 170)]. The whole list is validated
+        before any property is set, so either all properties are set or none. 'pulse_span' is recomputed once per servo.
+        """
+        if not prop_list:
+            self.error(': No input.')
+            return False
+        if not isinstance(prop_list, list):
+            self.error('Unexpected input: ' + type(prop_list).__name__ + '. Expected: List.')
+            return False
+        if not self.servos and not self.motors:
+            self.error('No servo or motor list available.')
+            return False
+
+        changes = OrderedDict()
+
+        for command in prop_list:
+            if not isinstance(command, tuple):
+                self.error('Unexpected list element. Expected list of tuples')
+                return False
+            if len(command) != 3:
+                self.error('Unexpected tuple size. Expected tuple of three')
+                return False
+
+            (pin, servo_property, new_value) = command
+
+            if not isinstance(pin, numbers.Number) or not isinstance(new_value, numbers.Number):
+                self.error('Unexpected tuple element. First & third Element must be a number')
+                return False
+            if not isinstance(servo_property, str):
+                self.error('Unexpected tuple element. Second element must be a string.')
+                return False
+
+            if pin in self.servo_index:
+                actuator = self.servo_index[pin]
+                message = self.check_servo_property(actuator, servo_property, new_value)
+            elif pin in self.motor_index:
+                actuator = self.motor_index[pin]
+                message = self.check_motor_property(servo_property, new_value)
             else:
-                self.error('Unexpected input: ' + type(prop_list).__name__ + '. Expected: List.')
+                message = 'Desired servo or motor with pin ' + str(pin) + ' is not available.'
+
+            if message:
+                self.error(message)
                 return False
+
+            changes.setdefault(actuator, OrderedDict())[servo_property] = new_value
+
+        for (actuator, values) in changes.items():
+            if 'min_pulse' in values or 'max_pulse' in values:
+                if values.get('min_pulse', actuator.min_pulse) >= values.get('max_pulse', actuator.max_pulse):
+                    self.error("'min_pulse' must be less than 'max_pulse' on pin " + str(actuator.pin) + '.')
+                    return False
+
+        for (actuator, values) in changes.items():
+            for (servo_property, new_value) in values.items():
+                setattr(actuator, servo_property, new_value)
+
+            if 'min_pulse' in values or 'max_pulse' in values:
+                actuator.pulse_span = abs(actuator.max_pulse - actuator.min_pulse)
+
+        return True
+
+    @staticmethod
+    def check_servo_property(servo, servo_property, new_value):
+        """
+        :param servo: Servo to be changed.
+        :param servo_property: Name of the property, i.e 'max_pulse'.
+        :param new_value: New value of the property.
+        :return: Error message, None if the value is allowed.
+        """
+        if servo_property == 'max_pulse':
+            if new_value > servo.abs_max_pulse:
+                return "'max_pulse' is greater than 'abs_max_pulse'."
+        elif servo_property == 'min_pulse':
+            if new_value < servo.abs_min_pulse:
+                return "'min_pulse' is less than 'abs_min_pulse'."
+        elif servo_property == 'init_pulse':
+            if not servo.abs_min_pulse <= new_value <= servo.abs_max_pulse:
+                return "'init_pulse' is not in allowed range."
+        elif servo_property == 'pulse_width':
+            if new_value <= 0:
+                return "'pulse_width' must be greater than 0."
         else:
-            self.error(': No input.')
-            return False
+            return 'Not settable Property given: ' + servo_property + '.'
+        return None
+
+    @staticmethod
+    def check_motor_property(motor_property, new_value):
+        """
+        :param motor_property: Name of the property, i.e 'init_percentage'.
+        :param new_value: New value of the property.
+        :return: Error message, None if the value is allowed.
+        """
+        if motor_property == 'init_percentage':
+            if not 0 <= new_value <= 100:
+                return "'percentage' must be between 0 and 100."
+        elif motor_property == 'init_direction':
+            if new_value not in [-1, 0, 1]:
+                return "value of 'direction' must be -1, 0 or 1."
+        elif motor_property == 'pulse_width':
+            if new_value < 0:
+                return "'pulse_width' must be greater than 0."
+        else:
+            return 'Not settable Property given: ' + motor_property + '.'
+        return None
 
     def reset(self, pin_list=None):
         """
         :param pin_list: Pins to be reseted.
         :return: Call to initialize().
-        Resets the properties of the components to their defaults.
-        """
-        tmp_servo_list = Component.constants[self.component]['servo_list']
-        tmp_motor_list = Component.constants[self.component]['motor_list']
-
-        if tmp_servo_list or tmp_motor_list:
-            if pin_list:
-                if isinstance(pin_list, list):
-                    if all(isinstance(command, tuple) for command in pin_list):
-                        if all(len(command) == 2 for command in pin_list):
-                            if all(isinstance(command[0], numbers.Number) for command in pin_list):
-                                if all(isinstance(command[1], bool) for command in pin_list):
-                                    pins = [command[0] for command in pin_list]
-                                    initial_servos = [servo for (key, servo) in tmp_servo_list if servo["pin"] in pins]
-                                    initial_motors = [motor for (key, motor) in tmp_motor_list if motor["pin"] in pins]
-
-                                    if initial_servos:
-                                        for servo_to_reset in self.servos:
-                                            initial_servo = next(servo for (key, servo) in initial_servos if
-                                                                 servo["pin"] == servo_to_reset.pin)
-
-                                            if initial_servo:
-                                                self.servos.remove(servo_to_reset)
-                                                self.servos.append(ServoMotor(initial_servo['dependencies'],
-                                                                              initial_servo['pin'],
-                                                                              initial_servo['max_pulse'],
-                                                                              initial_servo['min_pulse'],
-                                                                              initial_servo['abs_max_pulse'],
-                                                                              initial_servo['abs_min_pulse'],
-                                                                              initial_servo['pulse_width'],
-                                                                              initial_servo['init_pulse']))
-                                    if initial_motors:
-                                        for motor_to_reset in self.motors:
-                                            initial_motor = next(motor for (key, motor) in initial_motors if
-                                                                 motor["pin"] == motor_to_reset.pin)
-
-                                            if initial_motor:
-                                                self.motors.remove(motor_to_reset)
-                                                self.motors.append(GearedMotor(initial_motor['pin'],
-                                                                               initial_motor['init_percentage'],
-                                                                               initial_motor['init_direction'],
-                                                                               initial_motor['pulse_width']))
-                                    if initial_servos or initial_motors:
-                                        return self.initialize()
-                                    else:
-                                        self.error('No servo or motor list available.')
-                                        return False
-                                else:
-                                    self.error('Unexpected tuple element. Second element must be a boolean.')
-                                    return False
-                            else:
-                                self.error('Unexpected tuple element. First element must be a number')
-                                return False
-                        else:
-                            self.error('Unexpected tuple size. Expected tuple of two')
-                            return False
-                    else:
-                        self.error('Unexpected list element. Expected list of strings')
-                        return False
-                else:
-                    self.error('Unexpected input: ' + type(pin_list).__name__ + '. Expected: None or List.')
-                    return False
-            else:
-                if tmp_servo_list:
-                    del self.servos[:]
-                    self.servos = [ServoMotor(value['dependencies'],
-                                              value['pin'],
-                                              value['max_pulse'],
-                                              value['min_pulse'],
-                                              value['abs_max_pulse'],
-                                              value['abs_min_pulse'],
-                                              value['pulse_width'],
-                                              value['init_pulse']) for (key, value) in tmp_servo_list.items()]
-
-                if tmp_motor_list:
-                    del self.motors[:]
-                    self.motors = [GearedMotor(value['pin'],
-                                               value['transmission'],
-                                               value['gradation'],
-                                               value['pulse_width']) for (key, value) in tmp_motor_list.items()]
-
-                return self.initialize()
-        else:
-            self.error('No motor and servo information could be found in constant.json')
-            return False
+        Resets the properties of the components to their defaults and moves them to their initial positions.
+        """
+        defaults = self.defaults()
+
+        if pin_list is not None:
+            index = dict(self.motor_index)
+            index.update(self.servo_index)
+
+            if not pin_list:
+                self.error(': No input.')
+                return False
+            if self.resolve(pin_list, 2, index, 'servo or motor') is None:
+                return False
+
+            defaults = defaults.select(pin for (pin, execute) in pin_list)
+
+        return self.restore(defaults) and self.initialize(pin_list)
+
+    def defaults(self):
+        """
+        :return: Snapshot of the configured settings, with all servos at their initial position.
+        """
+        return Snapshot.from_records(Configuration.servos(self.component), Configuration.motors(self.component))
+
+    def snapshot(self):
+        """
+        :return: Snapshot of the current settings and positions of all servos and motors.
+        """
+        return Snapshot.of(self.servos, self.motors)
+
+    def restore(self, snapshot, positions=False):
+        """
+        :param snapshot: Snapshot of the component or the whole robot.
+        :param positions: True if the known positions should be restored as well, no command is sent.
+        :return: True for successful restoring.
+        Restores the settings of the servos and motors of the snapshot which belong to the component.
+        """
+        states = [state for state in snapshot.servos if state[0] in self.servo_index]
+        changed = [self.servo_index[state[0]] for state in states
+                   if tuple(self.servo_index[state[0]].dependencies) != tuple(state[1])]
+        self.bank.load(states, positions)
+
+        for servo in changed:
+            Controller.index_dependencies(servo)
+
+        for (pin, init_percentage, init_direction, pulse_width) in snapshot.motors:
+            motor = self.motor_index.get(pin)
+
+            if motor is not None:
+                motor.init_percentage = init_percentage
+                motor.init_direction = init_direction
+                motor.pulse_width = pulse_width
+
+        return True
 
     def initialize(self, init_list=None):
         """
@@ -266,130 +240,137 @@ class Component:
 
             return self.init_command(pins_to_initialize)
 
-    def move_servo(self, command_list):
+    def move_servo(self, command_list, batch=None):
         """
         :param command_list: List of commands to be executed.
+        :param batch: Batch collecting the stacked commands, the execution stack of the Controller if None.
         :return: True for successful execution.
-        Move servos according to the command_list.
-        """
-        if self.servos:
-            if isinstance(command_list, list):
-                if all(isinstance(command, tuple) for command in command_list):
-                    if all(len(command) == 3 for command in command_list):
-                        if all(isinstance(number, numbers.Number) for command in command_list for number in
-                               command[:1]):
-                            if all(isinstance(command[2], bool) for command in command_list):
-                                for command in command_list:
-                                    pin = command[0]
-                                    degree = command[1]
-                                    servo = next(servo for servo in self.servos if servo.pin == pin)
-
-                                    if servo:
-                                        if servo.min_pulse <= degree <= servo.max_pulse:
-                                            if command[2]:
-                                                if Controller.execute_servo(servo, degree):
-                                                    self.error('Execution of single command was successfull')
-                                                else:
-                                                    self.error('Execution of single command failed')
-                                                    return False
-                                            else:
-                                                if Controller.add_servo_to_stack(servo, degree):
-                                                    self.error('Command was added to Execution-list.')
-                                                else:
-                                                    self.error('Command could not be added to Execution-list.')
-                                                    return False
-                                        else:
-                                            self.error(str(degree) + ' is not allowed.')
-                                            return False
-                                    else:
-                                        self.error('Desired servo with pin ' + str(pin) + ' is not available.')
-                                        return False
-
-                                return True
-
-                            else:
-                                self.error('Unexpected tuple element. Last Element must be a boolean.')
-                                return False
-                        else:
-                            self.error('Unexpected tuple element. First two items must be numbers')
-                            return False
-                    else:
-                        self.error('Unexpected tuple size. Expected tuple of three')
-                        return False
+        Move servos according to the command_list. All commands are validated before the first one is executed.
+        """
+        if not self.servos:
+            self.error('Component does not contain any servos.')
+            return False
+
+        moves = self.resolve(command_list, 3, self.servo_index, 'servo')
+
+        if moves is None:
+            return False
+
+        invalid = self.bank.within_limits([servo.pin for (servo, command) in moves],
+                                          [command[1] for (servo, command) in moves])
+
+        if invalid is not None:
+            self.error(str(moves[invalid][1][1]) + ' is not allowed.')
+            return False
+
+        for (servo, (pin, degree, execute)) in moves:
+            if execute:
+                if Controller.execute_servo(servo, degree):
+                    self.error('Execution of single command was successfull')
                 else:
-                    self.error('Unexpected list element. Expected list of tuples')
+                    self.error('Execution of single command failed')
+                    return False
+            elif batch is not None:
+                if not batch.add_servo(servo, degree):
+                    self.error('Command could not be added to batch.')
                     return False
             else:
-                self.error('Unexpected input: ' + type(command_list).__name__ + '. Expected: list')
+                if Controller.add_servo_to_stack(servo, degree):
+                    self.error('Command was added to Execution-list.')
+                else:
+                    self.error('Command could not be added to Execution-list.')
+                    return False
+
+        return True
+
+    def move_servos(self, pins, degrees, batch=None):
+        """
+        :param pins: Sequence of servo pins, i.e [19, 20, 21].
+        :param degrees: Sequence of degrees, one per pin.
+        :param batch: Batch collecting the commands, the execution stack of the Controller if None.
+        :return: True for successful stacking.
+        Stacks the movements of several servos at once. Pins are resolved in a single pass, the limits are checked on
+        the arrays of the ServoBank and the commands are created in bulk, so moving a whole arm costs about the same
+        as moving a single joint.
+        """
+        if len(pins) != len(degrees):
+            self.error('Expected ' + str(len(pins)) + ' degrees, got ' + str(len(degrees)) + '.')
+            return False
+
+        moves = []
+
+        for (pin, degree) in zip(pins, degrees):
+            servo = self.servo_index.get(pin)
+
+            if servo is None:
+                self.error('Desired servo with pin ' + str(pin) + ' is not available.')
                 return False
-        else:
-            self.error('Component does not contain any servos.')
+            if not isinstance(degree, numbers.Number):
+                self.error(str(degree) + ' is not allowed.')
+                return False
+
+            moves.append((servo, degree))
+
+        invalid = self.bank.within_limits(pins, degrees)
+
+        if invalid is not None:
+            self.error(str(degrees[invalid]) + ' is not allowed.')
             return False
 
-    def move_motor(self, command_list):
+        if batch is not None:
+            return batch.add_servos(moves)
+
+        try:
+            commands = Controller.get_servo_commands(moves)
+        except ValueError as error:
+            print(error)
+            return False
+
+        return Controller.add_to_stack(commands)
+
+    def move_motor(self, command_list, batch=None):
         """
         :param command_list: List of commands to be executed.
+        :param batch: Batch collecting the stacked commands, the execution stack of the Controller if None.
         :return: True for successful execution.
-        Moves motor according to command_list.
-        """
-        if self.motors:
-            if isinstance(command_list, list):
-                if all(isinstance(command, tuple) for command in command_list):
-                    if all(len(command) == 4 for command in command_list):
-                        if all(isinstance(number, numbers.Number) for command in command_list for number in
-                               command[:2]):
-                            if all(isinstance(command[3], bool) for command in command_list):
-                                for command in command_list:
-                                    pin = command[0]
-                                    direction = command[1]
-                                    percent = command[2]
-                                    motor = next(motor for motor in self.motors if motor.pin == pin)
-
-                                    if motor:
-                                        if direction in [-1, 0, 1]:
-                                            if 0 <= percent <= 100:
-                                                if command[2]:
-                                                    if Controller.execute_motor(motor, direction, percent):
-                                                        self.error('Execution of single command was successful')
-                                                    else:
-                                                        self.error('Execution of single command failed')
-                                                        return False
-                                                else:
-                                                    if Controller.add_motor_to_stack(motor, direction, percent):
-                                                        self.error('Command was added to Execution-list.')
-                                                    else:
-                                                        self.error('Command could not be added to Execution-list.')
-                                                        return False
-                                            else:
-                                                self.error('Invalid percentage. Percentage must be beween 0 and 100.')
-                                                return False
-                                        else:
-                                            self.error('Invalid direction. Direction must be 1 or -1.')
-                                            return False
-                                    else:
-                                        self.error('Desired motor with pin ' + str(pin) + ' is not available.')
-                                        return False
-
-                                return True
-
-                            else:
-                                self.error('Unexpected tuple element. Last Element must be a boolean.')
-                                return False
-                        else:
-                            self.error('Unexpected tuple element. First three items must be of type Number.')
-                            return False
-                    else:
-                        self.error('Unexpected tuple size. Expected tuple of three')
-                        return False
+        Moves motor according to command_list. All commands are validated before the first one is executed.
+        """
+        if not self.motors:
+            self.error('Component does not contain any motors.')
+            return False
+
+        moves = self.resolve(command_list, 4, self.motor_index, 'motor')
+
+        if moves is None:
+            return False
+
+        for (motor, (pin, direction, percent, execute)) in moves:
+            if direction not in [-1, 0, 1]:
+                self.error('Invalid direction. Direction must be 1 or -1.')
+                return False
+            if not 0 <= percent <= 100:
+                self.error('Invalid percentage. Percentage must be beween 0 and 100.')
+                return False
+
+        for (motor, (pin, direction, percent, execute)) in moves:
+            if execute:
+                if Controller.execute_motor(motor, direction, percent):
+                    self.error('Execution of single command was successful')
                 else:
-                    self.error('Unexpected list element. Expected list of tuples')
+                    self.error('Execution of single command failed')
+                    return False
+            elif batch is not None:
+                if not batch.add_motor(motor, direction, percent):
+                    self.error('Command could not be added to batch.')
                     return False
             else:
-                self.error('Unexpected input: ' + type(command_list).__name__ + '. Expected: list')
-                return False
-        else:
-            self.error('Component does not contain any motors.')
-            return False
+                if Controller.add_motor_to_stack(motor, direction, percent):
+                    self.error('Command was added to Execution-list.')
+                else:
+                    self.error('Command could not be added to Execution-list.')
+                    return False
+
+        return True
 
     def init_command(self, init_list):
         """
@@ -397,77 +378,139 @@ class Component:
         :return: True for successful execution.
         Creates the initialization command for later execution.
         """
-        if isinstance(init_list, list):
-            if all(isinstance(command, tuple) for command in init_list):
-                if all(len(command) == 2 for command in init_list):
-                    if all(isinstance(command[0], numbers.Number) for command in init_list):
-                        if all(isinstance(command[1], bool) for command in init_list):
-                            if self.servos:
-                                for command in init_list:
-                                    pin = command[0]
-                                    servo = next(servo for servo in self.servos if servo.pin == pin)
-
-                                    if servo:
-                                        init_list = [command for command in init_list if command[0] != pin]
-
-                                        if command[1]:
-                                            if Controller.execute_servo(servo, servo.init_pulse):
-                                                self.error('Execution of single command was successful')
-                                            else:
-                                                self.error('Execution of single command failed')
-                                                return False
-                                        else:
-                                            if Controller.add_servo_to_stack(servo, servo.init_pulse):
-                                                self.error('Command was added to Execution-list.')
-                                            else:
-                                                self.error('Command could not be added to Execution-list.')
-                                                return False
-                                    else:
-                                        self.error('Desired servo with pin ' + str(pin) + ' is not available.')
-                                        return False
-
-                            if self.motors:
-                                for command in init_list:
-                                    pin = command[0]
-                                    motor = next(motor for motor in self.motors if motor.pin == pin)
-
-                                    if motor:
-                                        if command[1]:
-                                            if Controller.execute_motor(motor, motor.init_direction, motor.init_percentage):
-                                                self.error('Execution of single command was successful')
-                                            else:
-                                                self.error('Execution of single command failed')
-                                                return False
-                                        else:
-                                            if Controller.add_motor_to_stack(motor, motor.init_direction, motor.init_percentage):
-                                                self.error('Command was added to Execution-list.')
-                                            else:
-                                                self.error('Command could not be added to Execution-list.')
-                                                return False
-                                    else:
-                                        self.error('Desired motor with pin ' + str(pin) + ' is not available.')
-                                        return False
-
-                            if self.servos or self.motors:
-                                return True
-                            else:
-                                self.error('No servo or motor list available.')
-                                return False
-                        else:
-                            self.error('Unexpected tuple element. Second element must be a boolean.')
-                            return False
-                    else:
-                        self.error('Unexpected tuple element. First element must be a number')
-                        return False
+        if not self.servos and not self.motors:
+            self.error('No servo or motor list available.')
+            return False
+
+        index = dict(self.motor_index)
+        index.update(self.servo_index)
+        actuators = self.resolve(init_list, 2, index, 'servo or motor')
+
+        if actuators is None:
+            return False
+
+        for (actuator, (pin, execute)) in actuators:
+            if pin in self.servo_index:
+                if execute:
+                    result = Controller.execute_servo(actuator, actuator.init_pulse)
                 else:
-                    self.error('Unexpected tuple size. Expected tuple of two')
-                    return False
+                    result = Controller.add_servo_to_stack(actuator, actuator.init_pulse)
             else:
+                if execute:
+                    result = Controller.execute_motor(actuator, actuator.init_direction, actuator.init_percentage)
+                else:
+                    result = Controller.add_motor_to_stack(actuator, actuator.init_direction,
+                                                           actuator.init_percentage)
+
+            if execute:
+                self.error('Execution of single command was successful' if result else
+                           'Execution of single command failed')
+            else:
+                self.error('Command was added to Execution-list.' if result else
+                           'Command could not be added to Execution-list.')
+
+            if not result:
+                return False
+
+        return True
+
+    def resolve(self, command_list, size, index, kind):
+        """
+        :param command_list: List of command tuples with a pin first, numbers in between and a boolean last.
+        :param size: Expected size of the tuples.
+        :param index: Dictionary of pin and servo or motor, i.e self.servo_index.
+        :param kind: Name of the indexed actuators for error messages, i.e 'servo'.
+        :return: List of actuator and command tuples, None if the list is invalid.
+        Validates the command list and looks up the actuator of every pin in a single pass.
+        """
+        if not isinstance(command_list, list):
+            self.error('Unexpected input: ' + type(command_list).__name__ + '. Expected: list')
+            return None
+
+        actuators = []
+
+        for command in command_list:
+            if not isinstance(command, tuple):
                 self.error('Unexpected list element. Expected list of tuples')
+                return None
+            if len(command) != size:
+                self.error('Unexpected tuple size. Expected tuple of ' + str(size))
+                return None
+            if not all(isinstance(number, numbers.Number) for number in command[:-1]):
+                self.error('Unexpected tuple element. All but the last element must be numbers.')
+                return None
+            if not isinstance(command[-1], bool):
+                self.error('Unexpected tuple element. Last Element must be a boolean.')
+                return None
+
+            actuator = index.get(command[0])
+
+            if actuator is None:
+                self.error('Desired ' + kind + ' with pin ' + str(command[0]) + ' is not available.')
+                return None
+
+            actuators.append((actuator, command))
+
+        return actuators
+
+    def apply_records(self, records):
+        """
+        :param records: List of tuples of ServoRecord or MotorRecord of the running configuration and the changed record
+                        of the same servo or motor.
+        :return: True for successful applying, False if a servo or motor is not part of the component.
+        Applies changed configurations to live servos and motors. All records are resolved by the pins of the running
+        configuration before any change is applied, so pins can be swapped, and the pin index is rebuilt once.
+        Either all records are applied or none. Positions are kept and no command is sent, so running movements are
+        not interrupted.
+        """
+        targets = []
+
+        for (old, new) in records:
+            if isinstance(new, ServoRecord):
+                target = self.servo_index.get(old.pin)
+                kind = 'servo'
+            else:
+                target = self.motor_index.get(old.pin)
+                kind = 'motor'
+
+            if target is None:
+                self.error('Desired ' + kind + ' with pin ' + str(old.pin) + ' is not available.')
                 return False
-        else:
-            self.error('Unexpected input: ' + type(init_list).__name__ + '. Expected: list')
-            return False
+
+            targets.append(target)
+
+        for (target, (old, new)) in zip(targets, records):
+            if isinstance(new, ServoRecord):
+                target.dependencies = list(new.dependencies)
+                target.pin = new.pin
+                target.max_pulse = new.max_pulse
+                target.min_pulse = new.min_pulse
+                target.pulse_span = abs(new.max_pulse - new.min_pulse)
+                target.abs_max_pulse = new.abs_max_pulse
+                target.abs_min_pulse = new.abs_min_pulse
+                target.pulse_width = new.pulse_width
+                target.init_pulse = new.init_pulse
+                Controller.index_dependencies(target)
+            else:
+                target.pin = new.pin
+                target.init_percentage = new.init_percentage
+                target.init_direction = new.init_direction
+                target.pulse_width = new.pulse_width
+
+        moved = [pin for (old, new) in records if old.pin != new.pin for pin in (old.pin, new.pin)]
+
+        if moved:
+            self.index()
+            Controller.forget_sent(moved)
+
+        return True
+
+    def stop(self):
+        """
+        :return: True for successful stopping.
+        Emergency stop of all servos and motors of the component.
+        """
+        return Controller.emergency_stop([servo.pin for servo in self.servos] + [motor.pin for motor in self.motors])
 
     def error(self, string):
         """
@@ -0,0 +1,136 @@
+import os
+import time
+from collections import OrderedDict
+
+from johnnyv.core.Configuration import Configuration
+from johnnyv.core.Telemetry import Telemetry
+from johnnyv.core.Verification import Verification
+
+
+class ConfigWatcher:
+    """
+    Hot reload of Constants.json.
+    The file is checked periodically. A changed file is validated and only the changed servos, motors, cameras and
+    sensors are applied to the live objects of the robot, without sending commands or reopening hardware.
+    Changes of other settings, i.e 'ssc32u', and added or removed entries require a restart.
+    """
+
+    def __init__(self, robot, interval=1.0):
+        """
+        :param robot: Robot with 'components' and 'peripherals' dictionaries, i.e JohnnyV.
+        :param interval: Seconds between two checks of the file.
+        """
+        self.robot = robot
+        self.interval = interval
+        self.poll = None
+        self.key = ConfigWatcher.file_key(Configuration.path)
+        self.reloads = 0
+        self.reload_time = None
+
+    @staticmethod
+    def file_key(path):
+        """
+        :param path: Path of the watched file.
+        :return: Modification time and size of the file, None if it does not exist.
+        """
+        try:
+            status = os.stat(path)
+        except OSError:
+            return None
+        return status.st_mtime_ns, status.st_size
+
+    def start(self):
+        """
+        :return: True if the watcher is running.
+
+        Checks the file periodically in the background.
+        """
+        if self.poll is None:
+            self.poll = Telemetry(self.check, 1 / self.interval)
+        return self.poll.start()
+
+    def stop(self):
+        """
+        :return: True for successful stopping.
+        """
+        if self.poll is not None:
+            self.poll.stop()
+            self.poll = None
+        return True
+
+    def check(self):
+        """
+        :return: True if the file changed and all changes were applied.
+
+        Reloads the file if its modification time or size changed since the last check.
+        """
+        key = ConfigWatcher.file_key(Configuration.path)
+
+        if key is None or key == self.key:
+            return False
+
+        self.key = key
+        return self.reload()
+
+    def reload(self):
+        """
+        :return: True if all changes were applied.
+
+        Compiles and validates the file and applies the differences to the running configuration.
+        Invalid files are rejected and the running configuration is kept. Changes which could not be applied keep
+        their running value, so they are reported again on the next reload.
+        """
+        start = time.perf_counter()
+        old = Configuration.get()
+
+        try:
+            new = Configuration.compile_file(Configuration.path)
+        except (OSError, KeyError, TypeError, ValueError) as error:
+            print('ConfigWatcher: Configuration could not be loaded: ' + str(error))
+            return False
+
+        if not Verification.validate(new['constants']):
+            print('ConfigWatcher: Configuration is invalid and was not applied.')
+            return False
+
+        changes = Configuration.diff(old, new)
+        applied = self.apply(changes)
+
+        if len(applied) == len(changes):
+            Configuration.compiled = new
+        else:
+            Configuration.compiled = Configuration.commit(old, new, applied)
+
+        self.reloads += 1
+        self.reload_time = time.perf_counter() - start
+        return len(applied) == len(changes)
+
+    def apply(self, changes):
+        """
+        :param changes: List of tuples of kind, key, old and new value, see Configuration.diff().
+        :return: List of the changes which were applied to the robot.
+
+        The servos and motors of a component are applied together, so their pins can be swapped.
+        """
+        applied = []
+        components = OrderedDict()
+
+        for change in changes:
+            (kind, key, old, new) = change
+
+            if old is not None and new is not None:
+                if kind in ('servos', 'motors') and new.component in self.robot.components:
+                    components.setdefault(new.component, []).append(change)
+                    continue
+                elif kind in ('cameras', 'sensors') and key in self.robot.peripherals:
+                    if self.robot.peripherals[key].apply_record(new):
+                        applied.append(change)
+                    continue
+
+            print('ConfigWatcher: Change of ' + kind + ' ' + str(key) + ' requires a restart.')
+
+        for (component, entries) in components.items():
+            if self.robot.components[component].apply_records([(old, new) for (kind, key, old, new) in entries]):
+                applied.extend(entries)
+
+        return applied
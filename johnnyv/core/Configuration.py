@@ -0,0 +1,312 @@
+import copy
+import json
+import os
+from collections import OrderedDict
+from johnnyv.core.Records import ServoRecord, MotorRecord, CameraRecord, SensorRecord
+
+
+class Configuration:
+    """
+    Shared configuration of the robot.
+    Constants.json is compiled on first use into typed records of all servos, motors, cameras and sensors, which
+    are shared by all classes. The compiled form is cached on disk, keyed by modification time, size and content
+    hash of the file, so warm starts skip parsing the JSON file.
+    The environment variable JOHNNYV_CONSTANTS overrides the path of the file, JOHNNYV_CACHE the cache directory.
+    """
+
+    directory = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ext')
+    path = os.environ.get('JOHNNYV_CONSTANTS', os.path.join(directory, 'Constants.json'))
+    schema_path = os.path.join(directory, 'Schema.json')
+    cache_directory = os.environ.get('JOHNNYV_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'johnnyv'))
+    # Increased whenever the compiled form changes, so caches of older versions are ignored.
+    version = 1
+    files = {}
+    compiled = None
+    source = None
+
+    @staticmethod
+    def get():
+        """
+        :return: Dictionary of the compiled configuration.
+
+        Compiles Constants.json on first use.
+        """
+        if Configuration.compiled is None:
+            Configuration.compiled = Configuration.compile_file(Configuration.path)
+        return Configuration.compiled
+
+    @staticmethod
+    def constants():
+        """
+        :return: Dictionary of Constants.json.
+        """
+        return Configuration.get()['constants']
+
+    @staticmethod
+    def section(name):
+        """
+        :param name: Name of a top-level entry, i.e 'ssc32u'.
+        :return: Dictionary of the entry.
+        """
+        return Configuration.constants()[name]
+
+    @staticmethod
+    def components():
+        """
+        :return: List of component names, i.e ['head', 'left_arm'].
+        """
+        return list(Configuration.get()['servos'])
+
+    @staticmethod
+    def servos(component):
+        """
+        :param component: Name of a component, i.e 'head'.
+        :return: Tuple of the ServoRecords of the component.
+        """
+        return Configuration.get()['servos'][component]
+
+    @staticmethod
+    def motors(component):
+        """
+        :param component: Name of a component, i.e 'track'.
+        :return: Tuple of the MotorRecords of the component.
+        """
+        return Configuration.get()['motors'][component]
+
+    @staticmethod
+    def cameras():
+        """
+        :return: Dictionary of camera name and CameraRecord.
+        """
+        return Configuration.get()['cameras']
+
+    @staticmethod
+    def sensors():
+        """
+        :return: Dictionary of sensor name and SensorRecord.
+        """
+        return Configuration.get()['sensors']
+
+    @staticmethod
+    def schema():
+        """
+        :return: Dictionary of Schema.json.
+        """
+        return Configuration.load(Configuration.schema_path)
+
+    @staticmethod
+    def load(path):
+        """
+        :param path: Path of a JSON file.
+        :return: Dictionary of the file.
+
+        Reads a JSON file once and returns the parsed content on subsequent calls.
+        """
+        if path not in Configuration.files:
+            with open(path) as file:
+                Configuration.files[path] = json.load(file)
+
+        return Configuration.files[path]
+
+    @staticmethod
+    def clear():
+        """
+        :return: True for successful clearing.
+
+        Discards the loaded files, so they are read again on next use.
+        """
+        Configuration.files.clear()
+        Configuration.compiled = None
+        Configuration.source = None
+        return True
+
+    @staticmethod
+    def compile(constants):
+        """
+        :param constants: Dictionary of Constants.json.
+        :return: Dictionary of the compiled configuration.
+
+        Builds the records of all servos, motors, cameras and sensors.
+        """
+        servos = OrderedDict()
+        motors = OrderedDict()
+
+        for (component, value) in constants['components'].items():
+            servos[component] = tuple(ServoRecord.from_dict(servo, component=component, name=name)
+                                      for (name, servo) in value['servo_list'].items())
+            motors[component] = tuple(MotorRecord.from_dict(motor, component=component, name=name)
+                                      for (name, motor) in value['motor_list'].items())
+
+        return {'constants': constants,
+                'servos': servos,
+                'motors': motors,
+                'cameras': OrderedDict((name, CameraRecord.from_dict(camera, name=name))
+                                       for (name, camera) in constants['cameras'].items()),
+                'sensors': OrderedDict((name, SensorRecord.from_dict(sensor, name=name))
+                                       for (name, sensor) in constants['sensors'].items())}
+
+    @staticmethod
+    def diff(old, new):
+        """
+        :param old: Dictionary of the running compiled configuration.
+        :param new: Dictionary of the changed compiled configuration.
+        :return: List of tuples of kind, key, old and new value.
+
+        Compares two compiled configurations. The kinds are 'servos', 'motors', 'cameras', 'sensors' with records and
+        'section' with the dictionaries of other top-level entries, i.e 'ssc32u'. Servos and motors are keyed by
+        component and name, i.e ('head', 'head_servo'). Added entries have no old, removed entries no new value.
+        """
+        changes = []
+
+        for kind in ('servos', 'motors'):
+            changes.extend(Configuration.diff_entries(kind, Configuration.by_name(old[kind]),
+                                                      Configuration.by_name(new[kind])))
+
+        for kind in ('cameras', 'sensors'):
+            changes.extend(Configuration.diff_entries(kind, old[kind], new[kind]))
+
+        sections = [name for name in list(old['constants']) + list(new['constants'])
+                    if name not in ('components', 'cameras', 'sensors')]
+        changes.extend(Configuration.diff_entries('section',
+                                                  {name: old['constants'].get(name) for name in sections},
+                                                  {name: new['constants'].get(name) for name in sections}))
+        return changes
+
+    @staticmethod
+    def commit(old, new, changes):
+        """
+        :param old: Dictionary of the running compiled configuration.
+        :param new: Dictionary of the changed compiled configuration.
+        :param changes: List of the applied changes, see diff().
+        :return: Dictionary of the running configuration with the applied changes of the changed configuration.
+
+        Changes which are not listed keep their running value, so they are reported again by the next diff().
+        """
+        constants = copy.deepcopy(old['constants'])
+
+        for (kind, key, before, after) in changes:
+            if kind in ('servos', 'motors'):
+                (component, name) = key
+                path = (constants['components'][component][kind[:-1] + '_list'],
+                        new['constants']['components'][component][kind[:-1] + '_list'], name)
+            elif kind in ('cameras', 'sensors'):
+                path = (constants[kind], new['constants'][kind], key)
+            else:
+                path = (constants, new['constants'], key)
+
+            (target, source, name) = path
+
+            if name in source:
+                target[name] = copy.deepcopy(source[name])
+            else:
+                target.pop(name, None)
+
+        return Configuration.compile(constants)
+
+    @staticmethod
+    def diff_entries(kind, old, new):
+        """
+        :param kind: Kind of the entries, i.e 'servos'.
+        :param old: Dictionary of key and old value.
+        :param new: Dictionary of key and new value.
+        :return: List of tuples of kind, key, old and new value of all differing entries.
+        """
+        changes = [(kind, key, value, new.get(key)) for (key, value) in old.items() if new.get(key) != value]
+        changes.extend((kind, key, None, value) for (key, value) in new.items() if key not in old)
+        return changes
+
+    @staticmethod
+    def by_name(records):
+        """
+        :param records: Dictionary of component name and records, i.e the 'servos' of a compiled configuration.
+        :return: OrderedDict of component and record name and record.
+        """
+        return OrderedDict(((record.component, record.name), record)
+                           for component in records.values() for record in component)
+
+    @staticmethod
+    def compile_file(path):
+        """
+        :param path: Path of Constants.json.
+        :return: Dictionary of the compiled configuration.
+
+        Returns the cached compiled form if modification time and size of the file are unchanged. Otherwise the
+        file is hashed and only parsed if its content changed. Configuration.source tells where the result came
+        from: 'cache' or 'json'.
+        """
+        import hashlib
+
+        status = os.stat(path)
+        key = (status.st_mtime_ns, status.st_size)
+        cache_path = Configuration.cache_path(path)
+        cached = Configuration.read_cache(cache_path)
+
+        if cached is not None and cached['key'] == key:
+            Configuration.source = 'cache'
+            return cached['compiled']
+
+        with open(path, 'rb') as file:
+            data = file.read()
+        digest = hashlib.sha1(data).hexdigest()
+
+        if cached is not None and cached['hash'] == digest:
+            Configuration.source = 'cache'
+            compiled = cached['compiled']
+        else:
+            Configuration.source = 'json'
+            compiled = Configuration.compile(json.loads(data.decode('utf-8'), object_pairs_hook=OrderedDict))
+
+        Configuration.write_cache(cache_path, {'version': Configuration.version, 'key': key, 'hash': digest,
+                                               'compiled': compiled})
+        return compiled
+
+    @staticmethod
+    def cache_path(path):
+        """
+        :param path: Path of Constants.json.
+        :return: Path of the cache file of the configuration.
+        """
+        import hashlib
+
+        name = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+        return os.path.join(Configuration.cache_directory, 'constants-' + name + '.pickle')
+
+    @staticmethod
+    def read_cache(cache_path):
+        """
+        :param cache_path: Path of the cache file.
+        :return: Dictionary of the cache entry, None if there is no valid entry.
+        """
+        import pickle
+
+        try:
+            with open(cache_path, 'rb') as file:
+                cached = pickle.load(file)
+        except (OSError, EOFError, AttributeError, ImportError, IndexError, ValueError, pickle.UnpicklingError):
+            return None
+
+        if not isinstance(cached, dict) or cached.get('version') != Configuration.version:
+            return None
+        return cached
+
+    @staticmethod
+    def write_cache(cache_path, entry):
+        """
+        :param cache_path: Path of the cache file.
+        :param entry: Dictionary to be cached.
+        :return: True for successful writing, False if the cache directory is not writable.
+
+        Replaces the cache file atomically, so concurrent starts never read a partial file.
+        """
+        import pickle
+
+        temporary = cache_path + '.' + str(os.getpid())
+
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(temporary, 'wb') as file:
+                pickle.dump(entry, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, cache_path)
+            return True
+        except OSError:
+            return False
@@ -1,17 +1,34 @@
-from johnnyv.core.SSC32U import SSC32U
+from collections import OrderedDict
+from johnnyv.core.BoardRegistry import BoardRegistry
 from johnnyv.core.RaspberryPi import RaspberryPi
 from johnnyv.core.Observer import Observer
+from johnnyv.core.Command import Command
+from johnnyv.core.CommandBuffer import CommandBuffer
+from johnnyv.core.Telemetry import Telemetry
 
 
 class Controller:
     """
     Interface between components and control boards.
+    The boards and the Raspberry Pi are initialized on first use, so importing the Controller touches no hardware.
     """
 
-    ssc32u = SSC32U()
-    raspberryPi = RaspberryPi()
-    execution_list = []
-    servos_to_notify = []
+    boards = None
+    ssc32u = None
+    async_ssc32u = None
+    telemetry = None
+    raspberryPi = None
+    execution_list = CommandBuffer()
+    servos_to_notify = OrderedDict()
+    dependents = {}
+    # Pin and pulse and time tuple of the last sent command, see filter_unchanged().
+    last_sent = {}
+    stops = 0
+    # Number of emergency stops at the last stop of a pin, or of all pins, see stopped_since().
+    stopped_pins = {}
+    stopped_all = 0
+    suppressed_commands = 0
+    bytes_saved = 0
 
     # Observable methods
     @staticmethod
@@ -20,13 +37,13 @@ class Controller:
         :param list_of_observers: List of Observers which should be added.
         :return: True for successful adding.
 
-        Method adds Observers to the servos_to_notify list.
+        Method adds Observers to the servos_to_notify dictionary and indexes them by the pins they depend on.
         """
         if isinstance(list_of_observers, list):
             if all(isinstance(observer, Observer) for observer in list_of_observers):
                 for single_observer in list_of_observers:
                     if single_observer not in Controller.servos_to_notify:
-                        Controller.servos_to_notify.append(single_observer)
+                        Controller.index_dependencies(single_observer)
                 return True
             else:
                 print("Controller: Unexpected list element. Expected list of Observer")
@@ -44,7 +61,11 @@ class Controller:
         Removes given observer from list.
         """
         if observer in Controller.servos_to_notify:
-            Controller.servos_to_notify.remove(observer)
+            for pin in Controller.servos_to_notify.pop(observer):
+                del Controller.dependents[pin][observer]
+
+                if not Controller.dependents[pin]:
+                    del Controller.dependents[pin]
             return True
         else:
             return False
@@ -57,11 +78,31 @@ class Controller:
         Removes all servomotors from the servos_to_notify list.
         """
         if Controller.servos_to_notify:
-            del Controller.servos_to_notify[:]
+            Controller.servos_to_notify.clear()
+            Controller.dependents.clear()
             return True
         else:
             return False
 
+    @staticmethod
+    def index_dependencies(observer):
+        """
+        :param observer: Observer to be indexed.
+        :return: True for successful indexing.
+
+        Registers the observer for the pins in its 'dependencies', replacing a previous registration, i.e after the
+        dependencies of a servo changed. Observers without dependencies attribute are notified about every pin.
+        """
+        Controller.remove_servos(observer)
+        dependencies = getattr(observer, 'dependencies', None)
+        pins = (None,) if dependencies is None else tuple(OrderedDict.fromkeys(dependencies))
+
+        for pin in pins:
+            Controller.dependents.setdefault(pin, OrderedDict())[observer] = None
+
+        Controller.servos_to_notify[observer] = pins
+        return True
+
     @staticmethod
     def update_servo_information(pin, degree):
         """
@@ -69,27 +110,232 @@ class Controller:
         :param degree: Degree of Movement.
         :return: True for successful updating.
 
-        Hands over changed servomotor-information to every servomotor in servos_to_notify.
+        Hands over changed servomotor-information to the servomotors depending on the pin.
         """
-        for servos in Controller.servos_to_notify:
-            servos.update(pin, degree)
+        for key in (pin, None):
+            for servo in list(Controller.dependents.get(key, ())):
+                servo.update(pin, degree)
 
         return True
 
+    # Hardware methods
+    @staticmethod
+    def get_boards():
+        """
+        :return: Registry of all SSC32U boards.
+
+        Connects the boards of the 'ssc32u' settings on first use.
+        """
+        if Controller.boards is None:
+            Controller.boards = BoardRegistry.from_settings()
+            Controller.ssc32u = Controller.boards.primary()
+        return Controller.boards
+
+    @staticmethod
+    def get_ssc32u():
+        """
+        :return: The primary SSC32U board.
+        """
+        return Controller.get_boards().primary()
+
+    @staticmethod
+    def get_raspberry_pi():
+        """
+        :return: The Raspberry Pi.
+
+        Creates the Raspberry Pi on first use.
+        """
+        if Controller.raspberryPi is None:
+            Controller.raspberryPi = RaspberryPi()
+        return Controller.raspberryPi
+
     # Servomotor and gearedmotor methods
     @staticmethod
     def execute_stack():
         """
         :return: True for successful execution.
 
-        Executes all commands in execution stack.
+        Executes all commands in execution stack as one group move.
+        """
+        return Controller.send(Controller.execution_list.take())
+
+    @staticmethod
+    def execute_frame(command_list, updates, stops):
         """
-        if Controller.ssc32u.exec_command(Controller.execution_list):
-            del Controller.execution_list[:]
+        :param command_list: List of Commands.
+        :param updates: List of servo pin and degree tuples.
+        :param stops: Number of emergency stops when the frame was submitted.
+        :return: True for successful execution.
+
+        Executes a frame submitted to a FrameQueue and notifies the servo observers.
+        Frames submitted before an emergency stop of one of their pins are discarded.
+        """
+        if Controller.stopped_since(stops, [command.pin for command in command_list]):
+            print('Controller: Frame discarded by emergency stop.')
+            return False
+
+        if not Controller.send(command_list):
+            return False
+
+        for (pin, degree) in updates:
+            Controller.update_servo_information(pin, degree)
+
+        return True
+
+    @staticmethod
+    def send(command_list, wait=True):
+        """
+        :param command_list: List of Commands to be executed.
+        :param wait: True if the method should return after the movement is done.
+        :return: True for successful execution.
+
+        Executes the commands which would change the state of the board and remembers them as last sent.
+        """
+        commands = Controller.filter_unchanged(command_list)
+
+        if not commands:
+            if command_list:
+                Controller.bytes_saved += len(b' \r')
             return True
+
+        if Controller.get_boards().exec_command(commands, wait):
+            return Controller.remember_sent(commands)
+        else:
+            return False
+
+    @staticmethod
+    def send_lines(lines, command_list):
+        """
+        :param lines: Lines of the commands encoded in advance, see BoardRegistry.encode().
+        :param command_list: List of Commands of the lines.
+        :return: True for successful writing.
+
+        Writes a frame encoded in advance without waiting and remembers its commands as last sent. The lines are not
+        filtered again, unchanged channels are dropped when they are encoded, see Trajectory.changed().
+        """
+        if Controller.get_boards().write_lines(lines):
+            return Controller.remember_sent(command_list)
+        else:
+            return False
+
+    @staticmethod
+    def remember_sent(command_list):
+        """
+        :param command_list: List of Commands written to the board.
+        :return: True for successful storing.
+
+        Stores the pulses and times of the commands as last sent.
+        """
+        Controller.last_sent.update((command.pin, (command.pulse, command.time)) for command in command_list)
+        return True
+
+    @staticmethod
+    def filter_unchanged(command_list):
+        """
+        :param command_list: List of Commands.
+        :return: List of Commands which differ from the last sent command of their pin.
+
+        Drops commands repeating the last sent pulse and time of a pin and counts the saved bytes. A command with the
+        same pulse but another time is sent, since it changes the speed of a movement which may still be running.
+        """
+        commands = []
+
+        for command in command_list:
+            if Controller.last_sent.get(command.pin) == (command.pulse, command.time):
+                Controller.suppressed_commands += 1
+                Controller.bytes_saved += len(command.data)
+            else:
+                commands.append(command)
+
+        return commands
+
+    @staticmethod
+    def forget_sent(pins=None):
+        """
+        :param pins: Pins whose last sent command is unknown now, None for all pins.
+        :return: True for successful removing.
+
+        Removes pins from the last sent cache, so that their next command is always sent.
+        """
+        if pins is None:
+            Controller.last_sent.clear()
         else:
-            del Controller.execution_list[:]
+            for pin in pins:
+                Controller.last_sent.pop(pin, None)
+
+        return True
+
+    @staticmethod
+    def forget_board(board, channels=None):
+        """
+        :param board: SSC32U whose servo positions are unknown now, i.e after a reconnect.
+        :param channels: Channels of the board, None for all channels.
+        :return: True for successful removing.
+
+        Removes the pins of a board from the last sent cache. All pins are removed if the board is not registered.
+        """
+        boards = Controller.boards
+
+        if boards is None or board not in boards.offsets:
+            return Controller.forget_sent()
+
+        offset = boards.offsets[board]
+        channels = range(BoardRegistry.channels) if channels is None else channels
+        return Controller.forget_sent([offset + channel for channel in channels])
+
+    @staticmethod
+    def emergency_stop(pins=None):
+        """
+        :param pins: Pins to be stopped, i.e the pins of a component, None for all pins.
+        :return: True for successful stopping.
+
+        Stops the pins at their current position ahead of all pending commands. Stacked commands, waiting frames and
+        running trajectories of the stopped pins are discarded, see stopped_since(). The stopped pins are removed from
+        the last sent cache, since their position is unknown now.
+        Only drivers which are open already are stopped, a stop never connects the boards, since nothing can move on
+        a board which was not connected. The latency of the stop is stored in Controller.boards.stop_latency.
+        """
+        Controller.stops += 1
+
+        if pins is None:
+            Controller.stopped_all = Controller.stops
+            Controller.stopped_pins.clear()
+        else:
+            Controller.stopped_pins.update((pin, Controller.stops) for pin in pins)
+
+        stopped = True
+
+        if Controller.async_ssc32u is not None:
+            stopped = Controller.async_ssc32u.emergency_stop(pins)
+        if Controller.boards is not None:
+            stopped = Controller.boards.emergency_stop(pins) and stopped
+
+        Controller.execution_list.clear(pins)
+        Controller.forget_sent(pins)
+        return stopped
+
+    @staticmethod
+    def stopped_since(stops, pins):
+        """
+        :param stops: Number of emergency stops when a frame was submitted, see Controller.stops.
+        :param pins: Pins moved by the frame.
+        :return: True if one of the pins was stopped since.
+        """
+        if stops == Controller.stops:
             return False
+        if Controller.stopped_all > stops:
+            return True
+        return any(Controller.stopped_pins.get(pin, 0) > stops for pin in pins)
+
+    @staticmethod
+    def set_flush_window(window):
+        """
+        :param window: Seconds after the first stacked command at which the stack is executed, None disables it.
+        :return: True for successful setting.
+
+        Executes the stack automatically, so that commands issued within the window are sent as one group move.
+        """
+        return Controller.execution_list.set_window(window, Controller.execute_stack)
 
     @staticmethod
     def add_to_stack(command):
@@ -97,7 +343,7 @@ class Controller:
         :param command: Command to be stored in execution list.
         :return: True for successful execution.
 
-        Adds commands to execution_stack.
+        Adds commands to execution_stack. A pending command on the same pin is replaced.
         """
         if Controller.check_commands(command):
             Controller.execution_list.extend(command)
@@ -114,7 +360,12 @@ class Controller:
 
         Adds a servo movement to the execution stack.
         """
-        command = [Controller.get_servo_command(servo, degree)]
+        try:
+            command = [Controller.get_servo_command(servo, degree)]
+        except ValueError as error:
+            print(error)
+            return False
+
         return Controller.add_to_stack(command)
 
     @staticmethod
@@ -127,7 +378,12 @@ class Controller:
 
         Add a motor movement to the execution stack.
         """
-        command = [Controller.get_motor_command(motor, direction, percentage)]
+        try:
+            command = [Controller.get_motor_command(motor, direction, percentage)]
+        except ValueError as error:
+            print(error)
+            return False
+
         return Controller.add_to_stack(command)
 
     @staticmethod
@@ -139,10 +395,7 @@ class Controller:
         Directly executes given command.
         """
         if Controller.check_commands(command):
-            if Controller.ssc32u.exec_command(command):
-                return True
-            else:
-                return False
+            return Controller.send(command)
         else:
             return False
 
@@ -155,7 +408,11 @@ class Controller:
 
         Execute command with degree on servomotor.
         """
-        command = [Controller.get_servo_command(servo, degree)]
+        try:
+            command = [Controller.get_servo_command(servo, degree)]
+        except ValueError as error:
+            print(error)
+            return False
 
         if Controller.direct_execute(command):
             Controller.update_servo_information(servo.pin, degree)
@@ -173,9 +430,69 @@ class Controller:
 
         Execute command with direction and percentage on motor.
         """
-        command = [Controller.get_motor_command(motor, direction, percentage)]
+        try:
+            command = [Controller.get_motor_command(motor, direction, percentage)]
+        except ValueError as error:
+            print(error)
+            return False
         return Controller.direct_execute(command)
 
+    @staticmethod
+    def read_positions():
+        """
+        :return: True for successful reading.
+
+        Reads the pulse widths of all registered servos with one batched query and updates their positions.
+        """
+        servos = [servo for servo in Controller.servos_to_notify if hasattr(servo, 'pin')]
+        pulses = Controller.get_boards().query_pulse_widths([servo.pin for servo in servos])
+
+        if len(pulses) != len(servos):
+            return False
+
+        for servo in servos:
+            # Channels without pulse have not been moved yet and keep their position.
+            if pulses[servo.pin]:
+                servo.current_position = Controller.convert_pulse(pulses[servo.pin])
+
+        return True
+
+    @staticmethod
+    def start_telemetry(rate=None):
+        """
+        :param rate: Readings per second, the 'telemetry_rate' setting of the SSC32U if None.
+        :return: True if the telemetry is running.
+
+        Starts reading the servo positions periodically in the background.
+        """
+        Controller.stop_telemetry()
+        Controller.telemetry = Telemetry(Controller.read_positions,
+                                         Controller.get_ssc32u().telemetry_rate if rate is None else rate)
+        return Controller.telemetry.start()
+
+    @staticmethod
+    def stop_telemetry():
+        """
+        :return: True for successful stopping.
+
+        Stops the periodic reading of servo positions.
+        """
+        if Controller.telemetry is not None:
+            Controller.telemetry.stop()
+            Controller.telemetry = None
+
+        return True
+
+    @staticmethod
+    def convert_pulse(pulse):
+        """
+        :param pulse: Pulse to be converted.
+        :return: Converted pulse.
+
+        Convert pulse to degree, inverse of convert_degree().
+        """
+        return int(round((pulse - 500) * 9 / 100))
+
     @staticmethod
     def convert_degree(degree):
         """
@@ -184,7 +501,7 @@ class Controller:
 
         Convert degree to pulse.
         """
-        return str(int(500 + (100 / 9) * int(degree)))
+        return int(500 + (100 / 9) * int(degree))
 
     @staticmethod
     def convert_pulse_width(current_position, degree, pulse_span, pulse_width):
@@ -198,9 +515,9 @@ class Controller:
         Compute optimal pulse width for desired servo action.
         """
         if current_position == degree:
-            return str(pulse_width)
+            return int(pulse_width)
         else:
-            return str(int((abs(current_position - degree) / pulse_span) * pulse_width))
+            return int((abs(current_position - degree) / pulse_span) * pulse_width)
 
     @staticmethod
     def check_commands(command_list):
@@ -208,37 +525,14 @@ class Controller:
         :param command_list: List of commands to be checked.
         :return: True if all commands are Ok.
 
-        Checks the integrity of the command list.
+        Checks the integrity of the command list. Commands are validated on creation,
+        so only the types have to be checked.
         """
         if isinstance(command_list, list):
-            if all(isinstance(string, str) for string in command_list):
-                if all(command.count(':') == 2 for command in command_list):
-                    for command in command_list:
-                        split_command = command.split(':')
-
-                        pin = split_command[0]
-                        degree = split_command[1]
-                        time = split_command[2]
-
-                        if pin.isdigit():
-                            if degree.isdigit():
-                                if not time.isdigit():
-                                    print("Controller: Unexpected input: " + time + ". Expected: 'number'")
-                                    return False
-                            else:
-                                print("Controller: Unexpected input: " + degree + ". Expected: 'number'")
-                                return False
-                        else:
-                            print("Controller: Unexpected input: " + pin + ". Expected: 'number'")
-                            return False
-
-                    return True
-
-                else:
-                    print("Controller: Input does not fit command pattern. Too many ':' were found")
-                    return False
+            if all(isinstance(command, Command) for command in command_list):
+                return True
             else:
-                print("Controller: Unexpected list element. Expected list of strings")
+                print("Controller: Unexpected list element. Expected list of Command")
                 return False
         else:
             print(command_list)
@@ -254,11 +548,24 @@ class Controller:
 
         Creates a servo movement command according to the degree given.
         """
-        return '{0}:{1}:{2}'.format(str(servo.pin), Controller.convert_degree(degree),
-                                    Controller.convert_pulse_width(servo.current_position,
-                                                                   degree,
-                                                                   servo.pulse_span,
-                                                                   servo.pulse_width))
+        return Command(servo.pin, Controller.convert_degree(degree),
+                       Controller.convert_pulse_width(servo.current_position,
+                                                      degree,
+                                                      servo.pulse_span,
+                                                      servo.pulse_width))
+
+    @staticmethod
+    def get_servo_commands(moves):
+        """
+        :param moves: List of servo and degree tuples.
+        :return: List of servo commands.
+
+        Creates the commands of several servo movements at once, see get_servo_command().
+        """
+        return Command.from_arrays([servo.pin for (servo, degree) in moves],
+                                   [Controller.convert_degree(degree) for (servo, degree) in moves],
+                                   [Controller.convert_pulse_width(servo.current_position, degree, servo.pulse_span,
+                                                                   servo.pulse_width) for (servo, degree) in moves])
 
     @staticmethod
     def get_motor_command(motor, direction, percentage):
@@ -270,7 +577,114 @@ class Controller:
 
         Create a motor movement command.
         """
-        return str(motor.pin) + ':' + str(direction * (300 + 2 * percentage) + 1500) + ':1000'
+        return Command(motor.pin, int(direction * (300 + 2 * percentage) + 1500), 1000)
+
+    # Asynchronous servomotor and gearedmotor methods
+    @staticmethod
+    def get_async_ssc32u():
+        """
+        :return: The asynchronous SSC32U driver.
+
+        Creates the asynchronous driver for the configured port of the primary board on first use, without opening
+        the synchronous board. The asynchronous driver only drives the primary board.
+        """
+        if Controller.async_ssc32u is None:
+            from johnnyv.core.AsyncSSC32U import AsyncSSC32U
+            primary = next(iter(BoardRegistry.board_settings().values()))
+            Controller.async_ssc32u = AsyncSSC32U(primary["port"])
+        return Controller.async_ssc32u
+
+    @staticmethod
+    async def async_send(command_list):
+        """
+        :param command_list: List of Commands to be executed.
+        :return: True for successful execution.
+
+        Coroutine version of send(). Commands are discarded if an emergency stop of one of their pins happens before
+        they are written, waiting for the movement ends at an emergency stop.
+        """
+        stops = Controller.stops
+        commands = Controller.filter_unchanged(command_list)
+        pins = [command.pin for command in commands]
+
+        if not commands:
+            if command_list:
+                Controller.bytes_saved += len(b' \r')
+            return True
+
+        ssc32u = Controller.get_async_ssc32u()
+        await ssc32u.open()
+
+        if Controller.stopped_since(stops, pins):
+            print('Controller: Commands discarded by emergency stop.')
+            return False
+
+        if not await ssc32u.exec_command(commands, wait=False) or Controller.stopped_since(stops, pins):
+            return False
+
+        Controller.remember_sent(commands)
+        return await ssc32u.wait_for_motion()
+
+    @staticmethod
+    async def async_execute_stack():
+        """
+        :return: True for successful execution.
+
+        Coroutine version of execute_stack().
+        """
+        return await Controller.async_send(Controller.execution_list.take())
+
+    @staticmethod
+    async def async_direct_execute(command):
+        """
+        :param command: Command to be executed.
+        :return: True for successful execution.
+
+        Coroutine version of direct_execute().
+        """
+        if Controller.check_commands(command):
+            return await Controller.async_send(command)
+        else:
+            return False
+
+    @staticmethod
+    async def async_execute_servo(servo, degree):
+        """
+        :param servo: Desired servo.
+        :param degree: Desired degree.
+        :return: True for successful execution.
+
+        Coroutine version of execute_servo().
+        """
+        try:
+            command = [Controller.get_servo_command(servo, degree)]
+        except ValueError as error:
+            print(error)
+            return False
+
+        if await Controller.async_direct_execute(command):
+            Controller.update_servo_information(servo.pin, degree)
+            return True
+        else:
+            return False
+
+    @staticmethod
+    async def async_execute_motor(motor, direction, percentage):
+        """
+        :param motor: Desired motor.
+        :param direction: Desired direction.
+        :param percentage: Desire percentage.
+        :return: Call to async_direct_execute().
+
+        Coroutine version of execute_motor().
+        """
+        try:
+            command = [Controller.get_motor_command(motor, direction, percentage)]
+        except ValueError as error:
+            print(error)
+            return False
+
+        return await Controller.async_direct_execute(command)
 
     # Camera methods
     @staticmethod
@@ -304,7 +718,7 @@ class Controller:
 
         Method for getting the address of the connected sensor.
         """
-        return Controller.raspberryPi.get_sensor_addr()
+        return Controller.get_raspberry_pi().get_sensor_addr()
 
     @staticmethod
     def write_to_sensor(sensor, unit):
@@ -315,7 +729,7 @@ class Controller:
 
         Method to write commands to sensor.
         """
-        return Controller.raspberryPi.write_to_sensor(sensor, sensor.unit_set[unit])
+        return Controller.get_raspberry_pi().write_to_sensor(sensor, sensor.unit_set[unit])
 
     @staticmethod
     def light_level(sensor):
@@ -325,7 +739,7 @@ class Controller:
 
         Method for reading current light level of SRF08 sensor.
         """
-        return Controller.raspberryPi.light_level(sensor)
+        return Controller.get_raspberry_pi().light_level(sensor)
 
     @staticmethod
     def sensor_range(sensor):
@@ -335,7 +749,7 @@ class Controller:
 
         Method to return raw range of sensor.
         """
-        return Controller.raspberryPi.sensor_range(sensor)
+        return Controller.get_raspberry_pi().sensor_range(sensor)
 
     @staticmethod
     def measure_range(sensor, unit):
@@ -346,4 +760,4 @@ class Controller:
 
         Method for returning aggregated range.
         """
-        return Controller.raspberryPi.measure_range(sensor, sensor.unit_set[unit])
+        return Controller.get_raspberry_pi().measure_range(sensor, sensor.unit_set[unit])
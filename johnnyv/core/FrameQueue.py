@@ -0,0 +1,52 @@
+import threading
+from collections import deque
+
+from johnnyv.core.Controller import Controller
+
+
+class FrameQueue:
+    """
+    Double-buffered queue of the motion frames of one robot.
+    Every JohnnyV has its own queue, so batches of different robots do not wait for each other, while the frames of
+    one robot are executed one after another in submission order.
+    """
+
+    def __init__(self):
+        self.submitter = None
+        self.submitted = deque()
+        self.lock = threading.Lock()
+
+    def submit(self, command_list, updates=None):
+        """
+        :param command_list: List of Commands of one frame, i.e the commands of a Batch.
+        :param updates: List of servo pin and degree tuples to notify the observers of after the execution.
+        :return: Future of the execution, its result is True for successful execution, see Controller.execute_frame().
+
+        Executes a frame as one group move in the background. One frame executes while the next one waits,
+        submitting a further frame blocks until the executing one is done.
+        """
+        with self.lock:
+            if self.submitter is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self.submitter = ThreadPoolExecutor(max_workers=1)
+
+            # Failures of earlier frames belong to their own futures and are not raised here.
+            while self.submitted and (self.submitted[0].done() or len(self.submitted) >= 2):
+                self.submitted.popleft().exception()
+
+            future = self.submitter.submit(Controller.execute_frame, command_list, updates or [], Controller.stops)
+            self.submitted.append(future)
+            return future
+
+    def close(self):
+        """
+        :return: True for successful closing.
+
+        Waits for the submitted frames and stops the thread of the queue, a later frame starts a new one.
+        """
+        with self.lock:
+            if self.submitter is not None:
+                self.submitter.shutdown(wait=True)
+                self.submitter = None
+            self.submitted.clear()
+        return True
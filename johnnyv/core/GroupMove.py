@@ -0,0 +1,91 @@
+import math
+import time
+
+from johnnyv.core.Command import Command
+from johnnyv.core.Controller import Controller
+
+
+class GroupMove:
+    """
+    Synchronized movement of several servos.
+    All servos share one move time, so they start and arrive together like a group move of the SSC32U board:
+
+        move = robot.group_move({19: 135, 24: 129})
+        move.execute(wait=False)
+        time.sleep(move.remaining())
+
+    The shared time is the time the servo with the largest normalized delta needs at its speed limit, which is
+    'pulse_span' degrees in 'pulse_width' milliseconds.
+    """
+
+    def __init__(self, moves, min_time=0):
+        """
+        :param moves: List of servo and degree tuples.
+        :param min_time: Minimum time of the movement in milliseconds.
+        """
+        for (servo, degree) in moves:
+            if not servo.min_pulse <= degree <= servo.max_pulse:
+                raise ValueError('GroupMove: ' + str(degree) + ' is not allowed for pin ' + str(servo.pin) + '.')
+
+        self.moves = list(moves)
+        self.time = max([min_time] + [GroupMove.move_time(servo, degree) for (servo, degree) in self.moves])
+        self.commands = [Command(servo.pin, Controller.convert_degree(degree), self.time)
+                         for (servo, degree) in self.moves]
+        self.finish = None
+
+    def __len__(self):
+        return len(self.moves)
+
+    def add_commands(self, command_list):
+        """
+        :param command_list: List of Commands sent in the same line, i.e of motors.
+        :return: True for successful adding.
+
+        The time of the added commands is not synchronized.
+        """
+        self.commands.extend(command_list)
+        return True
+
+    @staticmethod
+    def move_time(servo, degree):
+        """
+        :param servo: Servo to be moved.
+        :param degree: Desired degree.
+        :return: Milliseconds the servo needs at its speed limit, 0 if it does not move.
+        """
+        delta = abs(servo.current_position - degree)
+
+        if delta == 0 or servo.pulse_span == 0:
+            return 0
+        return min(65535, int(math.ceil(delta / servo.pulse_span * servo.pulse_width)))
+
+    def execute(self, wait=True):
+        """
+        :param wait: True if the method should return after the movement is done.
+        :return: True for successful execution.
+
+        Sends the movement as one line and predicts its finish time, see remaining(). If all commands repeat the last
+        sent pulses, nothing is written and the servos count as arrived.
+        """
+        boards = Controller.get_boards()
+        previous = boards.finish_time()
+
+        if not Controller.send(self.commands, wait):
+            return False
+
+        finish = boards.finish_time()
+        self.finish = finish if finish != previous else time.perf_counter()
+
+        for (servo, degree) in self.moves:
+            servo.current_position = degree
+            Controller.update_servo_information(servo.pin, degree)
+
+        return True
+
+    def remaining(self):
+        """
+        :return: Seconds until all servos are expected to arrive, 0 if they arrived or the movement was not executed.
+        """
+        if self.finish is None:
+            return 0.0
+        return max(0.0, self.finish - time.perf_counter())
@@ -1,22 +1,27 @@
-import json
+from johnnyv.core.Batch import Batch
 from johnnyv.core.Component import Component
 from johnnyv.core.Camera import Camera
+from johnnyv.core.ConfigWatcher import ConfigWatcher
+from johnnyv.core.Configuration import Configuration
+from johnnyv.core.FrameQueue import FrameQueue
+from johnnyv.core.GroupMove import GroupMove
+from johnnyv.core.Snapshot import Snapshot
 from johnnyv.core.SRF08 import SRF08
 from johnnyv.core.Controller import Controller
-from johnnyv.core.RaspberryPi import RaspberryPi
 
 
 class JohnnyV:
     """
     Core class of JohnnyV robot.
     """
-    constants = json.load(open('/home/link//JohnnyV/johnnyv/ext/Constants.json'))
-
     def __init__(self):
-        self.components = {key: Component(key) for (key, value) in self.constants['components'].items()}
-        self.peripherals = {key: Camera(key) for (key, value) in self.constants['cameras'].items()}
-        self.peripherals.update({key: SRF08(key) for (key, value) in self.constants['sensors'].items()})
+        self.components = {key: Component(key) for key in Configuration.components()}
+        self.peripherals = {key: Camera(key) for key in Configuration.cameras()}
+        self.peripherals.update({key: SRF08(key) for key in Configuration.sensors()})
         self.controller = Controller()
+        self.frames = FrameQueue()
+        self.watcher = None
+        self.pose_engine = None
 
     def initialize(self):
         """
@@ -31,19 +36,167 @@ class JohnnyV:
             print("Initialization error!")
             raise
 
-    def reset(self):
+    def reset(self, snapshot=None):
         """
+        :param snapshot: Snapshot of the robot to return to, the configured defaults if None.
         :return: True for successful reset.
 
-        Resets the robot, e.g setts all components to their standards.
+        Resets the robot, e.g setts all components to their standards. The settings of the snapshot are restored and
+        all servos and motors move back with one group move.
         """
         try:
-            JohnnyV.validate_results([value.reset() for (key, value) in self.components.items()], 'Reset')
-            return True
+            if snapshot is None:
+                snapshot = self.defaults()
+
+            if not self.restore(snapshot):
+                print('JohnnyV: Reset failed.')
+                return False
+
+            servos = self.servos()
+            motors = {motor.pin: motor for component in self.components.values() for motor in component.motors}
+            move = GroupMove([(servos[pin], degree) for (pin, degree) in snapshot.positions() if pin in servos])
+            move.add_commands([Controller.get_motor_command(motors[state[0]], motors[state[0]].init_direction,
+                                                            motors[state[0]].init_percentage)
+                               for state in snapshot.motors if state[0] in motors])
+
+            if move.execute():
+                print('JohnnyV: Reset was successful.')
+                return True
+            else:
+                print('JohnnyV: Reset failed. Commands could not be written to SSC board.')
+                return False
         except:
             print("Reset error!")
             raise
 
+    def defaults(self):
+        """
+        :return: Snapshot of the configured settings of all components, with all servos at their initial position.
+        """
+        return Snapshot.merge(component.defaults() for component in self.components.values())
+
+    def snapshot(self):
+        """
+        :return: Snapshot of the current settings and positions of all components.
+        """
+        return Snapshot.merge(component.snapshot() for component in self.components.values())
+
+    def restore(self, snapshot, positions=False):
+        """
+        :param snapshot: Snapshot of the robot.
+        :param positions: True if the known positions should be restored as well, no command is sent.
+        :return: True for successful restoring.
+
+        Restores the settings of all components without moving, see reset() to move back as well.
+        """
+        return all([component.restore(snapshot, positions) for component in self.components.values()])
+
+    def servos(self):
+        """
+        :return: Dictionary of pin and ServoMotor of all components.
+        """
+        return {servo.pin: servo for component in self.components.values() for servo in component.servos}
+
+    def watch_configuration(self, interval=1.0):
+        """
+        :param interval: Seconds between two checks of Constants.json.
+        :return: True if the configuration is watched.
+
+        Applies changes of Constants.json to the running robot, see ConfigWatcher.
+        """
+        self.stop_watching_configuration()
+        self.watcher = ConfigWatcher(self, interval)
+        return self.watcher.start()
+
+    def stop_watching_configuration(self):
+        """
+        :return: True for successful stopping.
+        """
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        return True
+
+    def apply_pose(self, targets):
+        """
+        :param targets: Pose, dictionary of pin and degree, or list of pin and degree tuples.
+        :return: True for successful execution.
+
+        Moves all servos of the pose as one group move, so they arrive together. Degrees are clamped to the limits of
+        each servo and converted for the whole robot at once, see PoseEngine.
+        """
+        from johnnyv.core.Pose import Pose
+        from johnnyv.core.PoseEngine import PoseEngine
+
+        if self.pose_engine is None:
+            self.pose_engine = PoseEngine([servo for component in self.components.values()
+                                           for servo in component.servos], synchronized=True)
+        else:
+            self.pose_engine.refresh()
+
+        pose = targets if isinstance(targets, Pose) else Pose(targets)
+        (commands, moves) = self.pose_engine.commands(pose)
+
+        if not (Controller.add_to_stack(commands) and self.execute_stack()):
+            return False
+        return self.pose_engine.commit(moves)
+
+    def group_move(self, targets, min_time=0):
+        """
+        :param targets: Dictionary of pin and degree, or list of pin and degree tuples.
+        :param min_time: Minimum time of the movement in milliseconds.
+        :return: New GroupMove, False if a servo is not available or a degree is not allowed.
+
+        Plans a synchronized movement with a predicted finish time, i.e 'robot.group_move({19: 135}).execute()'.
+        """
+        servos = self.servos()
+        pairs = list(targets.items() if isinstance(targets, dict) else targets)
+
+        for (pin, degree) in pairs:
+            if pin not in servos:
+                print('JohnnyV: Desired servo with pin ' + str(pin) + ' is not available.')
+                return False
+
+        try:
+            return GroupMove([(servos[pin], degree) for (pin, degree) in pairs], min_time)
+        except ValueError as error:
+            print(error)
+            return False
+
+    def trajectory(self, keyframes, rate=50, interpolation='min_jerk'):
+        """
+        :param keyframes: List of time in seconds and targets tuples, targets are a Pose or a dictionary of pin and
+                          degree.
+        :param rate: Setpoints per second, i.e 50.
+        :param interpolation: 'min_jerk' or 'cubic', see Trajectory.
+        :return: New Trajectory.
+
+        Plans a smooth movement through keyframes, i.e 'robot.trajectory([(0.5, {19: 135})]).play()'.
+        """
+        from johnnyv.core.Trajectory import Trajectory
+
+        return Trajectory(keyframes, self.servos(), rate, interpolation)
+
+    def batch(self, wait=False):
+        """
+        :param wait: True if the batch should return after its movement is done.
+        :return: New Batch.
+
+        Creates a motion transaction for the next frame, i.e 'with robot.batch() as batch: ...'. Batches of all threads
+        are executed one after another in submission order on the frame queue of the robot, batches of other robots
+        do not wait for them.
+        """
+        return Batch(wait, self.frames)
+
+    @staticmethod
+    def emergency_stop():
+        """
+        :return: True for successful stopping.
+
+        Stops all servos and motors of the robot at their current position.
+        """
+        return Controller.emergency_stop()
+
     @staticmethod
     def validate_results(feedback_list, method):
         """
@@ -69,137 +222,38 @@ class JohnnyV:
         Parallel execution of pending commands on the SSC32U board.
         """
         try:
-            Controller.execute_stack()
-            return True
+            return Controller.execute_stack()
         except:
             print("Executing stack failed!")
             raise
 
     def dab(self):
-        head = self.components['head']
-        base = self.components['base']
-        back = self.components['back']
-        left_arm = self.components['left_arm']
-        right_arm = self.components['right_arm']
-
-        # Head
-        head.move_servo([(29, 153, False)])
-
-        # Base
-        base.move_servo([(16, 99, False)])
-
-        # Back
-        back.move_servo([(17, 90, False), (18, 108, False)])
-
-        # LeftArm
-        left_arm.move_servo([(19, 90, False), (20, 81, False), (21, 90, False),
-                             (22, 90, False), (23, 63, False)])
-
-        # RightArm
-        right_arm.move_servo([(24, 0, False), (25, 9, False), (26, 90, False),
-                              (27, 18, False), (28, 114, False)])
-
-        # Execute
-        self.execute_stack()
+        self.apply_pose({29: 153,                                           # Head
+                         16: 99,                                            # Base
+                         17: 90, 18: 108,                                   # Back
+                         19: 90, 20: 81, 21: 90, 22: 90, 23: 63,            # LeftArm
+                         24: 0, 25: 9, 26: 90, 27: 18, 28: 114})            # RightArm
 
     def praise_the_lord(self):
-        head = self.components['head']
-        base = self.components['base']
-        back = self.components['back']
-        left_arm = self.components['left_arm']
-        right_arm = self.components['right_arm']
-
-        # Head
-        head.move_servo([(29, 90, False)])
-
-        # Base
-        base.move_servo([(16, 90, False)])
-
-        # Back
-        back.move_servo([(17, 90, False), (18, 72, False)])
-
-        # LeftArm
-        left_arm.move_servo([(19, 180, False), (20, 180, False), (21, 90, False),
-                             (22, 90, False), (23, 63, False)])
-
-        # RightArm
-        right_arm.move_servo([(24, 8, False), (25, 0, False), (26, 90, False),
-                              (27, 90, False), (28, 114, False)])
+        self.apply_pose({29: 90,                                            # Head
+                         16: 90,                                            # Base
+                         17: 90, 18: 72,                                    # Back
+                         19: 180, 20: 180, 21: 90, 22: 90, 23: 63,          # LeftArm
+                         24: 8, 25: 0, 26: 90, 27: 90, 28: 114})            # RightArm
 
-        # Execute
-        self.execute_stack()
-
-        # LeftArm
-        left_arm.move_servo([(23, 180, False)])
-
-        # RightArm
-        right_arm.move_servo([(28, 0, False)])
-
-        # Execute
-        self.execute_stack()
-
-        # LeftArm
-        left_arm.move_servo([(23, 63, False)])
-
-        # RightArm
-        right_arm.move_servo([(28, 114, False)])
-
-        # Execute
-        self.execute_stack()
-
-        # LeftArm
-        left_arm.move_servo([(23, 180, False)])
-
-        # RightArm
-        right_arm.move_servo([(28, 0, False)])
-
-        # Execute
-        self.execute_stack()
+        for (left_hand, right_hand) in ((180, 0), (63, 114), (180, 0)):
+            self.apply_pose({23: left_hand, 28: right_hand})
 
     def running_man(self):
-        left_arm = self.components['left_arm']
-        right_arm = self.components['right_arm']
         track = self.components['track']
 
-        # LeftArm
-        left_arm.move_servo([(19, 135, False), (22, 90, False)])
-
-        # RightArm
-        right_arm.move_servo([(24, 129, False), (27, 90, False)])
-
-        # Track
-        track.move_motor([(31, 1, 50, False)])
+        # Track, started before the arms swing
+        with self.batch(wait=True) as batch:
+            track.move_motor([(31, 1, 50, False)], batch)
 
-        # Execute
-        self.execute_stack()
-
-        # LeftArm
-        left_arm.move_servo([(19, 54, False), (22, 90, False)])
-
-        # RightArm
-        right_arm.move_servo([(24, 45, False), (27, 90, False)])
-
-        # Execute
-        self.execute_stack()
-
-        # LeftArm
-        left_arm.move_servo([(19, 135, False), (22, 90, False)])
-
-        # RightArm
-        right_arm.move_servo([(24, 129, False), (27, 90, False)])
-
-        # Execute
-        self.execute_stack()
-
-        # LeftArm
-        left_arm.move_servo([(19, 54, False), (22, 90, False)])
-
-        # RightArm
-        right_arm.move_servo([(24, 45, False), (27, 90, False)])
-
-        # Execute
-        self.execute_stack()
+        # Arms swing through the keyframes without stopping
+        keyframes = [(0.65 * (step + 1), {19: left_arm, 22: 90, 24: right_arm, 27: 90})
+                     for (step, (left_arm, right_arm)) in enumerate(((135, 129), (54, 45), (135, 129), (54, 45)))]
+        self.trajectory(keyframes, interpolation='cubic').play()
 
         track.move_motor([(31, 0, 0, True)])
-
-
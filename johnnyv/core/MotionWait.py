@@ -0,0 +1,107 @@
+import threading
+import time
+
+
+class MotionWait:
+    """
+    Completion tracker for a movement sent to the SSC32U board.
+    """
+
+    def __init__(self, ssc32u, duration, confirm=False, timeout=0, poll_interval=0.01):
+        """
+        :param ssc32u: Board executing the movement.
+        :param duration: Expected duration of the movement in milliseconds, i.e the largest 'T' value sent.
+        :param confirm: True if the completion should be confirmed with the 'Q' query of the board.
+        :param timeout: Seconds to keep querying the board after the expected finish time.
+        :param poll_interval: Seconds between two 'Q' queries.
+        """
+        self.ssc32u = ssc32u
+        self.duration = duration
+        self.confirm = confirm
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.start = time.perf_counter()
+        self.finish = self.start + duration / 1000
+        self.interrupted = threading.Event()
+
+    def remaining(self):
+        """
+        :return: Seconds until the expected finish time, 0 if it has passed.
+
+        Method for getting the remaining time of the movement.
+        """
+        return max(0.0, self.finish - time.perf_counter())
+
+    def interrupt(self):
+        """
+        :return: True for successful interrupting.
+
+        Releases all waits on the movement, i.e after an emergency stop of the board.
+        """
+        self.interrupted.set()
+        return True
+
+    def is_done(self):
+        """
+        :return: True if the movement is done, False otherwise.
+
+        Non-blocking completion check. Queries the board only after the expected finish time.
+        """
+        if self.remaining() > 0:
+            return False
+        elif self.confirm:
+            return self.ssc32u.is_done()
+        else:
+            return True
+
+    def wait(self):
+        """
+        :return: True if the movement is done, False if the board did not confirm it in time or it was interrupted.
+
+        Blocks until the expected finish time and, if requested, until the board confirms the completion.
+        """
+        if self.interrupted.wait(self.remaining()):
+            return False
+
+        if not self.confirm:
+            return True
+
+        deadline = self.finish + self.timeout
+
+        while not self.ssc32u.is_done():
+            if time.perf_counter() >= deadline:
+                print('MotionWait: Movement was not confirmed by the board.')
+                return False
+            if self.interrupted.wait(self.poll_interval):
+                return False
+
+        return True
+
+    async def async_wait(self):
+        """
+        :return: True if the movement is done, False if the board did not confirm it in time or it was interrupted.
+
+        Coroutine version of wait() for boards with an awaitable is_done(), i.e AsyncSSC32U.
+        """
+        import asyncio
+
+        while self.remaining() > 0 and not self.interrupted.is_set():
+            await asyncio.sleep(min(self.remaining(), self.poll_interval))
+
+        if self.interrupted.is_set():
+            return False
+
+        if not self.confirm:
+            return True
+
+        deadline = self.finish + self.timeout
+
+        while not await self.ssc32u.is_done():
+            if time.perf_counter() >= deadline:
+                print('MotionWait: Movement was not confirmed by the board.')
+                return False
+            await asyncio.sleep(self.poll_interval)
+            if self.interrupted.is_set():
+                return False
+
+        return True
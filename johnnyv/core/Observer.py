@@ -2,6 +2,7 @@ import abc
 
 
 class Observer(metaclass=abc.ABCMeta):
+    __slots__ = ()
 
     @abc.abstractmethod
     def update(self, pin, degree):
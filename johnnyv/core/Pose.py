@@ -0,0 +1,61 @@
+import numbers
+
+import numpy
+
+from johnnyv.core.Command import Command
+
+
+class Pose:
+    """
+    Target degrees of the whole robot in one array indexed by pin.
+    Pins without a target are NaN and are not moved, i.e Pose({29: 90, 16: 99}).
+    """
+
+    size = Command.max_pin + 1
+
+    def __init__(self, targets=None):
+        """
+        :param targets: Dictionary of pin and degree, or list of pin and degree tuples.
+        """
+        self.degrees = numpy.full(Pose.size, numpy.nan)
+
+        if targets:
+            self.update(targets)
+
+    def __len__(self):
+        return int(numpy.count_nonzero(~numpy.isnan(self.degrees)))
+
+    def set(self, pin, degree):
+        """
+        :param pin: Pin of a servo.
+        :param degree: Target degree of the servo.
+        :return: True for successful setting.
+        """
+        return self.update([(pin, degree)])
+
+    def update(self, targets):
+        """
+        :param targets: Dictionary of pin and degree, or list of pin and degree tuples.
+        :return: True for successful setting.
+
+        Sets the targets of several pins at once. Existing targets of other pins are kept.
+        """
+        pairs = list(targets.items()) if isinstance(targets, dict) else list(targets)
+
+        for (pin, degree) in pairs:
+            if not isinstance(pin, numbers.Integral) or not 0 <= pin < Pose.size:
+                raise ValueError('Pose: Unexpected pin: ' + str(pin) + '.')
+            if not isinstance(degree, numbers.Number):
+                raise ValueError('Pose: Unexpected degree: ' + str(degree) + '.')
+
+        if pairs:
+            (pins, degrees) = zip(*pairs)
+            self.degrees[list(pins)] = degrees
+
+        return True
+
+    def pins(self):
+        """
+        :return: Array of the pins with a target.
+        """
+        return numpy.flatnonzero(~numpy.isnan(self.degrees))
@@ -0,0 +1,118 @@
+import numpy
+
+from johnnyv.core.Command import Command
+from johnnyv.core.Controller import Controller
+from johnnyv.core.Pose import Pose
+
+
+class PoseEngine:
+    """
+    Vectorized conversion of Poses into movement commands.
+    Limits, pulse spans, pulse widths and positions of all servos are held in arrays indexed by pin, so degree to
+    pulse conversion, clamping to 'min_pulse'/'max_pulse' and timing are computed for the whole robot at once.
+    """
+
+    def __init__(self, servos=None, synchronized=False):
+        """
+        :param servos: List of ServoMotors to be moved by poses.
+        :param synchronized: True if all servos of a pose should share one move time, see GroupMove.
+        """
+        self.servos = {}
+        self.synchronized = synchronized
+        self.known = numpy.zeros(Pose.size, dtype=bool)
+        self.min_degree = numpy.zeros(Pose.size)
+        self.max_degree = numpy.zeros(Pose.size)
+        self.pulse_span = numpy.ones(Pose.size)
+        self.pulse_width = numpy.zeros(Pose.size)
+        self.position = numpy.zeros(Pose.size)
+
+        if servos:
+            self.add_servos(servos)
+
+    def add_servos(self, servos):
+        """
+        :param servos: List of ServoMotors.
+        :return: True for successful adding.
+        """
+        for servo in servos:
+            self.servos[servo.pin] = servo
+
+        return self.refresh()
+
+    def refresh(self):
+        """
+        :return: True for successful refreshing.
+
+        Copies limits, pulse widths and positions of the servos into the arrays, i.e after their properties changed.
+        The servos are indexed by their current pins again, so swapped pins of a reloaded configuration are followed.
+        Servos of one ServoBank are copied with one array operation per field.
+        """
+        self.servos = {servo.pin: servo for servo in self.servos.values()}
+        pins = list(self.servos)
+        servos = list(self.servos.values())
+        banks = {id(servo.bank): servo.bank for servo in servos}
+
+        self.known[:] = False
+        self.known[pins] = True
+
+        for (target, name) in ((self.min_degree, 'min_pulse'), (self.max_degree, 'max_pulse'),
+                               (self.pulse_span, 'pulse_span'), (self.pulse_width, 'pulse_width'),
+                               (self.position, 'current_position')):
+            if len(banks) == 1:
+                target[pins] = getattr(servos[0].bank, name)[pins]
+            else:
+                target[pins] = [getattr(servo, name) for servo in servos]
+
+        return True
+
+    def plan(self, pose):
+        """
+        :param pose: Pose to be planned.
+        :return: Arrays of pins, clamped degrees, pulses and times of all servos moved by the pose.
+
+        Converts a pose like Controller.convert_degree() and Controller.convert_pulse_width() for every servo,
+        with one vectorized operation each. Pins without servo are ignored. Synchronized poses use the time of the
+        slowest servo for all servos, like GroupMove.
+        """
+        pins = numpy.flatnonzero(self.known & ~numpy.isnan(pose.degrees))
+        degrees = numpy.clip(pose.degrees[pins], self.min_degree[pins], self.max_degree[pins])
+        pulses = (500 + (100 / 9) * numpy.trunc(degrees)).astype(int)
+
+        delta = numpy.abs(self.position[pins] - degrees)
+        span = self.pulse_span[pins]
+        width = self.pulse_width[pins]
+        scaled = delta / numpy.where(span > 0, span, 1) * width
+
+        if self.synchronized:
+            moving = (delta > 0) & (span > 0)
+            shared = numpy.ceil(scaled[moving]).max() if moving.any() else 0
+            times = numpy.full(len(pins), min(shared, 65535), dtype=int)
+        else:
+            times = numpy.clip(numpy.where(delta == 0, width, scaled), 0, 65535).astype(int)
+
+        return pins, degrees, pulses, times
+
+    def commands(self, pose):
+        """
+        :param pose: Pose to be executed.
+        :return: List of Commands of the pose and list of pin and degree tuples of the moved servos.
+
+        Plans the pose without changing the servo positions, see commit().
+        """
+        (pins, degrees, pulses, times) = self.plan(pose)
+        commands = Command.from_arrays(pins.tolist(), pulses.tolist(), times.tolist())
+        return commands, list(zip(pins.tolist(), degrees.tolist()))
+
+    def commit(self, moves):
+        """
+        :param moves: List of pin and degree tuples of servos which were moved, see commands().
+        :return: True for successful storing.
+
+        Stores the degrees as the new servo positions after the commands were sent, like GroupMove.
+        """
+        for (pin, degree) in moves:
+            self.position[pin] = degree
+            self.servos[pin].current_position = degree
+            Controller.update_servo_information(pin, degree)
+
+        return True
@@ -1,9 +1,7 @@
 import os
 import glob
-import smbus
 import time
-import json
-#from picamera import PiCamera
+from johnnyv.core.Configuration import Configuration
 
 
 class RaspberryPi:
@@ -15,14 +13,24 @@ class RaspberryPi:
     Full specs: https://www.raspberrypi.org/products/raspberry-pi-2-model-b/
     """
 
-    constants = json.load(open('/home/link/JohnnyV/johnnyv/ext/Constants.json'))
-
     def __init__(self):
-        self.rpi_specs = RaspberryPi.constants['raspberrypi']
+        self.rpi_specs = Configuration.section('raspberrypi')
         self.ip = self.rpi_specs["ip"]
         self.username = self.rpi_specs["username"]
         self.password = self.rpi_specs["password"]
-        self.smbus = smbus.SMBus(1)
+        self.smbus = None
+
+    def get_smbus(self):
+        """
+        :return: The I2C bus of the sensors.
+
+        Method for getting the I2C bus. The bus is opened on first use.
+        """
+        if self.smbus is None:
+            import smbus
+            self.smbus = smbus.SMBus(1)
+
+        return self.smbus
 
     @staticmethod
     def get_usb_port():
@@ -55,7 +63,7 @@ class RaspberryPi:
         Method for writing bytes to SRF08 sensor.
         """
         print("RaspberryPi: ")
-        return self.smbus.write_byte_data(sensor.sensor_addr, 0, value)
+        return self.get_smbus().write_byte_data(sensor.sensor_addr, 0, value)
 
     def light_level(self, sensor):
         """
@@ -64,7 +72,7 @@ class RaspberryPi:
 
         Method for reading current light level of SRF08 sensor.
         """
-        return self.smbus.read_byte_data(sensor.sensor_addr, 1)
+        return self.get_smbus().read_byte_data(sensor.sensor_addr, 1)
 
     def sensor_range(self, sensor):
         """
@@ -73,8 +81,8 @@ class RaspberryPi:
 
         Method to return raw range of SRF08 sensor.
         """
-        range1 = self.smbus.read_byte_data(sensor.sensor_addr, 2)
-        range2 = self.smbus.read_byte_data(sensor.sensor_addr, 3)
+        range1 = self.get_smbus().read_byte_data(sensor.sensor_addr, 2)
+        range2 = self.get_smbus().read_byte_data(sensor.sensor_addr, 3)
         return (range1 << 8) + range2
 
     def measure_range(self, sensor, unit):
@@ -101,6 +109,8 @@ class RaspberryPi:
 
         Method for capturing a picture.
         """
+        from picamera import PiCamera
+
         try:
             with PiCamera() as pi_camera:
                 pi_camera.resolution = camera.resolution
@@ -129,6 +139,8 @@ class RaspberryPi:
 
         Method for recording a video.
         """
+        from picamera import PiCamera
+
         try:
             with PiCamera() as pi_camera:
                 pi_camera.resolution = camera.resolution
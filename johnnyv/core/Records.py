@@ -0,0 +1,82 @@
+class Record:
+    """
+    Typed, slotted configuration record compiled from Constants.json.
+    Subclasses list their fields with the type every value is converted to.
+    """
+
+    __slots__ = ()
+    fields = ()
+
+    def __init__(self, **values):
+        """
+        :param values: Value of every field, i.e pin=16.
+        """
+        for (name, kind) in self.fields:
+            if name not in values:
+                raise ValueError(type(self).__name__ + ": Missing field '" + name + "'.")
+            setattr(self, name, kind(values[name]))
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.as_tuple() == other.as_tuple()
+
+    def __repr__(self):
+        return type(self).__name__ + '(' + ', '.join(name + '=' + repr(getattr(self, name))
+                                                      for (name, kind) in self.fields) + ')'
+
+    def __getstate__(self):
+        return self.as_tuple()
+
+    def __setstate__(self, state):
+        for ((name, kind), value) in zip(self.fields, state):
+            setattr(self, name, value)
+
+    def as_tuple(self):
+        """
+        :return: Tuple of all field values.
+        """
+        return tuple(getattr(self, name) for (name, kind) in self.fields)
+
+    def as_dict(self):
+        """
+        :return: Dictionary of field name and value.
+        """
+        return {name: getattr(self, name) for (name, kind) in self.fields}
+
+    @classmethod
+    def from_dict(cls, values, **extra):
+        """
+        :param values: Dictionary of a Constants.json entry.
+        :param extra: Values of fields which are not part of the entry, i.e the name of the entry.
+        :return: The record of the entry.
+        """
+        merged = dict(values)
+        merged.update(extra)
+        return cls(**merged)
+
+
+class ServoRecord(Record):
+    __slots__ = ('component', 'name', 'color_scheme', 'dependencies', 'pin', 'max_pulse', 'min_pulse',
+                 'abs_max_pulse', 'abs_min_pulse', 'pulse_width', 'init_pulse', 'voltage')
+    fields = (('component', str), ('name', str), ('color_scheme', str), ('dependencies', tuple), ('pin', int),
+              ('max_pulse', int), ('min_pulse', int), ('abs_max_pulse', int), ('abs_min_pulse', int),
+              ('pulse_width', int), ('init_pulse', int), ('voltage', float))
+
+
+class MotorRecord(Record):
+    __slots__ = ('component', 'name', 'color_scheme', 'pin', 'init_percentage', 'init_direction', 'pulse_width',
+                 'voltage')
+    fields = (('component', str), ('name', str), ('color_scheme', str), ('pin', int), ('init_percentage', int),
+              ('init_direction', int), ('pulse_width', int), ('voltage', float))
+
+
+class CameraRecord(Record):
+    __slots__ = ('name', 'resolution', 'resolution_set', 'brightness', 'contrast', 'sharpness', 'saturation',
+                 'rotation', 'hflip', 'vflip', 'picture_extension', 'video_extension', 'picture_path', 'video_path')
+    fields = (('name', str), ('resolution', str), ('resolution_set', list), ('brightness', int), ('contrast', int),
+              ('sharpness', int), ('saturation', int), ('rotation', int), ('hflip', bool), ('vflip', bool),
+              ('picture_extension', str), ('video_extension', str), ('picture_path', str), ('video_path', str))
+
+
+class SensorRecord(Record):
+    __slots__ = ('name', 'unit', 'unit_set')
+    fields = (('name', str), ('unit', str), ('unit_set', dict))
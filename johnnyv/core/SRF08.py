@@ -1,4 +1,4 @@
-import json
+from johnnyv.core.Configuration import Configuration
 from johnnyv.core.Controller import Controller
 
 
@@ -7,22 +7,32 @@ class SRF08:
     Ultrasonic ranger (range-finder) with light sensor
     """
 
-    constants = json.load(open('/home/link//JohnnyV/johnnyv/ext/Constants.json'))
-
     def __init__(self, sensor_id):
         """
         :param sensor_id: ID/Name of sensor.
         """
         self.sensor_id = sensor_id
-        self.sensor_specs = SRF08.constants['sensors'][sensor_id]
+        self.sensor_specs = Configuration.sensors().get(sensor_id)
 
         if self.sensor_specs:
             self.sensor_addr = Controller.get_sensor_addr()
-            self.unit = self.sensor_specs["unit"]
-            self.unit_set = self.sensor_specs["unit_set"]
+            self.unit = self.sensor_specs.unit
+            self.unit_set = dict(self.sensor_specs.unit_set)
         else:
             print(self.sensor_id+": No specifications found for given Sensor-ID.")
 
+    def apply_record(self, record):
+        """
+        :param record: Changed SensorRecord of the sensor.
+        :return: True for successful applying.
+
+        Applies a changed configuration to the sensor. The address of the sensor is kept.
+        """
+        self.sensor_specs = record
+        self.unit = record.unit
+        self.unit_set = dict(record.unit_set)
+        return True
+
     def write(self, unit=None):
         """
         :param unit: Unit of measurement, i.e 'inches'. Standard is on 'centimeter'.
@@ -1,7 +1,8 @@
-import json
-import serial
+import threading
 import time
-from johnnyv.core.RaspberryPi import RaspberryPi
+from johnnyv.core.Configuration import Configuration
+from johnnyv.core.MotionWait import MotionWait
+from johnnyv.core.Command import Command
 
 
 class SSC32U:
@@ -13,35 +14,216 @@ class SSC32U:
     Full specs: https://www.robotshop.com/media/files/pdf2/lynxmotion_ssc-32u_usb_user_guide.pdf
     """
 
-    def __init__(self):
-        settings = json.load(open('/home/link/JohnnyV/johnnyv/ext/Constants.json'))["ssc32u"]
-        self.port = "/dev/ttyUSB0" #RaspberryPi.get_usb_port()
-        self.baud = settings["baud"]
+    # Queries like 'VER' or 'R4' are answered with ASCII text terminated by a carriage return.
+    terminator = b'\r'
+    escape = b'\x1b'
+    # Beginning of the reply to 'VER', used to recognize the board while probing baud rates.
+    version_prefix = b'SSC32'
+    # Port and baud rate negotiated with its board, so later connections to the port use that rate.
+    negotiated = {}
+
+    def __init__(self, port=None, persistent=True):
+        """
+        :param port: Serial port or pySerial URL of the board, i.e '/dev/ttyUSB0'.
+        :param persistent: Keep the serial session open between commands. False opens and closes the port per call.
+
+        The connection uses the negotiated baud rate of the port, the configured one if none was negotiated. The rate
+        is negotiated once per board by BoardRegistry.from_settings(), see negotiate_baud().
+        """
+        settings = Configuration.section("ssc32u")
+        self.port = port if port is not None else "/dev/ttyUSB0"
+        self.baud = SSC32U.negotiated.get(self.port, settings["baud"])
         self.timeout = settings["timeout"]
         self.execution_time = settings["execution_time"]
+        self.confirm_motion = settings.get("confirm_motion", False)
+        self.baud_rates = settings.get("baud_rates", [self.baud])
+        self.probe_timeout = 0.2
+        self.switch_delay = 0.05
+        self.bytes_per_second = None
+        self.telemetry_rate = settings.get("telemetry_rate", 0)
+        self.motion = None
+        self.persistent = persistent
+        self.lock = threading.RLock()
+        # Guards single writes only, so an emergency stop never waits for the reply of a query.
+        self.write_lock = threading.Lock()
+        self.stops = 0
+        self.stop_latency = None
         self.ser = SSC32U.initialize(self)
 
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
     def initialize(self):
         """
         :return: Returns an instance of the initialized serial connection.
 
         Method for initializing a SSC32U board serial connection.
+        The connection stays open for persistent sessions and is closed otherwise.
         """
+        import serial
+
         try:
-            ser = serial.Serial(port=self.port, baudrate=self.baud, timeout=self.timeout)
-            return ser
+            ser = serial.serial_for_url(self.port, baudrate=self.baud, timeout=self.timeout,
+                                        do_not_open=not self.persistent)
         except serial.SerialException:
             print("SSC32U initialization failed. Check parameters!")
             raise
 
+        return ser
+
+    def negotiate_baud(self):
+        """
+        :return: The negotiated baud rate, None if the board did not answer.
+
+        Finds the current baud rate of the board and switches board and connection to the fastest
+        rate in self.baud_rates that answers reliably. Falls back to the rate the board still
+        answers on if a switch fails. The rate is recorded in SSC32U.negotiated for later connections to the port.
+        The measured throughput is stored in self.bytes_per_second. The pins of the board are removed from the last
+        sent cache of the Controller.
+        """
+        from johnnyv.core.Controller import Controller
+
+        Controller.forget_board(self)
+
+        with self.lock:
+            current = self.find_baud()
+
+            for baud in sorted(self.baud_rates, reverse=True):
+                if current is None or baud <= current:
+                    break
+
+                data = ('R4=' + str(baud) + ' \r').encode()
+                self.ser.write(data)
+                self.ser.flush()
+                time.sleep(self.transfer_time(len(data)))
+                self.ser.baudrate = baud
+                time.sleep(self.switch_delay)
+
+                if self.probe(baud):
+                    current = baud
+                else:
+                    print('SSC32U: Switching to ' + str(baud) + ' baud failed.')
+                    current = self.find_baud()
+
+            if current is None:
+                print('SSC32U: Board did not answer on any baud rate. Keeping ' + str(self.baud) + ' baud.')
+                self.ser.baudrate = self.baud
+                return None
+
+            self.baud = current
+            self.ser.baudrate = current
+            SSC32U.negotiated[self.port] = current
+            self.bytes_per_second = self.measure_throughput()
+            return current
+
+    def find_baud(self):
+        """
+        :return: The baud rate the board answers on, None if it does not answer.
+
+        Probes the configured baud rate first and the other supported rates from fastest to slowest.
+        """
+        candidates = [self.baud] + sorted((baud for baud in self.baud_rates if baud != self.baud), reverse=True)
+        return next((baud for baud in candidates if self.probe(baud)), None)
+
+    def probe(self, baud):
+        """
+        :param baud: Baud rate to be probed.
+        :return: True if the board answers on the given baud rate.
+
+        Sends a version query on the given baud rate.
+        """
+        with self.lock:
+            self.ser.baudrate = baud
+            self.ser.reset_input_buffer()
+            timeout = self.ser.timeout
+            self.ser.timeout = self.probe_timeout
+
+            try:
+                # The leading carriage return terminates garbage received on a wrong baud rate.
+                self.ser.write(b'\rVER\r')
+                return self.ser.read_until(SSC32U.terminator).startswith(SSC32U.version_prefix)
+            finally:
+                self.ser.timeout = timeout
+
+    def measure_throughput(self, count=10):
+        """
+        :param count: Number of version queries.
+        :return: Measured bytes per second including the replies.
+
+        Measures the throughput of the connection with version queries.
+        """
+        transferred = 0
+        start = time.perf_counter()
+
+        for _ in range(count):
+            transferred += len(b'VER\r') + len(self.write_read(b'VER\r', SSC32U.terminator)) + 1
+
+        return transferred / (time.perf_counter() - start)
+
+    def open(self):
+        """
+        :return: True if the serial connection is open.
+
+        Opens the serial connection if it is not open yet.
+        """
+        with self.lock:
+            if not self.ser.isOpen():
+                self.ser.open()
+            return True
+
+    def close(self):
+        """
+        :return: True if the serial connection is closed.
+
+        Closes the serial connection.
+        """
+        with self.lock:
+            if self.ser.isOpen():
+                self.ser.close()
+            return True
+
+    def reconnect(self):
+        """
+        :return: True for successful reconnection.
+
+        Closes the serial connection, applies the current port settings and opens it again.
+        The board may have been reset meanwhile, so its pins are removed from the last sent cache of the Controller.
+        """
+        import serial
+        from johnnyv.core.Controller import Controller
+
+        with self.lock:
+            try:
+                self.ser.close()
+            except serial.SerialException:
+                pass
+
+            self.ser = SSC32U.initialize(self)
+            if not self.ser.isOpen():
+                self.ser.open()
+            return Controller.forget_board(self)
+
     def set_execution_time(self, execution_time):
         """
-        :param execution_time: Time the execution needs to execute given commands.
+        :param execution_time: Seconds to wait for the board's confirmation after the expected end of a movement.
 
         Method for setting the execution time of the serial connection.
         """
         self.execution_time = execution_time
 
+    def set_confirm_motion(self, confirm_motion):
+        """
+        :param confirm_motion: True if the end of a movement should be confirmed with the 'Q' query.
+
+        Method for enabling the completion check of movements.
+        """
+        self.confirm_motion = confirm_motion
+
     def set_port(self, port):
         """
         :param port: The value to be set to the port of the serial connection.
@@ -72,20 +254,10 @@ class SSC32U:
 
         Checks connection to the SSC32-U board.
         """
-        if SSC32U.is_closed(self):
-            try:
-                self.ser.open()
-
-                if self.ser.read(self.ser.write('R0 \r'.encode())).decode() != "":
-                    return True
-                else:
-                    return False
-            except serial.SerialException:
-                raise
-            finally:
-                self.ser.close()
+        if self.transfer('R0 \r'.encode(), SSC32U.terminator) != b"":
+            return True
         else:
-            print('Error closing serial!')
+            return False
 
     def is_done(self):
         """
@@ -93,19 +265,10 @@ class SSC32U:
 
         Method for checking if the serial connection is done executing previous commands.
         """
-        if SSC32U.is_closed(self):
-            try:
-                self.ser.open()
-                result = self.ser.read(self.ser.write('Q \r'.encode())).decode()
+        result = self.transfer('Q \r'.encode(), 1)
 
-                # Result '.' if previous move is completed
-                return result == '.'
-            except serial.SerialException:
-                raise
-            finally:
-                self.ser.close()
-        else:
-            print('Error closing serial!')
+        # Result '.' if previous move is completed
+        return result == b'.'
 
     def get_baud(self):
         """
@@ -113,16 +276,7 @@ class SSC32U:
 
         Get current baud rate.
         """
-        if SSC32U.is_closed(self):
-            try:
-                self.ser.open()
-                return self.ser.read(self.ser.write('R4 \r'.encode())).decode()
-            except serial.SerialException:
-                raise
-            finally:
-                self.ser.close()
-        else:
-            print('Error closing serial!')
+        return self.transfer('R4 \r'.encode(), SSC32U.terminator).decode()
 
     def get_val_from_reg(self, reg):
         """
@@ -136,33 +290,24 @@ class SSC32U:
         Register 32-63: InitialPulseOffset (32=>servo #0, 33=>servo #1....)
         Register 64-95: InitialPulseWidth  (64=>servo #0, 65=>servo #1....)
         """
-        if SSC32U.is_closed(self):
-            try:
-                self.ser.open()
-                return self.ser.read(self.ser.write(('R ' + str(reg) + ' \r').encode())).decode()
-            except serial.SerialException:
-                raise
-            finally:
-                self.ser.close()
-        else:
-            print('Error closing serial!')
+        return self.transfer(('R ' + str(reg) + ' \r').encode(), SSC32U.terminator).decode()
 
     def reset_reg_vals(self):
         """
-        :return: Call to serial.read() method.
+        :return: True for successful restoring.
 
-        Method for restoring the default values of all registers.
+        Method for restoring the default values of all registers. A carriage return confirming the restore is read
+        for self.probe_timeout at most, since the reply is not documented for every firmware. No reply counts as
+        success.
         """
-        if SSC32U.is_closed(self):
+        with self.lock:
+            timeout = self.ser.timeout
+            self.ser.timeout = self.probe_timeout
+
             try:
-                self.ser.open()
-                return self.ser.read(self.ser.write('RDFLT \r'.encode())).decode()
-            except serial.SerialException:
-                raise
+                return self.transfer('RDFLT \r'.encode(), 1) in (b'', SSC32U.terminator)
             finally:
-                self.ser.close()
-        else:
-            print('Error closing serial!')
+                self.ser.timeout = timeout
 
     def get_startup_string(self):
         """
@@ -170,16 +315,27 @@ class SSC32U:
 
         Get startup string.
         """
-        if SSC32U.is_closed(self):
-            try:
-                self.ser.open()
-                return self.ser.read(self.ser.write('SS \r'.encode())).decode()
-            except serial.SerialException:
-                raise
-            finally:
-                self.ser.close()
-        else:
-            print('Error closing serial!')
+        return self.transfer('SS \r'.encode(), SSC32U.terminator).decode()
+
+    def query_pulse_widths(self, pins):
+        """
+        :param pins: List of pins to be queried.
+        :return: Dictionary of pin and pulse width, 0 for channels without pulse.
+
+        Queries the current pulse widths of all given pins with one batched 'QP' command.
+        The board answers with one byte per pin holding the pulse width divided by ten.
+        """
+        if not pins:
+            return {}
+
+        data = ''.join('QP ' + str(pin) + ' ' for pin in pins) + '\r'
+        reply = self.transfer(data.encode(), len(pins))
+
+        if len(reply) != len(pins):
+            print('SSC32U: Incomplete pulse width reply.')
+            return {}
+
+        return {pin: value * 10 for (pin, value) in zip(pins, reply)}
 
     def stop_servo(self, pin):
         """
@@ -188,22 +344,67 @@ class SSC32U:
 
         Method that stops the servo on pin 'pin' at its current position.
         """
-        if SSC32U.is_closed(self):
+        return self.emergency_stop([int(pin)])
 
+    def emergency_stop(self, pins=None):
+        """
+        :param pins: Channels to be stopped, None for all channels of the board.
+        :return: True for successful stopping, False otherwise.
+
+        Stops the channels at their current position with one combined 'STOP' line.
+        The line bypasses the command lock: it only waits for a running write, not for pending replies or
+        movements. Movements issued before the stop are discarded and waits on the last movement return False.
+        The time from the call until the line has been written is stored in self.stop_latency (seconds).
+        The stopped channels are removed from the last sent cache of the Controller.
+        """
+        import serial
+        from johnnyv.core.Controller import Controller
+
+        start = time.perf_counter()
+        channels = range(32) if pins is None else pins
+        # ESC cancels a line the board is still receiving, i.e one held back by exec_line() for a synchronized start.
+        data = SSC32U.escape + ''.join('STOP ' + str(channel) + ' ' for channel in channels).encode() + \
+            SSC32U.terminator
+
+        self.stops += 1
+        motion = self.motion
+        if motion is not None:
+            motion.interrupt()
+
+        if not self.persistent:
+            # The port is only open inside transfer().
+            written = self.transfer(data)
+        else:
             try:
-                self.ser.open()
-                self.ser.write(('STOP ' + pin + ' \r').encode())
-                return True
+                written = self.write_now(data)
             except serial.SerialException:
-                raise
-            finally:
-                self.ser.close()
-        else:
-            print('Error closing serial!')
+                print("SSC32U: Serial connection lost. Reconnecting...")
+                self.reconnect()
+                written = self.write_now(data)
+
+        self.stop_latency = time.perf_counter() - start
+        Controller.forget_board(self, pins)
+        return written
+
+    def write_now(self, data):
+        """
+        :param data: Encoded command to be written to the board.
+        :return: True for successful writing.
+
+        Writes and flushes a command on the priority lane, see emergency_stop().
+        """
+        with self.write_lock:
+            if not self.ser.isOpen():
+                self.ser.open()
+            self.ser.write(data)
+            self.ser.flush()
+        return True
 
-    def exec_command(self, parameters):
+    def exec_command(self, parameters, wait=True, barrier=None):
         """
-        :param parameters: A list with the following format = ['pin:pulse:time', 'pin:pulse:time', .....].
+        :param parameters: A list of Commands. Strings with the format 'pin:pulse:time' are accepted as well.
+        :param wait: True if the method should return after the movement is done.
+        :param barrier: threading.Barrier shared with other boards to start the movement together, see exec_line().
         :return: True for successful execution, False otherwise.
 
         #Pin   => '#' followed by the pin number (no spaces).
@@ -211,30 +412,161 @@ class SSC32U:
         Ttime  => 'T' followed by the time in microseconds for executing the pulse (no spaces).
         \r => all commands end with a carriage return.
         *Pulse width from 500-2500 (1500 <=> 0°, 500 <=> 0°, 2500 <=> +180°).
-        Execute command on servo.
+        Execute command on servo. The movement is tracked by self.motion.
+        Movements which are still waiting for the board when an emergency stop is issued are discarded.
         """
         if parameters and parameters is not None:
-            if SSC32U.is_closed(self):
-                data = ''
-                for elem in parameters:
-                    pin = ' #' + elem.split(':')[0]
-                    pulse_width = ' P' + elem.split(':')[1]
-                    pulse_time = ' T' + elem.split(':')[2]
-                    data += pin + pulse_width + pulse_time
-
-                data += ' \r'
-                print(data)
+            commands = [elem if isinstance(elem, Command) else Command.parse(elem) for elem in parameters]
+            data = Command.encode(commands)
+            print(data.decode())
+            return self.exec_line(data, max(command.time for command in commands), wait, barrier)
+
+    def exec_line(self, data, duration, wait=True, barrier=None):
+        """
+        :param data: Encoded line of Commands, see Command.encode().
+        :param duration: Largest time of the Commands in milliseconds.
+        :param wait: True if the method should return after the movement is done.
+        :param barrier: threading.Barrier shared with other boards to start the movement together, None to write
+                        the line at once.
+        :return: True for successful execution, False otherwise.
+
+        Writes a line which was encoded in advance, i.e the frames of a Trajectory. The movement is tracked by
+        self.motion. Movements which are still waiting for the board when an emergency stop is issued are discarded.
+        """
+        stops = self.stops
+
+        with self.lock:
+            if self.stops != stops:
+                print('SSC32U: Movement discarded by emergency stop.')
+                return False
+            if barrier is None:
+                written = self.transfer(data)
+            else:
+                written = self.transfer_released(data, barrier)
+
+        if written:
+            # The board starts moving once the carriage return has been transferred.
+            sent = len(data) if barrier is None else len(SSC32U.terminator)
+            motion = MotionWait(self, duration + self.transfer_time(sent) * 1000, self.confirm_motion,
+                                self.execution_time)
+            self.motion = motion
+
+            if self.stops != stops:
+                # Stopped while the line was written, the stop line followed it.
+                motion.interrupt()
+
+            if wait:
+                return motion.wait()
+            return not motion.interrupted.is_set()
+        return False
+
+    def wait_for_motion(self):
+        """
+        :return: True if the last movement is done, False otherwise.
+
+        Blocks until the last executed movement is done.
+        """
+        if self.motion is None:
+            return True
+        else:
+            return self.motion.wait()
+
+    def transfer_released(self, data, barrier):
+        """
+        :param data: Encoded line of Commands, terminated by a carriage return.
+        :param barrier: threading.Barrier shared with the other boards of the movement.
+        :return: True for successful writing, False otherwise.
+
+        The board starts a movement when it receives the carriage return. The line is written without it and
+        waits until it has been transferred at the baud rate of the board. The carriage returns of all boards are
+        written once every board reached the barrier, so lines of different length and boards with different baud
+        rates start their movements together.
+        """
+        start = time.perf_counter()
+
+        if not self.persistent:
+            # The port is only open inside transfer(), the line is written as a whole.
+            written = True
+        else:
+            written = self.transfer(data[:-len(SSC32U.terminator)])
+            if written:
+                self.ser.flush()
+                time.sleep(max(0.0, start + self.transfer_time(len(data) - 1) - time.perf_counter()))
+
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            print('SSC32U: Movement was not released, another board failed.')
+            if written and self.persistent:
+                # Cancel the held line, so it is not prepended to the next command.
+                self.transfer(SSC32U.escape)
+            return False
+
+        if not written:
+            return False
+        return self.transfer(data if not self.persistent else SSC32U.terminator)
+
+    def transfer_time(self, size):
+        """
+        :param size: Number of bytes.
+        :return: Seconds needed to transfer 'size' bytes at the current baud rate (ten bits per byte).
+        """
+        return size * 10 / self.baud
+
+    def transfer(self, data, reply=None):
+        """
+        :param data: Encoded command to be written to the board.
+        :param reply: Format of the reply: None for no reply, the number of bytes or the terminating bytes.
+        :return: The received bytes without terminator if a reply is expected, True otherwise.
+
+        Writes a command over the serial connection.
+        Persistent sessions keep the port open and reconnect once on a SerialException,
+        otherwise the port is opened and closed around the single command.
+        """
+        import serial
+
+        with self.lock:
+            if self.persistent:
                 try:
-                    self.ser.open()
-                    self.ser.write(data.encode())
-                    time.sleep(self.execution_time)
-                    return True
+                    return self.write_read(data, reply)
                 except serial.SerialException:
-                    raise
+                    print("SSC32U: Serial connection lost. Reconnecting...")
+                    self.reconnect()
+                    return self.write_read(data, reply)
+            elif SSC32U.is_closed(self):
+                try:
+                    self.ser.open()
+                    return self.write_read(data, reply)
                 finally:
                     self.ser.close()
-            else:
-                print('Error closing serial!')
+
+    def write_read(self, data, reply=None):
+        """
+        :param data: Encoded command to be written to the board.
+        :param reply: Format of the reply: None for no reply, the number of bytes or the terminating bytes.
+        :return: The received bytes without terminator if a reply is expected, True otherwise.
+
+        Writes a command to the open serial connection and reads exactly the reply of the board,
+        so the read returns as soon as the reply is complete instead of waiting for the timeout.
+        """
+        if not self.ser.isOpen():
+            self.ser.open()
+
+        if reply is None:
+            with self.write_lock:
+                self.ser.write(data)
+            return True
+
+        # Discard stale bytes, i.e late replies of previous queries.
+        self.ser.reset_input_buffer()
+        with self.write_lock:
+            self.ser.write(data)
+
+        if isinstance(reply, bytes):
+            received = self.ser.read_until(reply)
+            return received[:-len(reply)] if received.endswith(reply) else received
+        else:
+            return self.ser.read(reply)
 
     def is_closed(self):
         """
@@ -242,6 +574,8 @@ class SSC32U:
 
         Check serial connection status
         """
+        import serial
+
         if self.ser.isOpen():
             try:
                 self.ser.close()
@@ -0,0 +1,212 @@
+from johnnyv.core.Command import Command
+
+
+class BankField:
+    """
+    Attribute of a ServoMotor which is stored in an array of its ServoBank.
+    Whole numbers are returned as int, so settings keep the type of Constants.json, i.e 63 instead of 63.0.
+    """
+
+    def __init__(self, name):
+        """
+        :param name: Name of the array in the ServoBank, i.e 'max_pulse'.
+        """
+        self.name = name
+
+    def __get__(self, servo, owner):
+        if servo is None:
+            return self
+        value = getattr(servo.bank, self.name)[servo.pin]
+        if isinstance(value, float):
+            return int(value) if value.is_integer() else float(value)
+        return value
+
+    def __set__(self, servo, value):
+        getattr(servo.bank, self.name)[servo.pin] = value
+
+
+class ServoBank:
+    """
+    Struct-of-arrays store of servo settings and positions.
+    Every field is a numpy array indexed by pin, so limit checks, snapshots and restores of many servos are single
+    array operations and the arrays of a robot are as long as its highest pin. ServoMotors are views on the row of
+    their pin, changing the pin of a servo moves its row and swaps it with the row of the servo on the new pin.
+    The arrays grow when a servo is added beyond them. The shared bank holds the servos of the robot, servos created
+    without bank get a private bank.
+    """
+
+    fields = ('max_pulse', 'min_pulse', 'pulse_span', 'abs_max_pulse', 'abs_min_pulse', 'pulse_width', 'init_pulse',
+              'current_position')
+    # Fields of a state tuple after pin and dependencies, see state().
+    states = ('max_pulse', 'min_pulse', 'abs_max_pulse', 'abs_min_pulse', 'pulse_width', 'init_pulse',
+              'current_position')
+    shared = None
+
+    def __init__(self, size=0):
+        """
+        :param size: Number of pins allocated in advance.
+        """
+        import numpy
+
+        self.size = 0
+        self.dependencies = []
+        self.servos = {}
+
+        for name in ServoBank.fields:
+            setattr(self, name, numpy.zeros(0))
+
+        self.reserve(size)
+
+    @staticmethod
+    def get_shared():
+        """
+        :return: The bank of the servos of the robot.
+
+        Creates the bank on first use.
+        """
+        if ServoBank.shared is None:
+            ServoBank.shared = ServoBank()
+        return ServoBank.shared
+
+    def reserve(self, size):
+        """
+        :param size: Number of pins the arrays must hold.
+        :return: True for successful reserving.
+
+        The arrays at least double, up to one row per pin of Command.max_pin.
+        """
+        import numpy
+
+        if size <= self.size:
+            return True
+
+        size = min(max(size, 2 * self.size), Command.max_pin + 1)
+
+        for name in ServoBank.fields:
+            field = numpy.zeros(size)
+            field[:self.size] = getattr(self, name)
+            setattr(self, name, field)
+
+        self.dependencies.extend([()] * (size - self.size))
+        self.size = size
+        return True
+
+    def add(self, servo, dependencies, max_pulse, min_pulse, abs_max_pulse, abs_min_pulse, pulse_width, init_pulse):
+        """
+        :param servo: ServoMotor viewing the row of its pin.
+        :param dependencies: Inter-Servo dependencies.
+        :param max_pulse: Maximum allowed servo pulse.
+        :param min_pulse: Minimum allowed servo pulse.
+        :param abs_max_pulse: Absolute maximum pulse allowed.
+        :param abs_min_pulse: Absolute minimum pulse allowed.
+        :param pulse_width: Pulse width in milliseconds.
+        :param init_pulse: Initial position of servo.
+        :return: True for successful adding.
+
+        Stores the settings of a servo in the row of its pin. The servo starts at its initial position. A servo
+        added on the pin of another servo replaces it, both view the same row.
+        """
+        pin = servo.pin
+        self.reserve(pin + 1)
+        self.servos[pin] = servo
+        self.dependencies[pin] = dependencies
+        self.max_pulse[pin] = max_pulse
+        self.min_pulse[pin] = min_pulse
+        self.pulse_span[pin] = abs(max_pulse - min_pulse)
+        self.abs_max_pulse[pin] = abs_max_pulse
+        self.abs_min_pulse[pin] = abs_min_pulse
+        self.pulse_width[pin] = pulse_width
+        self.init_pulse[pin] = init_pulse
+        self.current_position[pin] = init_pulse
+        return True
+
+    def swap(self, first, second):
+        """
+        :param first: Pin of a servo.
+        :param second: New pin of the servo.
+        :return: ServoMotor which viewed the row of the second pin, None if there was none.
+
+        Swaps the rows of both pins, i.e when the pin of a servo changes.
+        """
+        self.reserve(max(first, second) + 1)
+        other = self.servos.pop(second, None)
+        servo = self.servos.pop(first, None)
+
+        for name in ServoBank.fields:
+            field = getattr(self, name)
+            field[[first, second]] = field[[second, first]]
+
+        (self.dependencies[first], self.dependencies[second]) = (self.dependencies[second], self.dependencies[first])
+
+        if servo is not None:
+            self.servos[second] = servo
+        if other is not None:
+            self.servos[first] = other
+        return other
+
+    def pins(self):
+        """
+        :return: Sorted list of the pins with servo.
+        """
+        return sorted(self.servos)
+
+    def state(self, pins):
+        """
+        :param pins: Iterable of pins with servo.
+        :return: List of tuples of pin, dependencies, max_pulse, min_pulse, abs_max_pulse, abs_min_pulse, pulse_width,
+                 init_pulse and current_position, one per pin.
+        """
+        pins = list(pins)
+        columns = [getattr(self, name)[pins].tolist() for name in ServoBank.states]
+        return list(zip(pins, (tuple(self.dependencies[pin]) for pin in pins), *columns))
+
+    def load(self, states, position=False):
+        """
+        :param states: Iterable of tuples as returned by state(), of pins with servo.
+        :param position: True if the positions should be loaded as well.
+        :return: True for successful loading.
+
+        Overwrites the settings of the servos with one array operation per field.
+        """
+        states = list(states)
+
+        if not states:
+            return True
+
+        columns = list(zip(*states))
+        pins = list(columns[0])
+
+        for (pin, dependencies) in zip(pins, columns[1]):
+            self.dependencies[pin] = list(dependencies)
+
+        for (name, column) in zip(ServoBank.states, columns[2:]):
+            if name != 'current_position' or position:
+                getattr(self, name)[pins] = column
+
+        self.pulse_span[pins] = abs(self.max_pulse[pins] - self.min_pulse[pins])
+        return True
+
+    def within_limits(self, pins, degrees):
+        """
+        :param pins: Sequence of pins with servo.
+        :param degrees: Sequence of degrees, one per pin.
+        :return: Index of the first degree which is not between 'min_pulse' and 'max_pulse' of its servo, None if all
+                 degrees are allowed.
+
+        Compares all degrees at once, pins and degrees given as numpy arrays are not copied.
+        """
+        import numpy
+
+        pins = numpy.asarray(pins, dtype=numpy.intp)
+        degrees = numpy.asarray(degrees, dtype=float)
+        allowed = (self.min_pulse[pins] <= degrees) & (degrees <= self.max_pulse[pins])
+
+        if allowed.all():
+            return None
+        return int(numpy.argmin(allowed))
+
+    def nbytes(self):
+        """
+        :return: Number of bytes of the arrays and of the list of dependencies.
+        """
+        return sum(getattr(self, name).nbytes for name in ServoBank.fields) + 8 * self.size
@@ -1,12 +1,28 @@
 from johnnyv.core.Observer import Observer
+from johnnyv.core.ServoBank import BankField, ServoBank
 
 
 class ServoMotor(Observer):
     """
     Container class for servos used with JohnnyV.
     Servos: HS475, HS485HB, HS645MG, HS422
+    The settings and the position are stored in a ServoBank, the servo is a view on the row of its pin.
     """
-    def __init__(self, dependencies, pin, max_pulse, min_pulse, abs_max_pulse, abs_min_pulse, pulse_width, init_pulse):
+
+    __slots__ = ('bank', '_pin')
+
+    dependencies = BankField('dependencies')
+    max_pulse = BankField('max_pulse')
+    min_pulse = BankField('min_pulse')
+    pulse_span = BankField('pulse_span')
+    abs_max_pulse = BankField('abs_max_pulse')
+    abs_min_pulse = BankField('abs_min_pulse')
+    pulse_width = BankField('pulse_width')
+    init_pulse = BankField('init_pulse')
+    current_position = BankField('current_position')
+
+    def __init__(self, dependencies, pin, max_pulse, min_pulse, abs_max_pulse, abs_min_pulse, pulse_width, init_pulse,
+                 bank=None):
         """
         :param dependencies: Inter-Servo dependencies.
         :param pin: Corresponding servo pin on the SSC32U board, i.e 13.
@@ -16,18 +32,25 @@ class ServoMotor(Observer):
         :param abs_min_pulse: Absolute minimum pulse allowed, i.e 500  (Hardware-depended).
         :param pulse_width: Pulse width in milliseconds, i.e 1000.
         :param init_pulse: Initial position of servo, i.e 1500.
+        :param bank: ServoBank storing the servo, i.e ServoBank.get_shared(). A private bank if None.
 
         """
-        self.dependencies = dependencies
-        self.pin = pin
-        self.max_pulse = max_pulse
-        self.min_pulse = min_pulse
-        self.pulse_span = abs(max_pulse-min_pulse)
-        self.abs_max_pulse = abs_max_pulse
-        self.abs_min_pulse = abs_min_pulse
-        self.pulse_width = pulse_width
-        self.init_pulse = init_pulse
-        self.current_position = init_pulse
+        self.bank = bank if bank is not None else ServoBank()
+        self._pin = pin
+        self.bank.add(self, dependencies, max_pulse, min_pulse, abs_max_pulse, abs_min_pulse, pulse_width, init_pulse)
+
+    @property
+    def pin(self):
+        return self._pin
+
+    @pin.setter
+    def pin(self, pin):
+        # The servo on the new pin takes the old pin, so pins of several servos can be swapped one by one.
+        other = self.bank.swap(self._pin, pin)
+
+        if other is not None and other is not self:
+            other._pin = self._pin
+        self._pin = pin
 
     def update(self, pin, degree):
         """
@@ -40,12 +63,3 @@ class ServoMotor(Observer):
         if pin in self.dependencies:
             return False
         # TODO: implement method and add return value. Add the corresponding return value to the docstring :return:.
-
-
-
-
-
-
-
-
-
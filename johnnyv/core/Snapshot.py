@@ -0,0 +1,89 @@
+class Snapshot:
+    """
+    Immutable state of servos and motors, i.e of a component or the whole robot.
+    Servos are stored as tuples of pin, dependencies, max_pulse, min_pulse, abs_max_pulse, abs_min_pulse,
+    pulse_width, init_pulse and current_position, motors as tuples of pin, init_percentage, init_direction and
+    pulse_width. Taking and restoring a snapshot is linear in the number of channels and does not read Constants.json.
+    """
+
+    __slots__ = ('servos', 'motors')
+
+    def __init__(self, servos=(), motors=()):
+        """
+        :param servos: Iterable of servo state tuples.
+        :param motors: Iterable of motor state tuples.
+        """
+        object.__setattr__(self, 'servos', tuple(servos))
+        object.__setattr__(self, 'motors', tuple(motors))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Snapshot: Snapshots are immutable.')
+
+    def __eq__(self, other):
+        return isinstance(other, Snapshot) and (self.servos, self.motors) == (other.servos, other.motors)
+
+    def __hash__(self):
+        return hash((self.servos, self.motors))
+
+    def __len__(self):
+        return len(self.servos) + len(self.motors)
+
+    def __repr__(self):
+        return 'Snapshot({0} servos, {1} motors)'.format(len(self.servos), len(self.motors))
+
+    @staticmethod
+    def of(servos, motors):
+        """
+        :param servos: List of ServoMotors.
+        :param motors: List of GearedMotors.
+        :return: Snapshot of the current settings and positions.
+        """
+        servos = list(servos)
+        banks = {id(servo.bank): servo.bank for servo in servos}
+
+        if len(banks) == 1:
+            states = servos[0].bank.state([servo.pin for servo in servos])
+        else:
+            states = [state for servo in servos for state in servo.bank.state([servo.pin])]
+
+        return Snapshot(states,
+                        ((motor.pin, motor.init_percentage, motor.init_direction, motor.pulse_width)
+                         for motor in motors))
+
+    @staticmethod
+    def from_records(servo_records, motor_records):
+        """
+        :param servo_records: Iterable of ServoRecords.
+        :param motor_records: Iterable of MotorRecords.
+        :return: Snapshot of the configured state, with all servos at their initial position.
+        """
+        return Snapshot(((record.pin, record.dependencies, record.max_pulse, record.min_pulse, record.abs_max_pulse,
+                          record.abs_min_pulse, record.pulse_width, record.init_pulse, record.init_pulse)
+                         for record in servo_records),
+                        ((record.pin, record.init_percentage, record.init_direction, record.pulse_width)
+                         for record in motor_records))
+
+    @staticmethod
+    def merge(snapshots):
+        """
+        :param snapshots: Iterable of Snapshots, i.e of all components.
+        :return: Snapshot of all servos and motors of the snapshots.
+        """
+        snapshots = list(snapshots)
+        return Snapshot((state for snapshot in snapshots for state in snapshot.servos),
+                        (state for snapshot in snapshots for state in snapshot.motors))
+
+    def select(self, pins):
+        """
+        :param pins: Iterable of pins.
+        :return: Snapshot of the servos and motors of the pins.
+        """
+        pins = set(pins)
+        return Snapshot((state for state in self.servos if state[0] in pins),
+                        (state for state in self.motors if state[0] in pins))
+
+    def positions(self):
+        """
+        :return: List of pin and position tuples of the servos.
+        """
+        return [(state[0], state[-1]) for state in self.servos]
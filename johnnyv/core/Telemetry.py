@@ -0,0 +1,80 @@
+import threading
+import time
+
+
+class Telemetry:
+    """
+    Background poll running a callable at a fixed rate, i.e Controller.read_positions.
+    """
+
+    def __init__(self, poll, rate):
+        """
+        :param poll: Callable executed on every tick.
+        :param rate: Polls per second, i.e 10.
+        """
+        self.poll = poll
+        self.rate = rate
+        self.thread = None
+        self.stopping = threading.Event()
+        self.ticks = 0
+        self.overruns = 0
+
+    def start(self):
+        """
+        :return: True if the poll is running.
+
+        Starts polling in a daemon thread.
+        """
+        if self.rate <= 0:
+            print('Telemetry: Rate must be greater than 0.')
+            return False
+
+        if self.thread is None:
+            self.stopping.clear()
+            self.thread = threading.Thread(target=self.run, name='Telemetry')
+            self.thread.daemon = True
+            self.thread.start()
+
+        return True
+
+    def stop(self):
+        """
+        :return: True for successful stopping.
+
+        Stops polling and waits for the running tick to finish.
+        """
+        if self.thread is not None:
+            self.stopping.set()
+            self.thread.join()
+            self.thread = None
+
+        return True
+
+    def is_running(self):
+        """
+        :return: True if the poll is running.
+        """
+        return self.thread is not None
+
+    def run(self):
+        """
+        Executes the poll on fixed deadlines. Ticks which overrun their period are skipped instead of queued.
+        """
+        period = 1 / self.rate
+        deadline = time.perf_counter()
+
+        while not self.stopping.is_set():
+            try:
+                self.poll()
+            except Exception as error:  # pylint: disable=broad-except
+                print('Telemetry: Poll failed: ' + str(error))
+
+            self.ticks += 1
+            deadline += period
+            now = time.perf_counter()
+
+            if now > deadline:
+                self.overruns += 1
+                deadline = now
+            else:
+                self.stopping.wait(deadline - now)
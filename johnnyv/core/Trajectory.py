@@ -0,0 +1,295 @@
+import threading
+import time
+
+import numpy
+
+from johnnyv.core.Command import Command
+from johnnyv.core.Controller import Controller
+from johnnyv.core.Pose import Pose
+from johnnyv.core.Telemetry import Telemetry
+
+
+class Trajectory:
+    """
+    Smooth movement through keyframe poses, streamed to the boards at a fixed rate:
+
+        trajectory = robot.trajectory([(0.5, {19: 135, 24: 129}), (1.0, {19: 54, 24: 45})])
+        trajectory.play()
+
+    The setpoints of all channels and ticks are interpolated with NumPy and encoded to commands in advance. Before
+    streaming, the channels whose pulse changed since the previous tick are split and encoded per board once, so a
+    tick only writes the precomputed lines of its frame. Ticks which are late are skipped, so the movement keeps its
+    timing. The rate is lowered if the lines would not fit the baud rate of a board.
+    """
+
+    interpolations = ('min_jerk', 'cubic')
+
+    def __init__(self, keyframes, servos, rate=50, interpolation='min_jerk'):
+        """
+        :param keyframes: List of time in seconds and targets tuples. Targets are a Pose or a dictionary of pin and
+                          degree. Pins without target in a keyframe keep their previous degree.
+        :param servos: Dictionary of pin and ServoMotor of all servos which may be moved.
+        :param rate: Setpoints per second, i.e 50.
+        :param interpolation: 'min_jerk' to stop at every keyframe, 'cubic' to pass smoothly through the keyframes.
+        """
+        if rate <= 0:
+            raise ValueError('Trajectory: Rate must be greater than 0.')
+        if interpolation not in Trajectory.interpolations:
+            raise ValueError('Trajectory: Unexpected interpolation: ' + str(interpolation) + '.')
+
+        poses = [(float(seconds), targets if isinstance(targets, Pose) else Pose(targets))
+                 for (seconds, targets) in keyframes]
+        times = [seconds for (seconds, pose) in poses]
+
+        if not poses or times[0] < 0 or any(later <= earlier for (earlier, later) in zip(times, times[1:])):
+            raise ValueError('Trajectory: Keyframe times must be increasing and not negative.')
+
+        self.pins = sorted(set(pin for (seconds, pose) in poses for pin in pose.pins().tolist()))
+
+        for pin in self.pins:
+            if pin not in servos:
+                raise ValueError('Trajectory: Desired servo with pin ' + str(pin) + ' is not available.')
+
+        self.servos = [servos[pin] for pin in self.pins]
+        banks = {id(servo.bank): servo.bank for servo in self.servos}
+        self.bank = self.servos[0].bank if len(banks) == 1 else None
+        self.rate = rate
+        self.interpolation = interpolation
+        self.times = numpy.array([0.0] + times if times[0] > 0 else times)
+        self.keyframes = self.fill([pose.degrees[self.pins] for (seconds, pose) in poses], times[0] > 0)
+        self.setpoints = self.interpolate()
+        self.frames = self.encode()
+        self.changes = self.changed()
+        self.lines = None
+        self.boards = None
+        self.stream = None
+        self.finished = threading.Event()
+        self.start = None
+        self.stops = None
+        self.sent = -1
+        self.skipped = 0
+        self.error = None
+
+    def __len__(self):
+        return len(self.frames)
+
+    def fill(self, degrees, from_current):
+        """
+        :param degrees: List of arrays of the degrees of all pins per keyframe, NaN without target.
+        :param from_current: True if the trajectory starts at the current positions of the servos.
+        :return: Array of keyframes and pins, clamped to the limits of the servos.
+
+        Pins without target keep the degree of the previous keyframe, or their current position before the first one.
+        """
+        current = numpy.array([servo.current_position for servo in self.servos], dtype=float)
+        rows = [current] if from_current else []
+        previous = current
+
+        for row in degrees:
+            previous = numpy.where(numpy.isnan(row), previous, row)
+            rows.append(previous)
+
+        return numpy.clip(numpy.array(rows), [servo.min_pulse for servo in self.servos],
+                          [servo.max_pulse for servo in self.servos])
+
+    def interpolate(self):
+        """
+        :return: Array of ticks and pins with the degree of every pin at every tick.
+        """
+        count = int(numpy.ceil(self.times[-1] * self.rate)) + 1
+        ticks = numpy.minimum(numpy.arange(count) / self.rate, self.times[-1])
+
+        if len(self.times) == 1:
+            return numpy.repeat(self.keyframes, count, axis=0)
+
+        segment = numpy.clip(numpy.searchsorted(self.times, ticks, side='right') - 1, 0, len(self.times) - 2)
+        duration = self.times[segment + 1] - self.times[segment]
+        s = ((ticks - self.times[segment]) / duration)[:, numpy.newaxis]
+        start = self.keyframes[segment]
+        end = self.keyframes[segment + 1]
+
+        if self.interpolation == 'min_jerk':
+            return start + (end - start) * (10 * s ** 3 - 15 * s ** 4 + 6 * s ** 5)
+
+        # Cubic Hermite spline with Catmull-Rom tangents, resting at the first and the last keyframe.
+        tangents = numpy.zeros_like(self.keyframes)
+        tangents[1:-1] = (self.keyframes[2:] - self.keyframes[:-2]) / \
+            (self.times[2:] - self.times[:-2])[:, numpy.newaxis]
+        width = duration[:, numpy.newaxis]
+        degrees = ((2 * s ** 3 - 3 * s ** 2 + 1) * start + (s ** 3 - 2 * s ** 2 + s) * width * tangents[segment] +
+                   (-2 * s ** 3 + 3 * s ** 2) * end + (s ** 3 - s ** 2) * width * tangents[segment + 1])
+        return numpy.clip(degrees, self.keyframes.min(axis=0), self.keyframes.max(axis=0))
+
+    def encode(self):
+        """
+        :return: List of the Commands of every tick.
+
+        Every setpoint is reached within one tick. Degrees are converted like Controller.convert_degree(), so a
+        degree has the same pulse on every path to the board.
+        """
+        period = int(round(1000 / self.rate))
+        pulses = numpy.clip((500 + (100 / 9) * numpy.trunc(self.setpoints)).astype(int), 500, 2500).tolist()
+        times = [period] * len(self.pins)
+        return [Command.from_arrays(self.pins, frame, times) for frame in pulses]
+
+    def changed(self):
+        """
+        :return: List of the Commands of every tick whose pulse differs from the previous tick, all Commands of the
+                 first tick.
+        """
+        return [self.frames[0]] + [[command for (command, previous) in zip(frame, before)
+                                    if command.pulse != previous.pulse]
+                                   for (before, frame) in zip(self.frames, self.frames[1:])]
+
+    def replan(self, rate):
+        """
+        :param rate: New number of setpoints per second.
+        :return: True for successful planning.
+
+        Interpolates and encodes the keyframes again at another rate.
+        """
+        self.rate = rate
+        self.setpoints = self.interpolate()
+        self.frames = self.encode()
+        self.changes = self.changed()
+        self.lines = None
+        return True
+
+    def fitting_rate(self):
+        """
+        :return: Highest rate up to the current one at which the largest line of every board is transferred within
+                 one tick.
+        """
+        sizes = {}
+
+        for line in self.lines:
+            for (board, data, duration) in line:
+                sizes[board] = max(sizes.get(board, 0), len(data))
+
+        return min([self.rate] + [max(1, int(1 / board.transfer_time(size))) for (board, size) in sizes.items()])
+
+    def prepare(self):
+        """
+        :return: True if the frames are encoded for the boards.
+
+        Splits and encodes the changed channels of all frames per board, see BoardRegistry.encode(). Done once per
+        board registry by play(), calling it in advance lets play() start streaming without delay.
+        If the lines of a board take longer than a tick at its baud rate, the frames would pile up in the serial
+        buffer and the playback would lag. The trajectory is planned again at the highest rate which fits.
+        """
+        boards = Controller.get_boards()
+
+        while self.lines is None or self.boards is not boards:
+            try:
+                self.lines = [boards.encode(commands) for commands in self.changes]
+            except ValueError as error:
+                print(error)
+                self.lines = None
+                return False
+            self.boards = boards
+
+            rate = self.fitting_rate()
+
+            if rate < self.rate:
+                print('Trajectory: Rate lowered from ' + str(self.rate) + ' to ' + str(rate) +
+                      ' setpoints per second to fit the baud rate of the boards.')
+                self.replan(rate)
+
+        return True
+
+    def play(self, wait=True):
+        """
+        :param wait: True if the method should return after the trajectory is done.
+        :return: True for successful streaming, False if it was interrupted by an emergency stop of
+                 one of its pins.
+
+        Streams the frames in the background at the rate of the trajectory. An error raised while writing a frame
+        ends the stream and is raised again here, without waiting it is kept in self.error.
+        """
+        self.stop()
+
+        if not self.prepare():
+            return False
+
+        self.finished.clear()
+        self.start = time.perf_counter()
+        self.stops = Controller.stops
+        self.sent = -1
+        self.skipped = 0
+        self.error = None
+        self.stream = Telemetry(self.tick, self.rate)
+
+        if not self.stream.start():
+            return False
+
+        if wait:
+            self.finished.wait()
+            self.stop()
+
+            if self.error is not None:
+                raise self.error
+            return self.sent == len(self.frames) - 1
+        return True
+
+    def tick(self):
+        """
+        :return: True if a frame was sent.
+
+        Sends the frame of the elapsed time. Skipped frames are counted, the last frame is always sent.
+        A failed write ends the stream, the frame counts as sent only after it was written.
+        """
+        if Controller.stopped_since(self.stops, self.pins):
+            return self.finish()
+
+        index = min(int((time.perf_counter() - self.start) * self.rate), len(self.frames) - 1)
+
+        if index <= self.sent:
+            return False
+
+        # After skipped ticks the channels may differ from the previous frame, the whole frame is sent.
+        lines = self.lines[index] if index == self.sent + 1 else self.boards.encode(self.frames[index])
+
+        try:
+            sent = Controller.send_lines(lines, self.frames[index])
+        except Exception as error:  # pylint: disable=broad-except
+            self.error = error
+            return self.finish()
+
+        if not sent:
+            return self.finish()
+
+        self.skipped += index - self.sent - 1
+        self.sent = index
+
+        if self.bank is not None:
+            self.bank.current_position[self.pins] = self.setpoints[index]
+        else:
+            for (servo, degree) in zip(self.servos, self.setpoints[index].tolist()):
+                servo.current_position = degree
+
+        if index == len(self.frames) - 1:
+            self.finish()
+        return True
+
+    def finish(self):
+        """
+        :return: False.
+
+        Ends the stream from within its tick.
+        """
+        if self.stream is not None:
+            self.stream.stopping.set()
+        self.finished.set()
+        return False
+
+    def stop(self):
+        """
+        :return: True for successful stopping.
+
+        Stops streaming, the servos keep the last sent setpoint.
+        """
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream = None
+        self.finished.set()
+        return True
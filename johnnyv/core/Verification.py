@@ -1,57 +1,106 @@
 import json
-from jsonschema import Draft4Validator, FormatChecker
-from jsonschema.exceptions import best_match
+from collections import OrderedDict
+from johnnyv.core.Configuration import Configuration
 
 
 class Verification:
-    constants = json.load(open('/home/pi/johnnyv/ext/Constants.json'))
-    conSchema = json.load(open('/home/pi/johnnyv/ext/Schema.json'))
+    """
+    Validation of Constants.json against Schema.json and the rules the schema cannot express:
+    pins are unique on the robot and color-schemes are unique in a component.
+    The validator is compiled once and results are memoized by the content hash of the configuration.
+    """
+
+    validator = None
+    results = OrderedDict()
+    max_results = 16
+
+    @staticmethod
+    def validate(constants=None):
+        """
+        :param constants: Dictionary of a configuration, the loaded Constants.json if None.
+        :return: True if the configuration is valid.
+        """
+        if constants is None:
+            constants = Configuration.constants()
+
+        digest = Verification.content_hash(constants)
+
+        if digest not in Verification.results:
+            Verification.results[digest] = Verification.check(constants)
+
+            while len(Verification.results) > Verification.max_results:
+                Verification.results.popitem(last=False)
+
+        (valid, message) = Verification.results[digest]
+        print(message)
+        return valid
+
+    @staticmethod
+    def content_hash(constants):
+        """
+        :param constants: Dictionary of a configuration.
+        :return: Hash of the content, independent of the order of keys.
+        """
+        import hashlib
+
+        return hashlib.sha1(json.dumps(constants, sort_keys=True).encode()).hexdigest()
 
     @staticmethod
-    def validate():
-        result = best_match(Draft4Validator(Verification.conSchema,
-                                            format_checker=FormatChecker()).iter_errors(Verification.constants))
+    def get_validator():
+        """
+        :return: Validator of Schema.json.
+
+        Compiles the validator on first use.
+        """
+        if Verification.validator is None:
+            from jsonschema import Draft4Validator, FormatChecker
+            Verification.validator = Draft4Validator(Configuration.schema(), format_checker=FormatChecker())
+        return Verification.validator
+
+    @staticmethod
+    def clear():
+        """
+        :return: True for successful clearing.
+
+        Discards the compiled validator and all memoized results, i.e after Schema.json changed.
+        """
+        Verification.validator = None
+        Verification.results.clear()
+        return True
+
+    @staticmethod
+    def check(constants):
+        """
+        :param constants: Dictionary of a configuration.
+        :return: Tuple of the validity and the message of the validation.
+        """
+        from jsonschema.exceptions import best_match
+
+        result = best_match(Verification.get_validator().iter_errors(constants))
 
         if result:
-            index_range = len(list(result.schema_path))
-
-            if index_range > 4:
-                print("FAILURE: " + list(result.schema_path)[4], result.message, sep=", ")
-                return False
-
-            elif index_range == 4:
-                print("FAILURE: " + list(result.schema_path)[3], result.message, sep=", ")
-                return False
-
-            elif index_range == 3:
-                print("FAILURE: " + list(result.schema_path)[2], result.message, sep=", ")
-                return False
-
-            elif index_range == 2:
-                print("FAILURE: " + list(result.schema_path)[1], result.message, sep=", ")
-                return False
-
-            else:
-                print("FAILURE: " + list(result.schema_path)[0], result.message, sep=", ")
-                return False
-        else:
-            servo_lists = [value["servo_list"] for (key, value) in Verification.constants['components'].items()]
-            motor_lists = [value["motor_list"] for (key, value) in Verification.constants['components'].items()]
-            servo_pins = [value["pin"] for group in servo_lists for (key, value) in group.items()]
-            motor_pins = [value["pin"] for group in motor_lists for (key, value) in group.items()]
-
-            if len(servo_pins + motor_pins) == len(set(servo_pins + motor_pins)):
-                for (key, value) in Verification.constants['components'].items():
-                    servo_schemes = [value["color_scheme"] for (key, value) in value["servo_list"].items()]
-                    motor_schemes = [value["color_scheme"] for (key, value) in value["motor_list"].items()]
-
-                    if not len(servo_schemes + motor_schemes) == len(set(servo_schemes + motor_schemes)):
-                        print("FAILURE: Multiple use of a color-scheme in one component.")
-                        return False
-
-                print("Validation of 'constants.json' was successful.")
-                return True
-
-            else:
-                print("FAILURE: Pins are double used.")
-                return False
+            schema_path = list(result.schema_path)
+            # The fifth element names the failing property of a servo or motor, i.e 'pin'.
+            name = schema_path[min(len(schema_path), 5) - 1] if schema_path else ''
+            return False, "FAILURE: " + str(name) + ", " + result.message
+
+        pins = set()
+        scheme_failure = False
+
+        for component in constants['components'].values():
+            schemes = set()
+
+            for entries in (component['servo_list'], component['motor_list']):
+                for entry in entries.values():
+                    if entry['pin'] in pins:
+                        return False, "FAILURE: Pins are double used."
+                    if entry['color_scheme'] in schemes:
+                        scheme_failure = True
+
+                    pins.add(entry['pin'])
+                    schemes.add(entry['color_scheme'])
+
+        if scheme_failure:
+            return False, "FAILURE: Multiple use of a color-scheme in one component."
+
+        return True, "Validation of 'constants.json' was successful."
@@ -0,0 +1,85 @@
+from johnnyv.core.BoardRegistry import BoardRegistry
+from johnnyv.core.Controller import Controller
+from johnnyv.core.SSC32U import SSC32U
+from johnnyv.testing.SSC32UEmulator import SSC32UEmulator
+
+
+class EmulatedBoards:
+    """
+    BoardRegistry of emulated SSC32U boards installed as the boards of the Controller.
+    The board of every emulator is connected at its baud rate and added 32 channels after the previous one. Stopping
+    closes the boards, stops the emulators and restores the previous boards of the Controller, the last sent commands
+    and the negotiated baud rates of the reused pseudo-terminals are forgotten:
+
+        with EmulatedBoards([115200]) as boards:
+            boards.emulators[0].position(16)
+
+    Without baud rates the registry stays empty, i.e for boards added by the test itself.
+    """
+
+    def __init__(self, bauds=(), confirm_motion=False):
+        """
+        :param bauds: Baud rates of the emulated boards, i.e [115200, 9600].
+        :param confirm_motion: True if the boards should confirm movements, so waits return after the emulated
+                               boards have executed the lines. The setting of the port is kept if False.
+        """
+        self.bauds = list(bauds)
+        self.confirm_motion = confirm_motion
+        self.registry = None
+        self.emulators = []
+        self.saved = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    def start(self):
+        """
+        :return: BoardRegistry of the emulated boards.
+
+        Starts the emulators and installs their boards as Controller.boards.
+        """
+        self.saved = Controller.boards
+        self.registry = BoardRegistry()
+        Controller.boards = self.registry
+
+        for baud in self.bauds:
+            self.add(baud)
+
+        return self.registry
+
+    def add(self, baud):
+        """
+        :param baud: Baud rate of the emulated board.
+        :return: SSC32U connected to the new emulator.
+
+        Starts a further emulator and adds its board after the others.
+        """
+        emulator = SSC32UEmulator(baud)
+        board = SSC32U(emulator.start())
+        board.set_baud(baud)
+        board.reconnect()
+        if self.confirm_motion:
+            board.set_confirm_motion(True)
+        self.registry.add('board' + str(len(self.emulators)), board, len(self.emulators) * BoardRegistry.channels)
+        self.emulators.append(emulator)
+        return board
+
+    def stop(self):
+        """
+        :return: True for successful stopping.
+        """
+        self.registry.close()
+
+        for emulator in self.emulators:
+            emulator.stop()
+            SSC32U.negotiated.pop(emulator.port, None)
+
+        Controller.boards = self.saved
+        Controller.forget_sent()
+        self.emulators = []
+        return True
@@ -0,0 +1,334 @@
+import ctypes
+import os
+import re
+import select
+import struct
+import termios
+import threading
+import time
+import tty
+
+
+class SSC32UEmulator:
+    """
+    Software model of the Lynxmotion SSC32U board on a pseudo-terminal.
+    The emulator parses the ASCII protocol (#n Pn Sn Tn, Q, QP, R, STOP, RDFLT, SS, VER, ESC), delays every byte by
+    the transfer time of the configured baud rate and moves the servos linearly over the requested time.
+    Bytes sent while the host uses a different baud rate are dropped, like the garbage a real board receives.
+    Writing register 4 (R4=<baud>) switches the baud rate of the board, restoring the registers (RDFLT) is confirmed
+    with a carriage return unless confirm_defaults is False.
+    With an open time, bytes sent after the host opened the port are received only after that time, like the latency
+    of a USB serial adapter. Opening the port is detected with inotify, so the open time is modelled on Linux only.
+    SSC32U can be pointed at it with SSC32U(emulator.port).
+    """
+
+    version = 'SSC32-V2.50USB'
+    startup_string = ''
+    channels = 32
+    token = re.compile(r'([#PSTpst])\s*(-?\d+)')
+    speeds = {getattr(termios, 'B' + str(baud)): baud for baud in (9600, 19200, 38400, 57600, 115200)}
+    # inotify event of opening a file.
+    in_open = 0x20
+
+    def __init__(self, baud=9600, open_time=0.0):
+        """
+        :param baud: Emulated baud rate, i.e 9600.
+        :param open_time: Seconds after opening the port until the board receives bytes, i.e 0.005.
+        """
+        self.baud = baud
+        self.open_time = open_time
+        self.watch = None
+        self.ready = 0.0
+        self.opens = 0
+        self.master = None
+        self.slave = None
+        self.port = None
+        self.thread = None
+        self.running = threading.Event()
+        self.lock = threading.Lock()
+        self.servos = [(0, 0, 0.0, 0.0) for _ in range(SSC32UEmulator.channels)]
+        self.registers = SSC32UEmulator.default_registers(baud)
+        self.confirm_defaults = True
+        self.lines = []
+        self.bytes_received = 0
+        self.bytes_sent = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    @staticmethod
+    def default_registers(baud):
+        """
+        :param baud: Baud rate stored in register 4.
+        :return: Dictionary of register number and value.
+
+        Default values of the board registers.
+        """
+        registers = {0: 0, 1: 0, 2: 0, 4: baud}
+        registers.update({reg: 0 for reg in range(32, 64)})
+        registers.update({reg: 1500 for reg in range(64, 96)})
+        return registers
+
+    def start(self):
+        """
+        :return: Name of the pseudo-terminal the board is connected to.
+
+        Opens the pseudo-terminal and starts processing commands.
+        """
+        if self.thread is None:
+            self.master, self.slave = os.openpty()
+            tty.setraw(self.slave)
+            self.port = os.ttyname(self.slave)
+            if self.open_time > 0:
+                self.watch = SSC32UEmulator.watch_opens(self.port)
+            self.running.set()
+            self.thread = threading.Thread(target=self.run, name='SSC32UEmulator')
+            self.thread.daemon = True
+            self.thread.start()
+
+        return self.port
+
+    def stop(self):
+        """
+        :return: True for successful stopping.
+
+        Stops processing commands and closes the pseudo-terminal.
+        """
+        if self.thread is not None:
+            self.running.clear()
+            self.thread.join()
+            self.thread = None
+            os.close(self.master)
+            os.close(self.slave)
+            if self.watch is not None:
+                os.close(self.watch)
+                self.watch = None
+
+        return True
+
+    @staticmethod
+    def watch_opens(path):
+        """
+        :param path: Path of the pseudo-terminal.
+        :return: Non-blocking inotify file descriptor reporting every opening of the path, None without inotify.
+        """
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            watch = libc.inotify_init1(os.O_NONBLOCK)
+        except (AttributeError, OSError):
+            return None
+
+        if watch < 0:
+            return None
+        if libc.inotify_add_watch(watch, path.encode(), SSC32UEmulator.in_open) < 0:
+            os.close(watch)
+            return None
+        return watch
+
+    def opened(self):
+        """
+        :return: True if the host opened the port since the last call.
+        """
+        try:
+            events = os.read(self.watch, 4096)
+        except (BlockingIOError, OSError):
+            return False
+
+        count = 0
+        offset = 0
+        while offset < len(events):
+            (descriptor, mask, cookie, size) = struct.unpack_from('iIII', events, offset)
+            count += bool(mask & SSC32UEmulator.in_open)
+            offset += 16 + size
+
+        self.opens += count
+        return count > 0
+
+    def transfer_time(self, size):
+        """
+        :param size: Number of bytes.
+        :return: Seconds needed to transfer 'size' bytes (8N1, ten bits per byte).
+        """
+        return size * 10 / self.baud
+
+    def run(self):
+        """
+        Receives bytes from the pseudo-terminal and executes every complete line.
+        """
+        line = bytearray()
+
+        while self.running.is_set():
+            if not select.select([self.master], [], [], 0.05)[0]:
+                continue
+
+            # The opening is reported before the bytes written after it.
+            if self.watch is not None and self.opened():
+                self.ready = time.perf_counter() + self.open_time
+            time.sleep(max(0.0, self.ready - time.perf_counter()))
+
+            try:
+                data = os.read(self.master, 1024)
+            except OSError:
+                continue
+
+            host_baud = self.host_baud()
+            time.sleep(self.transfer_time(len(data)))
+
+            if host_baud not in (None, self.baud):
+                line = bytearray()
+                continue
+
+            self.bytes_received += len(data)
+
+            for byte in data:
+                if byte == ord('\r'):
+                    self.execute(line.decode(errors='replace'))
+                    line = bytearray()
+                elif byte == 0x1b:
+                    # ESC cancels the line received so far.
+                    line = bytearray()
+                else:
+                    line.append(byte)
+
+    def host_baud(self):
+        """
+        :return: Baud rate the host configured on the pseudo-terminal, None if unknown.
+        """
+        try:
+            return SSC32UEmulator.speeds.get(termios.tcgetattr(self.slave)[5])
+        except termios.error:
+            return None
+
+    def reply(self, data):
+        """
+        :param data: Bytes to be sent to the host.
+
+        Sends a reply to the host after its transfer time.
+        """
+        time.sleep(self.transfer_time(len(data)))
+        os.write(self.master, data)
+        self.bytes_sent += len(data)
+
+    def execute(self, line):
+        """
+        :param line: Received command line without carriage return.
+
+        Executes one command line of the SSC32U protocol.
+        """
+        self.lines.append(line)
+        words = line.split()
+
+        if not words:
+            return
+
+        keyword = words[0].upper()
+
+        if line.lstrip().startswith('#'):
+            self.move(line)
+        elif keyword == 'Q':
+            self.reply(b'+' if self.is_moving() else b'.')
+        elif keyword == 'QP':
+            self.reply(bytes(min(255, self.position(int(channel)) // 10) for channel in words[1::2]))
+        elif keyword == 'VER':
+            self.reply((SSC32UEmulator.version + '\r').encode())
+        elif keyword == 'SS':
+            self.reply((SSC32UEmulator.startup_string + '\r').encode())
+        elif keyword == 'RDFLT':
+            self.registers = SSC32UEmulator.default_registers(self.baud)
+            if self.confirm_defaults:
+                self.reply(b'\r')
+        elif keyword == 'STOP':
+            for channel in words[1::2]:
+                self.stop_channel(int(channel))
+        elif keyword.startswith('R'):
+            self.register(line.strip()[1:].replace(' ', ''))
+
+    def register(self, argument):
+        """
+        :param argument: Register command without the leading 'R', i.e '4' or '4=115200'.
+
+        Reads or writes a register.
+        """
+        if '=' in argument:
+            reg, value = argument.split('=', 1)
+            if reg.isdigit() and value.isdigit():
+                self.registers[int(reg)] = int(value)
+
+                if int(reg) == 4:
+                    self.baud = int(value)
+        elif argument.isdigit():
+            self.reply((str(self.registers.get(int(argument), 0)) + '\r').encode())
+
+    def move(self, line):
+        """
+        :param line: Group move, i.e '#16 P1500 T1000 #17 P600 T1000'.
+
+        Starts a linear movement of all channels in the line. The line takes as long as its largest time,
+        channels with a speed limit may take longer. Channels without a previous pulse jump to their target.
+        """
+        targets = {}
+        speeds = {}
+        group_time = 0
+        channel = None
+
+        for key, value in SSC32UEmulator.token.findall(line):
+            key = key.upper()
+            value = int(value)
+
+            if key == '#':
+                channel = value
+            elif key == 'P' and channel is not None and 0 <= channel < SSC32UEmulator.channels:
+                targets[channel] = value
+            elif key == 'S' and channel is not None:
+                speeds[channel] = value
+            elif key == 'T':
+                group_time = max(group_time, value)
+
+        now = time.perf_counter()
+
+        with self.lock:
+            for channel, target in targets.items():
+                start = self.position(channel, now)
+                duration = group_time / 1000 if start else 0.0
+
+                if start and speeds.get(channel):
+                    duration = max(duration, abs(target - start) / speeds[channel])
+
+                self.servos[channel] = (start, target, now, duration)
+
+    def position(self, channel, now=None):
+        """
+        :param channel: Channel of the board.
+        :param now: Time of the position, the current time if None.
+        :return: Pulse width of the channel at the given time, 0 if the channel is off.
+        """
+        start, target, start_time, duration = self.servos[channel]
+        now = time.perf_counter() if now is None else now
+
+        if duration <= 0 or now >= start_time + duration:
+            return target
+        else:
+            return int(start + (target - start) * (now - start_time) / duration)
+
+    def is_moving(self):
+        """
+        :return: True if a channel has not reached its target yet.
+        """
+        now = time.perf_counter()
+        return any(now < start_time + duration for (start, target, start_time, duration) in self.servos)
+
+    def stop_channel(self, channel):
+        """
+        :param channel: Channel to be stopped.
+
+        Stops the channel at its current position.
+        """
+        if 0 <= channel < SSC32UEmulator.channels:
+            with self.lock:
+                position = self.position(channel)
+                self.servos[channel] = (position, position, time.perf_counter(), 0.0)
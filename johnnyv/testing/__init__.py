@@ -0,0 +1 @@
+"""Helpers for testing and benchmarking the package without hardware."""
@@ -51,3 +51,26 @@ class TestSSC32U(TestCase):
     def test_is_closed(self):
         self.fail()
 
+    def test_persistent_session(self):
+        ser = SSC32U('loop://')
+        self.assertTrue(ser.ser.isOpen())
+        self.assertEqual(ser.transfer('VER \r'.encode(), SSC32U.terminator), b'VER ')
+        self.assertTrue(ser.ser.isOpen())
+
+    def test_open_per_command(self):
+        ser = SSC32U('loop://', persistent=False)
+        self.assertFalse(ser.ser.isOpen())
+        self.assertTrue(ser.transfer('VER \r'.encode()))
+        self.assertFalse(ser.ser.isOpen())
+
+    def test_context_manager(self):
+        with SSC32U('loop://') as ser:
+            self.assertTrue(ser.ser.isOpen())
+        self.assertFalse(ser.ser.isOpen())
+
+    def test_reconnect(self):
+        ser = SSC32U('loop://')
+        ser.close()
+        self.assertTrue(ser.reconnect())
+        self.assertTrue(ser.ser.isOpen())
+
@@ -0,0 +1,142 @@
+import threading
+import time
+from unittest import TestCase
+
+from johnnyv.core.SSC32U import SSC32U
+from johnnyv.testing.SSC32UEmulator import SSC32UEmulator
+
+
+class TestSSC32UEmulator(TestCase):
+    def setUp(self):
+        self.emulator = SSC32UEmulator(9600)
+        self.ser = SSC32U(self.emulator.start())
+        self.ser.negotiate_baud()
+        self.ser.set_execution_time(0)
+
+    def tearDown(self):
+        self.ser.close()
+        self.emulator.stop()
+        # Pseudo-terminals are reused by later emulators.
+        SSC32U.negotiated.clear()
+
+    def test_move(self):
+        self.ser.set_confirm_motion(True)
+        self.ser.set_execution_time(1)
+        self.assertTrue(self.ser.exec_command(['16:1000:0'], wait=False))
+        self.assertTrue(self.ser.exec_command(['16:2000:200'], wait=False))
+        time.sleep(0.1)
+        self.assertTrue(1000 < self.emulator.position(16) < 2000)
+        self.assertTrue(self.emulator.is_moving())
+        self.assertTrue(self.ser.wait_for_motion())
+        self.assertEqual(self.emulator.position(16), 2000)
+
+    def test_stop(self):
+        self.ser.exec_command(['16:1000:0'], wait=False)
+        self.ser.exec_command(['16:2000:10000'], wait=False)
+        time.sleep(0.05)
+        self.assertTrue(self.ser.stop_servo('16'))
+        time.sleep(0.05)
+        self.assertFalse(self.emulator.is_moving())
+        self.assertTrue(1000 < self.emulator.position(16) < 2000)
+
+    def test_open_time(self):
+        with SSC32UEmulator(9600, open_time=0.2) as emulator:
+            ser = SSC32U(emulator.port, persistent=False)
+            start = time.perf_counter()
+            self.assertEqual(ser.transfer('Q \r'.encode(), 1), b'.')
+            self.assertGreaterEqual(time.perf_counter() - start, 0.2)
+            self.assertEqual(emulator.opens, 1)
+
+    def test_emergency_stop(self):
+        self.ser.exec_command(['16:1000:0', '17:1000:0'], wait=False)
+        self.ser.exec_command(['16:2000:10000', '17:2000:10000'], wait=False)
+        threading.Timer(0.05, self.ser.emergency_stop).start()
+        # The stop releases the wait for the movement.
+        self.assertFalse(self.ser.wait_for_motion())
+        time.sleep(0.05)
+        self.assertFalse(self.emulator.is_moving())
+        self.assertTrue(self.emulator.lines[-1].startswith('STOP 0 STOP 1 '))
+        self.assertLess(self.ser.stop_latency, self.ser.timeout)
+
+    def test_emergency_stop_discards_pending(self):
+        stops = self.ser.stops
+        self.ser.lock.acquire()
+        try:
+            # Movement waiting for the command lock while the stop is issued.
+            pending = threading.Thread(target=self.ser.exec_command, args=(['16:1500:0'],))
+            pending.start()
+            time.sleep(0.05)
+            self.assertTrue(self.ser.emergency_stop([16]))
+        finally:
+            self.ser.lock.release()
+        pending.join()
+        time.sleep(0.05)
+        self.assertEqual(self.ser.stops, stops + 1)
+        self.assertEqual(self.emulator.lines[-1], 'STOP 16 ')
+        self.assertEqual(self.emulator.position(16), 0)
+
+    def test_queries(self):
+        start = time.perf_counter()
+        self.assertTrue(self.ser.is_done())
+        self.assertEqual(self.ser.get_baud(), '115200')
+        self.assertEqual(self.ser.get_val_from_reg(64), '1500')
+        self.assertTrue(self.ser.check_connection())
+        self.assertLess(time.perf_counter() - start, self.ser.timeout)
+
+    def test_reset_reg_vals(self):
+        self.emulator.registers[32] = 5
+        self.assertTrue(self.ser.reset_reg_vals())
+        self.assertEqual(self.emulator.registers[32], 0)
+        self.assertEqual(self.emulator.registers[4], 115200)
+
+    def test_reset_reg_vals_without_reply(self):
+        self.emulator.confirm_defaults = False
+        self.emulator.registers[32] = 5
+        start = time.perf_counter()
+        self.assertTrue(self.ser.reset_reg_vals())
+        self.assertLess(time.perf_counter() - start, self.ser.timeout)
+        self.assertEqual(self.emulator.registers[32], 0)
+        self.assertTrue(self.ser.is_done())
+
+    def test_query_pulse_widths(self):
+        self.ser.exec_command(['16:1500:0', '17:600:0'])
+        self.assertEqual(self.ser.query_pulse_widths([16, 17, 18]), {16: 1500, 17: 600, 18: 0})
+
+    def test_negotiate_baud(self):
+        self.assertEqual(self.ser.baud, 115200)
+        self.assertEqual(self.emulator.baud, 115200)
+        self.assertGreater(self.ser.bytes_per_second, 0)
+
+    def test_negotiate_baud_once(self):
+        probes = []
+        self.ser.probe = lambda baud: probes.append(baud) or True
+        self.assertTrue(self.ser.reconnect())
+        self.assertEqual(probes, [])
+        self.assertEqual(self.ser.ser.baudrate, 115200)
+
+        # Later connections to the port use the negotiated rate without probing.
+        ser = SSC32U(self.emulator.port)
+        self.assertEqual(ser.ser.baudrate, 115200)
+        self.assertTrue(ser.is_done())
+        ser.close()
+
+    def test_negotiate_baud_fallback(self):
+        with SSC32UEmulator(9600) as emulator:
+            # Board ignoring register writes, so it stays on 9600 baud.
+            emulator.register = lambda argument: None
+            ser = SSC32U(emulator.port)
+            self.assertEqual(ser.negotiate_baud(), 9600)
+            self.assertEqual(ser.baud, 9600)
+            self.assertTrue(ser.is_done())
+            ser.close()
+
+    def test_negotiate_baud_without_board(self):
+        # The loopback only echoes the probes, like a port without a board.
+        ser = SSC32U('loop://')
+        self.assertIsNone(ser.negotiate_baud())
+        self.assertEqual((ser.baud, ser.ser.baudrate), (9600, 9600))
+        self.assertNotIn('loop://', SSC32U.negotiated)
+        ser.close()
+
+    def test_transfer_time(self):
+        self.assertAlmostEqual(SSC32UEmulator(9600).transfer_time(960), 1.0)
@@ -0,0 +1,146 @@
+import asyncio
+import subprocess
+import sys
+from unittest import TestCase
+
+from johnnyv.core.AsyncSSC32U import AsyncSSC32U
+from johnnyv.core.Command import Command
+from johnnyv.core.Controller import Controller
+from johnnyv.core.SSC32U import SSC32U
+from johnnyv.testing.EmulatedBoards import EmulatedBoards
+from johnnyv.testing.SSC32UEmulator import SSC32UEmulator
+
+
+class TestAsyncSSC32U(TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def run_coroutine(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_transfer(self):
+        async def transfer():
+            async with AsyncSSC32U('loop://', self.loop) as ser:
+                return await ser.transfer('VER \r'.encode(), SSC32U.terminator)
+
+        self.assertEqual(self.run_coroutine(transfer()), b'VER ')
+
+    def test_running_loop(self):
+        async def open_port():
+            async with AsyncSSC32U('loop://') as ser:
+                return ser.loop
+
+        self.assertIs(self.run_coroutine(open_port()), self.loop)
+
+    def test_import(self):
+        # pySerial is imported when the port is opened, not with the driver.
+        loaded = subprocess.check_output([sys.executable, '-c',
+                                          'import sys, johnnyv.core.AsyncSSC32U; print("serial" in sys.modules)'])
+        self.assertEqual(loaded.decode().strip(), 'False')
+
+    def test_exec_command(self):
+        async def exec_command():
+            async with AsyncSSC32U('loop://', self.loop) as ser:
+                return await ser.exec_command([Command(16, 1500, 10)])
+
+        self.assertTrue(self.run_coroutine(exec_command()))
+
+    def test_concurrent_tasks(self):
+        ticks = []
+
+        async def ticker():
+            while len(ticks) < 5:
+                ticks.append(self.loop.time())
+                await asyncio.sleep(0.01)
+
+        async def exec_command():
+            async with AsyncSSC32U('loop://', self.loop) as ser:
+                return await ser.exec_command([Command(16, 1500, 100)])
+
+        results = self.run_coroutine(asyncio.gather(exec_command(), ticker()))
+
+        self.assertTrue(results[0])
+        self.assertEqual(len(ticks), 5)
+
+    def test_queries(self):
+        async def queries():
+            async with AsyncSSC32U(emulator.port, self.loop, 115200) as ser:
+                return await ser.is_done(), await ser.get_baud()
+
+        with SSC32UEmulator(115200) as emulator:
+            self.assertEqual(self.run_coroutine(queries()), (True, '115200'))
+
+    def test_emergency_stop(self):
+        async def exec_command():
+            async with AsyncSSC32U('loop://', self.loop) as ser:
+                self.loop.call_later(0.05, ser.emergency_stop, [16])
+                return await ser.exec_command([Command(16, 1500, 1000)]), ser.ser.read(ser.ser.in_waiting)
+
+        start = self.loop.time()
+        self.assertEqual(self.run_coroutine(exec_command()), (False, b' #16 P1500 T1000 \r\x1bSTOP 16 \r'))
+        self.assertLess(self.loop.time() - start, 0.5)
+
+    def test_negotiated_baud(self):
+        SSC32U.negotiated['loop://'] = 115200
+
+        try:
+            self.assertEqual(AsyncSSC32U('loop://').baud, 115200)
+            self.assertEqual(AsyncSSC32U('loop://', baud=9600).baud, 9600)
+        finally:
+            SSC32U.negotiated.pop('loop://')
+
+    def test_stop_servo(self):
+        async def stop_servo():
+            async with AsyncSSC32U('loop://', self.loop) as ser:
+                # The stop does not wait for the command lock.
+                async with ser.lock:
+                    return await ser.stop_servo(16), ser.ser.read(ser.ser.in_waiting)
+
+        self.assertEqual(self.run_coroutine(stop_servo()), (True, b'\x1bSTOP 16 \r'))
+
+    def test_controller_stop_with_boards(self):
+        saved = Controller.async_ssc32u
+        Controller.async_ssc32u = AsyncSSC32U('loop://', self.loop)
+
+        try:
+            with EmulatedBoards():
+                self.run_coroutine(Controller.async_ssc32u.open())
+                self.assertTrue(Controller.emergency_stop([16]))
+                self.assertEqual(Controller.async_ssc32u.ser.read(64), b'\x1bSTOP 16 \r')
+                self.run_coroutine(Controller.async_ssc32u.close())
+        finally:
+            Controller.async_ssc32u = saved
+
+    def test_controller_send(self):
+        saved = (Controller.boards, Controller.async_ssc32u)
+        Controller.boards = None
+        Controller.async_ssc32u = AsyncSSC32U('loop://', self.loop)
+        Controller.forget_sent()
+
+        try:
+            self.loop.call_later(0.05, Controller.emergency_stop, [16])
+            start = self.loop.time()
+            self.assertFalse(self.run_coroutine(Controller.async_send([Command(16, 1500, 1000)])))
+            self.assertLess(self.loop.time() - start, 0.5)
+            self.assertIsNone(Controller.boards)
+            self.assertNotIn(16, Controller.last_sent)
+            self.run_coroutine(Controller.async_ssc32u.close())
+        finally:
+            Controller.boards, Controller.async_ssc32u = saved
+
+    def test_get_async_ssc32u(self):
+        saved = (Controller.boards, Controller.async_ssc32u)
+        Controller.boards = None
+        Controller.async_ssc32u = None
+
+        try:
+            ssc32u = Controller.get_async_ssc32u()
+            self.assertIsNone(Controller.boards)
+            self.assertIsNone(ssc32u.ser)
+        finally:
+            Controller.boards, Controller.async_ssc32u = saved
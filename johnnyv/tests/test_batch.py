@@ -0,0 +1,49 @@
+import threading
+from unittest import TestCase
+
+from johnnyv.core.Batch import Batch
+from johnnyv.core.Command import Command
+from johnnyv.core.FrameQueue import FrameQueue
+
+
+class TestBatch(TestCase):
+    def test_add(self):
+        batch = Batch()
+        self.assertTrue(batch.add([Command(16, 1500, 0), Command(17, 1500, 0)]))
+        self.assertTrue(batch.add([Command(16, 600, 0)]))
+        self.assertEqual(len(batch), 2)
+        self.assertFalse(batch.add(['16:1500:0']))
+
+    def test_discard_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with Batch() as batch:
+                batch.add([Command(16, 1500, 0)])
+                raise RuntimeError()
+
+        self.assertEqual(len(batch), 0)
+        self.assertIsNone(batch.future)
+
+    def test_submit(self):
+        with Batch(wait=True) as batch:
+            pass
+
+        self.assertTrue(batch.future.result())
+        self.assertEqual(len(batch), 0)
+
+    def test_shared_queue(self):
+        # Batches of all threads share the frame queue of their robot, so a waiting batch returns after all frames
+        # submitted before it.
+        queue = FrameQueue()
+        batches = [Batch(queue=queue) for _ in range(4)]
+        threads = [threading.Thread(target=batch.submit) for batch in batches]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with Batch(wait=True, queue=queue):
+            pass
+
+        self.assertTrue(all(batch.future.done() and batch.future.result() for batch in batches))
+        self.assertIsNot(Batch().queue, queue)
+        queue.close()
@@ -0,0 +1,92 @@
+import time
+from unittest import TestCase
+
+from johnnyv.core.BoardRegistry import BoardRegistry
+from johnnyv.core.Command import Command
+from johnnyv.core.Controller import Controller
+from johnnyv.core.SSC32U import SSC32U
+from johnnyv.testing.EmulatedBoards import EmulatedBoards
+from johnnyv.testing.SSC32UEmulator import SSC32UEmulator
+
+
+class TestBoardRegistry(TestCase):
+    def setUp(self):
+        # Confirm the movements, so the emulated boards have executed the lines when the wait returns.
+        self.boards = EmulatedBoards([115200, 115200], confirm_motion=True)
+        self.registry = self.boards.start()
+        self.emulators = self.boards.emulators
+
+    def tearDown(self):
+        self.boards.stop()
+
+    def test_from_settings_negotiates_once(self):
+        saved = BoardRegistry.board_settings
+
+        with SSC32UEmulator(9600) as emulator:
+            BoardRegistry.board_settings = staticmethod(lambda: {'main': {'port': emulator.port, 'offset': 0}})
+
+            try:
+                first = BoardRegistry.from_settings()
+                self.assertEqual(first.primary().baud, 115200)
+                first.close()
+
+                lines = len(emulator.lines)
+                second = BoardRegistry.from_settings()
+                self.assertEqual(second.primary().baud, 115200)
+                self.assertTrue(second.primary().is_done())
+                self.assertEqual(emulator.lines[lines:], ['Q '])
+                second.close()
+            finally:
+                BoardRegistry.board_settings = saved
+                SSC32U.negotiated.pop(emulator.port, None)
+
+    def test_reconnect_forgets_sent(self):
+        Controller.remember_sent([Command(16, 1500, 1000), Command(40, 1500, 1000), Command(41, 1500, 1000)])
+
+        second = self.registry.board_of(40)
+        self.assertTrue(second.reconnect())
+        self.assertEqual(sorted(Controller.last_sent), [16])
+
+        Controller.remember_sent([Command(40, 1500, 1000), Command(41, 1500, 1000)])
+        self.assertTrue(second.emergency_stop([9]))
+        self.assertEqual(sorted(Controller.last_sent), [16, 40])
+
+    def test_add_overlapping(self):
+        self.assertFalse(self.registry.add('overlap', self.registry.primary(), 48))
+
+    def test_split(self):
+        batches = self.registry.split([Command(16, 1500, 0), Command(40, 1500, 0)])
+        self.assertEqual(list(batches.values()), [[Command(16, 1500, 0)], [Command(8, 1500, 0)]])
+        self.assertRaises(ValueError, self.registry.split, [Command(64, 1500, 0)])
+
+    def test_exec_command(self):
+        self.assertTrue(self.registry.exec_command([Command(16, 1500, 0), Command(40, 600, 0)]))
+        self.assertEqual(self.emulators[0].position(16), 1500)
+        self.assertEqual(self.emulators[1].position(8), 600)
+        self.assertEqual(self.registry.query_pulse_widths([16, 40]), {16: 1500, 40: 600})
+
+    def test_synchronized_start(self):
+        # A long line on a slow board and a short line on a fast board start moving together.
+        self.boards.add(9600)
+        slow = self.emulators[-1]
+
+        commands = [Command(64 + channel, 1500, 100) for channel in range(12)] + [Command(16, 1500, 100)]
+        self.assertTrue(self.registry.exec_command(commands, wait=False))
+        time.sleep(0.05)
+
+        starts = [slow.servos[channel][2] for channel in range(12)] + [self.emulators[0].servos[16][2]]
+        self.assertGreater(min(starts), 0)
+        self.assertLess(max(starts) - min(starts), 0.01)
+
+    def test_exec_command_unknown_pin(self):
+        self.assertFalse(self.registry.exec_command([Command(64, 1500, 0)]))
+
+    def test_emergency_stop(self):
+        self.registry.exec_command([Command(16, 1000, 0), Command(40, 1000, 0)])
+        self.registry.exec_command([Command(16, 2000, 10000), Command(40, 2000, 10000)], wait=False)
+        self.assertTrue(self.registry.emergency_stop([16, 40]))
+        self.assertFalse(self.registry.wait_for_motion())
+        time.sleep(0.05)
+        self.assertFalse(any(emulator.is_moving() for emulator in self.emulators))
+        self.assertEqual(self.emulators[1].lines[-1], 'STOP 8 ')
+        self.assertGreater(self.registry.stop_latency, 0)
@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from johnnyv.core.Command import Command
+
+
+class TestCommand(TestCase):
+    def test_data(self):
+        self.assertEqual(Command(16, 1500, 1000).data, b' #16 P1500 T1000')
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, Command, 256, 1500, 1000)
+        self.assertRaises(ValueError, Command, 16, 2600, 1000)
+        self.assertRaises(ValueError, Command, 16, 1500, -1)
+        self.assertRaises(ValueError, Command, 16, '1500', 1000)
+        self.assertRaises(ValueError, Command, True, 1500, 1000)
+
+    def test_parse(self):
+        self.assertEqual(Command.parse('16:1500:1000'), Command(16, 1500, 1000))
+        self.assertRaises(ValueError, Command.parse, '16:1500')
+        self.assertRaises(ValueError, Command.parse, '16:a:1000')
+
+    def test_encode(self):
+        self.assertEqual(Command.encode([Command(16, 1500, 1000), Command(17, 600, 500)]),
+                         b' #16 P1500 T1000 #17 P600 T500 \r')
+
+    def test_from_arrays(self):
+        self.assertEqual(Command.from_arrays([16, 17], [1500, 600], [1000, 500]),
+                         [Command(16, 1500, 1000), Command(17, 600, 500)])
+        self.assertEqual(Command.from_arrays([16, 17], [1500, 600], [1000, 500])[1].data, b' #17 P600 T500')
+        self.assertRaises(ValueError, Command.from_arrays, [16, 17], [1500], [1000, 500])
+        self.assertRaises(ValueError, Command.from_arrays, [16], [2600], [1000])
+        self.assertRaises(ValueError, Command.from_arrays, [16], [1500.0], [1000])
@@ -0,0 +1,33 @@
+import threading
+from unittest import TestCase
+
+from johnnyv.core.Command import Command
+from johnnyv.core.CommandBuffer import CommandBuffer
+
+
+class TestCommandBuffer(TestCase):
+    def test_last_writer_wins(self):
+        buffer = CommandBuffer()
+        buffer.extend([Command(16, 1500, 1000), Command(17, 1500, 1000)])
+        buffer.extend([Command(16, 600, 500)])
+        self.assertEqual(buffer.take(), [Command(16, 600, 500), Command(17, 1500, 1000)])
+        self.assertEqual(buffer.coalesced, 1)
+        self.assertEqual(len(buffer), 0)
+
+    def test_flush_window(self):
+        flushed = threading.Event()
+        buffer = CommandBuffer(0.01, flushed.set)
+        buffer.extend([Command(16, 1500, 1000)])
+        self.assertTrue(flushed.wait(1))
+
+    def test_clear(self):
+        buffer = CommandBuffer()
+        buffer.extend([Command(16, 1500, 1000)])
+        self.assertTrue(buffer.clear())
+        self.assertEqual(buffer.take(), [])
+
+    def test_clear_pins(self):
+        buffer = CommandBuffer()
+        buffer.extend([Command(16, 1500, 1000), Command(17, 1500, 1000)])
+        self.assertTrue(buffer.clear([16, 18]))
+        self.assertEqual(buffer.take(), [Command(17, 1500, 1000)])
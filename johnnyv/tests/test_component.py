@@ -1,18 +1,64 @@
 from unittest import TestCase
 
+from johnnyv.core.Batch import Batch
+from johnnyv.core.Component import Component
+from johnnyv.core.Controller import Controller
+
 
 class TestComponent(TestCase):
     def test_set_property(self):
-        self.fail()
+        left_arm = Component('left_arm')
+        (wrist, finger) = (left_arm.servo_index[21], left_arm.servo_index[23])
+        properties = [(21, 'max_pulse', 170), (21, 'min_pulse', 10), (23, 'pulse_width', 500)]
+
+        self.assertTrue(left_arm.set_property(properties))
+        self.assertEqual(len(properties), 3)
+        self.assertEqual((wrist.max_pulse, wrist.min_pulse, wrist.pulse_span, finger.pulse_width), (170, 10, 160, 500))
+
+        self.assertFalse(left_arm.set_property([(21, 'max_pulse', 160), (23, 'max_pulse', 200)]))
+        self.assertFalse(left_arm.set_property([(21, 'max_pulse', 160), (31, 'pulse_width', 500)]))
+        self.assertFalse(left_arm.set_property([(21, 'min_pulse', 165), (21, 'max_pulse', 160)]))
+        self.assertFalse(left_arm.set_property([(21, 'min_pulse', 170)]))
+        self.assertEqual((wrist.max_pulse, wrist.min_pulse), (170, 10))
+        left_arm.reset()
+        Controller.execution_list.clear()
 
     def test_reset(self):
-        self.fail()
+        left_arm = Component('left_arm')
+        servo = left_arm.servo_index[19]
+        servo.max_pulse = 100
+        servo.pulse_width = 200
+
+        self.assertTrue(left_arm.reset([(19, False)]))
+        self.assertEqual((servo.max_pulse, servo.pulse_span, servo.pulse_width), (180, 126, 1000))
+        self.assertFalse(left_arm.reset([(31, False)]))
+        Controller.execution_list.clear()
 
     def test_initialize(self):
         self.fail()
 
     def test_move_servo(self):
-        self.fail()
+        left_arm = Component('left_arm')
+        batch = Batch()
+        self.assertTrue(left_arm.move_servo([(19, 90, False), (23, 90, False)], batch))
+        self.assertEqual(len(batch), 2)
+        self.assertFalse(left_arm.move_servo([(19, 90, False), (23, 10, False)], batch))
+        self.assertFalse(left_arm.move_servo([(19, 90, False), (31, 90, False)], batch))
+        self.assertFalse(left_arm.move_servo([(19, 90)], batch))
+        self.assertEqual(len(batch), 2)
+        batch.discard()
+
+    def test_move_servos(self):
+        left_arm = Component('left_arm')
+        batch = Batch()
+        self.assertTrue(left_arm.move_servos([19, 20, 23], [90, 81, 63], batch))
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.updates, [(19, 90), (20, 81), (23, 63)])
+        self.assertFalse(left_arm.move_servos([19, 23], [90, 10], batch))
+        self.assertFalse(left_arm.move_servos([19, 31], [90, 90], batch))
+        self.assertFalse(left_arm.move_servos([19, 20], [90], batch))
+        self.assertEqual(len(batch), 3)
+        batch.discard()
 
     def test_move_motor(self):
         self.fail()
@@ -0,0 +1,107 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from johnnyv.core.Camera import Camera
+from johnnyv.core.Component import Component
+from johnnyv.core.ConfigWatcher import ConfigWatcher
+from johnnyv.core.Configuration import Configuration
+
+
+class Robot:
+    def __init__(self):
+        self.components = {key: Component(key) for key in Configuration.components()}
+        self.peripherals = {key: Camera(key) for key in Configuration.cameras()}
+
+
+class TestConfigWatcher(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open(Configuration.path) as file:
+            self.constants = json.load(file)
+        self.path = os.path.join(self.directory, 'Constants.json')
+        self.write(1)
+        self.saved = (Configuration.path, Configuration.cache_directory, Configuration.compiled)
+        Configuration.path = self.path
+        Configuration.cache_directory = os.path.join(self.directory, 'cache')
+        Configuration.compiled = None
+        self.robot = Robot()
+        self.watcher = ConfigWatcher(self.robot)
+
+    def tearDown(self):
+        Configuration.path, Configuration.cache_directory, Configuration.compiled = self.saved
+        shutil.rmtree(self.directory)
+
+    def write(self, mtime):
+        with open(self.path, 'w') as file:
+            json.dump(self.constants, file)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_unchanged(self):
+        self.assertFalse(self.watcher.check())
+        self.assertEqual(self.watcher.reloads, 0)
+
+    def test_apply_servo(self):
+        servo = self.robot.components['head'].servos[0]
+        servo.current_position = 45
+        self.constants['components']['head']['servo_list']['head_servo']['max_pulse'] = 170
+        self.constants['components']['head']['servo_list']['head_servo']['pulse_width'] = 500
+        self.write(2)
+
+        self.assertTrue(self.watcher.check())
+        self.assertEqual(servo.max_pulse, 170)
+        self.assertEqual(servo.pulse_span, 170)
+        self.assertEqual(servo.pulse_width, 500)
+        self.assertEqual(servo.current_position, 45)
+        self.assertEqual(Configuration.servos('head')[0].max_pulse, 170)
+        self.assertLess(self.watcher.reload_time, 1)
+
+    def test_apply_camera(self):
+        self.constants['cameras']['noirv2']['brightness'] = 70
+        self.write(2)
+
+        self.assertTrue(self.watcher.check())
+        self.assertEqual(self.robot.peripherals['noirv2'].brightness, 70)
+
+    def test_invalid(self):
+        self.constants['components']['head']['servo_list']['head_servo']['max_pulse'] = 'wide'
+        self.write(2)
+
+        self.assertFalse(self.watcher.check())
+        self.assertEqual(self.robot.components['head'].servos[0].max_pulse, 180)
+        self.assertEqual(Configuration.servos('head')[0].max_pulse, 180)
+
+    def test_swap_pins(self):
+        servos = self.constants['components']['left_arm']['servo_list']
+        servos['finger_servo']['pin'], servos['thumb_servo']['pin'] = 22, 23
+        servos['finger_servo']['init_pulse'] = 171
+        self.write(2)
+
+        finger = self.robot.components['left_arm'].servo_index[23]
+        thumb = self.robot.components['left_arm'].servo_index[22]
+        thumb_init = thumb.init_pulse
+        self.assertTrue(self.watcher.check())
+        self.assertEqual(finger.pin, 22)
+        self.assertEqual(finger.init_pulse, 171)
+        self.assertEqual(thumb.pin, 23)
+        self.assertEqual(thumb.init_pulse, thumb_init)
+        self.assertIs(self.robot.components['left_arm'].servo_index[22], finger)
+        self.assertIs(self.robot.components['left_arm'].servo_index[23], thumb)
+
+    def test_restart_required(self):
+        timeout = self.constants['ssc32u']['timeout']
+        self.constants['ssc32u']['timeout'] = timeout + 1
+        self.write(2)
+
+        self.assertFalse(self.watcher.check())
+        self.assertEqual(Configuration.section('ssc32u')['timeout'], timeout)
+
+        self.constants['components']['head']['servo_list']['head_servo']['max_pulse'] = 170
+        self.write(3)
+
+        self.assertFalse(self.watcher.check())
+        self.assertEqual(Configuration.section('ssc32u')['timeout'], timeout)
+        self.assertEqual(Configuration.servos('head')[0].max_pulse, 170)
+        self.assertEqual(self.robot.components['head'].servos[0].max_pulse, 170)
@@ -0,0 +1,65 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from johnnyv.core.Configuration import Configuration
+from johnnyv.core.Records import ServoRecord
+
+
+class TestConfiguration(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open(Configuration.path) as file:
+            self.constants = json.load(file)
+        self.path = os.path.join(self.directory, 'Constants.json')
+        self.write(self.constants)
+        self.saved = (Configuration.path, Configuration.cache_directory, Configuration.compiled)
+        Configuration.path = self.path
+        Configuration.cache_directory = os.path.join(self.directory, 'cache')
+        Configuration.compiled = None
+
+    def tearDown(self):
+        Configuration.path, Configuration.cache_directory, Configuration.compiled = self.saved
+        shutil.rmtree(self.directory)
+
+    def write(self, constants, mtime=None):
+        with open(self.path, 'w') as file:
+            json.dump(constants, file)
+        if mtime is not None:
+            os.utime(self.path, (mtime, mtime))
+
+    def test_records(self):
+        head = Configuration.servos('head')
+        self.assertIsInstance(head[0], ServoRecord)
+        self.assertEqual(head[0].pin, self.constants['components']['head']['servo_list']['head_servo']['pin'])
+        self.assertIsInstance(head[0].dependencies, tuple)
+        self.assertEqual(Configuration.components(), list(self.constants['components']))
+        self.assertIn('noirv2', Configuration.cameras())
+        self.assertIs(Configuration.get(), Configuration.get())
+
+    def test_cache(self):
+        Configuration.get()
+        self.assertEqual(Configuration.source, 'json')
+
+        Configuration.compiled = None
+        Configuration.get()
+        self.assertEqual(Configuration.source, 'cache')
+
+    def test_cache_unchanged_content(self):
+        Configuration.get()
+        self.write(self.constants, mtime=1)
+
+        Configuration.compiled = None
+        Configuration.get()
+        self.assertEqual(Configuration.source, 'cache')
+
+    def test_cache_changed_content(self):
+        Configuration.get()
+        self.constants['components']['head']['servo_list']['head_servo']['pulse_width'] = 500
+        self.write(self.constants, mtime=1)
+
+        Configuration.compiled = None
+        self.assertEqual(Configuration.servos('head')[0].pulse_width, 500)
+        self.assertEqual(Configuration.source, 'json')
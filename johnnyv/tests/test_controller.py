@@ -1,18 +1,60 @@
+from collections import OrderedDict
 from unittest import TestCase
 
+from johnnyv.core.Command import Command
+from johnnyv.core.Controller import Controller
+from johnnyv.core.Observer import Observer
+from johnnyv.testing.EmulatedBoards import EmulatedBoards
+
+
+class RecordingServo(Observer):
+    def __init__(self, dependencies):
+        self.dependencies = dependencies
+        self.updates = []
+
+    def update(self, pin, degree):
+        self.updates.append((pin, degree))
+
 
 class TestController(TestCase):
+    def setUp(self):
+        # Components of other tests stay registered, every test gets its own observer registry and last sent cache.
+        self.saved = (Controller.servos_to_notify, Controller.dependents, Controller.last_sent)
+        Controller.servos_to_notify = OrderedDict()
+        Controller.dependents = {}
+        Controller.last_sent = {}
+        self.first = RecordingServo([16, 17])
+        self.second = RecordingServo([17])
+
+    def tearDown(self):
+        (Controller.servos_to_notify, Controller.dependents, Controller.last_sent) = self.saved
+
     def test_add_servos(self):
-        self.fail()
+        self.assertTrue(Controller.add_servos([self.first, self.second, self.first]))
+        self.assertEqual(list(Controller.dependents[17]), [self.first, self.second])
+        self.assertEqual(Controller.servos_to_notify[self.first], (16, 17))
+        self.assertFalse(Controller.add_servos([16]))
 
     def test_remove_servos(self):
-        self.fail()
+        Controller.add_servos([self.first])
+        self.assertTrue(Controller.remove_servos(self.first))
+        self.assertFalse(Controller.remove_servos(self.first))
+        self.assertNotIn(self.first, Controller.dependents.get(16, {}))
 
     def test_remove_all_servos(self):
         self.fail()
 
     def test_update_servo_information(self):
-        self.fail()
+        Controller.add_servos([self.first, self.second])
+        Controller.update_servo_information(16, 90)
+        Controller.update_servo_information(18, 45)
+        self.assertEqual(self.first.updates, [(16, 90)])
+        self.assertEqual(self.second.updates, [])
+
+        self.second.dependencies = [16]
+        Controller.index_dependencies(self.second)
+        Controller.update_servo_information(16, 80)
+        self.assertEqual(self.second.updates, [(16, 80)])
 
     def test_convert_degree(self):
         self.fail()
@@ -52,3 +94,60 @@ class TestController(TestCase):
 
     def test_motor_management(self):
         self.fail()
+
+    def test_filter_unchanged(self):
+        Controller.forget_sent()
+        Controller.last_sent[16] = (1500, 1000)
+        bytes_saved = Controller.bytes_saved
+
+        commands = Controller.filter_unchanged([Command(16, 1500, 1000), Command(17, 1500, 1000)])
+
+        self.assertEqual(commands, [Command(17, 1500, 1000)])
+        self.assertEqual(Controller.bytes_saved - bytes_saved, len(b' #16 P1500 T1000'))
+        self.assertEqual(Controller.filter_unchanged([Command(16, 1500, 0)]), [Command(16, 1500, 0)])
+
+    def test_remember_sent(self):
+        # The same pulse with another time changes the speed of the movement, so it is sent.
+        Controller.forget_sent()
+        self.assertTrue(Controller.remember_sent([Command(16, 1500, 1000)]))
+        self.assertEqual(Controller.last_sent, {16: (1500, 1000)})
+        self.assertEqual(Controller.filter_unchanged([Command(16, 1500, 1000), Command(16, 1500, 20),
+                                                      Command(16, 1600, 1000)]),
+                         [Command(16, 1500, 20), Command(16, 1600, 1000)])
+        Controller.forget_sent()
+
+    def test_forget_sent(self):
+        Controller.last_sent.update({16: (1500, 1000), 17: (1500, 1000)})
+        self.assertTrue(Controller.forget_sent([16]))
+        self.assertEqual(Controller.last_sent, {17: (1500, 1000)})
+        self.assertTrue(Controller.forget_sent())
+        self.assertEqual(Controller.last_sent, {})
+
+    def test_emergency_stop_scope(self):
+        stops = Controller.stops
+        Controller.add_to_stack([Command(16, 1500, 1000), Command(20, 1500, 1000)])
+
+        try:
+            with EmulatedBoards():
+                self.assertTrue(Controller.emergency_stop([16]))
+                self.assertTrue(Controller.stopped_since(stops, [16, 17]))
+                self.assertFalse(Controller.stopped_since(stops, [20]))
+                self.assertEqual(list(Controller.execution_list), [Command(20, 1500, 1000)])
+                self.assertFalse(Controller.execute_frame([Command(16, 1500, 1000)], [], stops))
+
+                self.assertTrue(Controller.emergency_stop())
+                self.assertTrue(Controller.stopped_since(stops, [20]))
+                self.assertEqual(len(Controller.execution_list), 0)
+        finally:
+            Controller.execution_list.clear()
+
+    def test_emergency_stop_without_boards(self):
+        saved = (Controller.boards, Controller.async_ssc32u)
+        (Controller.boards, Controller.async_ssc32u) = (None, None)
+
+        try:
+            self.assertTrue(Controller.emergency_stop([16]))
+            self.assertIsNone(Controller.boards)
+            self.assertIsNone(Controller.async_ssc32u)
+        finally:
+            (Controller.boards, Controller.async_ssc32u) = saved
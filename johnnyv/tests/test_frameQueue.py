@@ -0,0 +1,46 @@
+import threading
+from concurrent.futures import Future
+from unittest import TestCase
+
+from johnnyv.core.Command import Command
+from johnnyv.core.Controller import Controller
+from johnnyv.core.FrameQueue import FrameQueue
+
+
+class TestFrameQueue(TestCase):
+    def setUp(self):
+        self.queue = FrameQueue()
+
+    def tearDown(self):
+        self.queue.close()
+
+    def test_submit_failure(self):
+        failed = Future()
+        failed.set_exception(ValueError('Frame failed.'))
+        self.queue.submitted.append(failed)
+
+        self.assertTrue(self.queue.submit([]).result())
+
+    def test_separate_queues(self):
+        # A frame blocked on one robot does not hold back the frames of another robot.
+        other = FrameQueue()
+        release = threading.Event()
+        send = Controller.send
+        Controller.send = staticmethod(lambda command_list, wait=True: not command_list or release.wait(5))
+
+        try:
+            blocked = self.queue.submit([Command(16, 1500, 0)])
+            self.assertTrue(other.submit([]).result(1))
+            self.assertFalse(blocked.done())
+        finally:
+            release.set()
+            Controller.send = send
+            other.close()
+
+        self.assertTrue(blocked.result())
+
+    def test_close(self):
+        self.assertTrue(self.queue.submit([]).result())
+        self.assertTrue(self.queue.close())
+        self.assertIsNone(self.queue.submitter)
+        self.assertTrue(self.queue.submit([]).result())
@@ -0,0 +1,46 @@
+import time
+from unittest import TestCase
+
+from johnnyv.core.Controller import Controller
+from johnnyv.core.GroupMove import GroupMove
+from johnnyv.core.ServoMotor import ServoMotor
+from johnnyv.testing.EmulatedBoards import EmulatedBoards
+
+
+class TestGroupMove(TestCase):
+    def setUp(self):
+        self.servos = [ServoMotor([], 16, 180, 0, 180, 0, 1000, 90),
+                       ServoMotor([], 17, 120, 30, 180, 0, 500, 45),
+                       ServoMotor([], 18, 180, 0, 180, 0, 2000, 0)]
+
+    def test_move_time(self):
+        self.assertEqual(GroupMove.move_time(self.servos[0], 180), 500)
+        self.assertEqual(GroupMove.move_time(self.servos[1], 120), 417)
+        self.assertEqual(GroupMove.move_time(self.servos[2], 0), 0)
+
+    def test_shared_time(self):
+        move = GroupMove([(self.servos[0], 180), (self.servos[1], 120), (self.servos[2], 0)])
+        self.assertEqual(move.time, 500)
+        self.assertEqual([command.time for command in move.commands], [500, 500, 500])
+        self.assertEqual([command.pulse for command in move.commands],
+                         [Controller.convert_degree(180), Controller.convert_degree(120), Controller.convert_degree(0)])
+        self.assertEqual(GroupMove([(self.servos[2], 0)], min_time=250).time, 250)
+        self.assertEqual(move.remaining(), 0.0)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, GroupMove, [(self.servos[1], 150)])
+
+    def test_repeated_execute(self):
+        Controller.forget_sent()
+
+        with EmulatedBoards([115200]) as boards:
+            emulator = boards.emulators[0]
+            move = GroupMove([(self.servos[0], 100), (self.servos[2], 20)])
+            self.assertTrue(move.execute())
+            lines = len(emulator.lines)
+            start = time.perf_counter()
+
+            self.assertTrue(move.execute(wait=False))
+            self.assertEqual(len(emulator.lines), lines)
+            self.assertGreaterEqual(move.finish, start)
+            self.assertEqual(move.remaining(), 0.0)
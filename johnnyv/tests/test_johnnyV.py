@@ -1,5 +1,10 @@
+import subprocess
+import sys
 from unittest import TestCase
 
+from johnnyv.core.JohnnyV import JohnnyV
+from johnnyv.testing.EmulatedBoards import EmulatedBoards
+
 
 class TestJohnnyV(TestCase):
     def test_initialize(self):
@@ -13,3 +18,22 @@ class TestJohnnyV(TestCase):
 
     def test_execute_stack(self):
         self.fail()
+
+    def test_apply_pose_failed(self):
+        robot = JohnnyV()
+        servo = next(servo for component in robot.components.values() for servo in component.servos)
+        position = servo.current_position
+
+        with EmulatedBoards():
+            # Without a board for the pin nothing is sent, so the servo keeps its position.
+            self.assertFalse(robot.apply_pose({servo.pin: position + 10}))
+            self.assertEqual(servo.current_position, position)
+            self.assertEqual(robot.pose_engine.position[servo.pin], position)
+
+    def test_import(self):
+        # Importing the robot must neither touch hardware nor load optional modules.
+        loaded = subprocess.check_output([sys.executable, '-c',
+                                          'import sys, johnnyv.core.JohnnyV; '
+                                          'print(sorted(set(sys.modules) & {"serial", "smbus", "jsonschema", '
+                                          '"picamera", "numpy"}))'])
+        self.assertEqual(loaded.decode().strip(), '[]')
@@ -0,0 +1,41 @@
+import threading
+import time
+from unittest import TestCase
+
+from johnnyv.core.MotionWait import MotionWait
+
+
+class Board:
+    def __init__(self, queries_until_done):
+        self.queries_until_done = queries_until_done
+
+    def is_done(self):
+        self.queries_until_done -= 1
+        return self.queries_until_done <= 0
+
+
+class TestMotionWait(TestCase):
+    def test_wait(self):
+        start = time.perf_counter()
+        self.assertTrue(MotionWait(Board(0), 50).wait())
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+
+    def test_wait_confirmed(self):
+        board = Board(3)
+        self.assertTrue(MotionWait(board, 0, confirm=True, timeout=1, poll_interval=0).wait())
+        self.assertEqual(board.queries_until_done, 0)
+
+    def test_wait_not_confirmed(self):
+        self.assertFalse(MotionWait(Board(1000), 0, confirm=True, timeout=0.01).wait())
+
+    def test_is_done(self):
+        motion = MotionWait(Board(0), 10000)
+        self.assertFalse(motion.is_done())
+        self.assertGreater(motion.remaining(), 0)
+
+    def test_interrupt(self):
+        motion = MotionWait(Board(0), 10000)
+        threading.Timer(0.05, motion.interrupt).start()
+        start = time.perf_counter()
+        self.assertFalse(motion.wait())
+        self.assertLess(time.perf_counter() - start, 1)
@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+from johnnyv.core.Command import Command
+from johnnyv.core.Controller import Controller
+from johnnyv.core.Pose import Pose
+from johnnyv.core.PoseEngine import PoseEngine
+from johnnyv.core.ServoMotor import ServoMotor
+
+
+class TestPose(TestCase):
+    def setUp(self):
+        self.servos = [ServoMotor([], 16, 180, 0, 180, 0, 1000, 90),
+                       ServoMotor([], 17, 120, 30, 180, 0, 500, 45),
+                       ServoMotor([], 40, 180, 0, 180, 0, 2000, 0)]
+        self.engine = PoseEngine(self.servos)
+
+    def test_update(self):
+        pose = Pose({16: 90})
+        pose.set(40, 10)
+        self.assertEqual(len(pose), 2)
+        self.assertEqual(pose.pins().tolist(), [16, 40])
+        self.assertRaises(ValueError, pose.set, 256, 90)
+        self.assertRaises(ValueError, pose.set, 16, '90')
+
+    def test_commands(self):
+        targets = {16: 133.7, 17: 90, 40: 180}
+        expected = [Controller.get_servo_command(servo, targets[servo.pin]) for servo in self.servos]
+        (commands, moves) = self.engine.commands(Pose(targets))
+        self.assertEqual(commands, expected)
+        self.assertEqual([servo.current_position for servo in self.servos], [90, 45, 0])
+
+        self.assertTrue(self.engine.commit(moves))
+        self.assertEqual([servo.current_position for servo in self.servos], [133.7, 90, 180])
+
+    def test_clamping(self):
+        (commands, moves) = self.engine.commands(Pose({17: 150, 18: 90}))
+        self.assertEqual((commands, moves), ([Command(17, Controller.convert_degree(120), 416)], [(17, 120)]))
+        self.engine.commit(moves)
+        self.assertEqual(self.engine.commands(Pose({17: 0}))[0], [Command(17, Controller.convert_degree(30), 500)])
+
+    def test_swapped_pins(self):
+        (self.servos[0].pin, self.servos[1].pin) = (17, 16)
+        self.assertTrue(self.engine.refresh())
+        (commands, moves) = self.engine.commands(Pose({16: 10}))
+        self.assertEqual(commands, [Command(16, Controller.convert_degree(30), 83)])
+
+        self.engine.commit(moves)
+        self.assertEqual([servo.current_position for servo in self.servos], [90, 30, 0])
+
+    def test_synchronized(self):
+        self.engine.synchronized = True
+        (commands, moves) = self.engine.commands(Pose({16: 180, 17: 120, 40: 0}))
+        self.assertEqual([command.time for command in commands], [500, 500, 500])
+
+        # A repeated pose has a shared time of 0, the servos stay where they are.
+        Controller.remember_sent(commands)
+        self.engine.commit(moves)
+        (repeated, moves) = self.engine.commands(Pose({16: 180, 17: 120, 40: 0}))
+        self.assertEqual([command.time for command in repeated], [0, 0, 0])
+        self.assertEqual([command.pulse for command in repeated], [command.pulse for command in commands])
+        Controller.remember_sent(repeated)
+        self.assertEqual(Controller.filter_unchanged(repeated), [])
+        Controller.forget_sent()
@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from johnnyv.core.ServoBank import ServoBank
+from johnnyv.core.ServoMotor import ServoMotor
+
+
+class TestServoBank(TestCase):
+    def setUp(self):
+        self.bank = ServoBank(2)
+        self.servo = ServoMotor([17], 16, 170, 10, 180, 0, 1000, 90, self.bank)
+
+    def test_view(self):
+        self.assertEqual(self.bank.max_pulse[16], 170)
+        self.assertEqual(self.servo.pulse_span, 160)
+        self.assertIsInstance(self.servo.max_pulse, int)
+        self.assertEqual(self.servo.dependencies, [17])
+        self.servo.current_position = 45.5
+        self.assertEqual(self.bank.current_position[16], 45.5)
+        self.assertEqual(self.bank.pins(), [16])
+        self.assertFalse(hasattr(self.servo, '__dict__'))
+
+    def test_swap(self):
+        other = ServoMotor([], 17, 120, 30, 180, 0, 500, 45, self.bank)
+        (self.servo.pin, other.pin) = (other.pin, self.servo.pin)
+
+        self.assertEqual((self.servo.pin, self.servo.min_pulse, self.servo.init_pulse), (17, 10, 90))
+        self.assertEqual((other.pin, other.min_pulse, other.init_pulse), (16, 30, 45))
+        self.assertEqual(self.bank.min_pulse[17], 10)
+
+    def test_move(self):
+        self.servo.pin = 40
+        self.assertEqual(self.bank.size, 41)
+        self.assertEqual(self.bank.pins(), [40])
+        self.assertEqual((self.servo.max_pulse, self.bank.max_pulse[16]), (170, 0))
+
+    def test_grow(self):
+        bank = ServoBank()
+        servos = [ServoMotor([], pin, 180, 0, 180, 0, 1000, 90, bank) for pin in range(32)]
+        self.assertEqual(bank.size, 32)
+        self.assertEqual(bank.pins(), list(range(32)))
+        self.assertEqual(servos[16].max_pulse, 180)
+        self.assertEqual(ServoMotor([], 255, 180, 0, 180, 0, 1000, 90, bank).bank.size, 256)
+
+    def test_private(self):
+        servo = ServoMotor([], 200, 180, 0, 180, 0, 1000, 90)
+        self.assertEqual(servo.bank.size, 201)
+        servo.pin = 201
+        self.assertEqual((servo.pin, servo.init_pulse), (201, 90))
+
+    def test_state_and_load(self):
+        other = ServoMotor([], 17, 120, 30, 180, 0, 500, 45, self.bank)
+        states = self.bank.state([16, 17])
+        self.assertEqual(states[1], (17, (), 120, 30, 180, 0, 500, 45, 45))
+
+        self.servo.max_pulse = 100
+        other.current_position = 60
+        self.assertTrue(self.bank.load(states))
+        self.assertEqual((self.servo.max_pulse, self.servo.pulse_span, other.current_position), (170, 160, 60))
+        self.assertTrue(self.bank.load(states, True))
+        self.assertEqual(other.current_position, 45)
+
+    def test_within_limits(self):
+        self.assertIsNone(self.bank.within_limits([16, 16], [10, 170]))
+        self.assertEqual(self.bank.within_limits([16, 16], [90, 5]), 1)
+        self.assertEqual(self.bank.within_limits([16], [float('nan')]), 0)
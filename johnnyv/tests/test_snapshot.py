@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from johnnyv.core.Component import Component
+from johnnyv.core.Snapshot import Snapshot
+
+
+class TestSnapshot(TestCase):
+    def setUp(self):
+        self.left_arm = Component('left_arm')
+        self.servo = self.left_arm.servo_index[19]
+
+    def test_immutable(self):
+        snapshot = self.left_arm.snapshot()
+        self.assertEqual(len(snapshot), len(self.left_arm.servos) + len(self.left_arm.motors))
+        self.assertRaises(AttributeError, setattr, snapshot, 'servos', ())
+        self.assertEqual(snapshot, self.left_arm.snapshot())
+
+    def test_restore(self):
+        self.servo.current_position = 45
+        snapshot = self.left_arm.snapshot()
+        self.servo.max_pulse = 100
+        self.servo.current_position = 60
+
+        self.assertTrue(self.left_arm.restore(snapshot))
+        self.assertEqual((self.servo.max_pulse, self.servo.current_position), (180, 60))
+        self.assertTrue(self.left_arm.restore(snapshot, positions=True))
+        self.assertEqual(self.servo.current_position, 45)
+
+    def test_select_and_merge(self):
+        snapshot = Snapshot.merge([self.left_arm.defaults(), Component('right_arm').defaults()])
+        self.assertEqual([pin for (pin, position) in snapshot.select([19, 24]).positions()], [19, 24])
+        self.assertEqual(dict(snapshot.positions())[19], self.servo.init_pulse)
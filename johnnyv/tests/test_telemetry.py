@@ -0,0 +1,18 @@
+import time
+from unittest import TestCase
+
+from johnnyv.core.Telemetry import Telemetry
+
+
+class TestTelemetry(TestCase):
+    def test_poll(self):
+        polls = []
+        telemetry = Telemetry(lambda: polls.append(time.perf_counter()), 100)
+        self.assertTrue(telemetry.start())
+        time.sleep(0.1)
+        self.assertTrue(telemetry.stop())
+        self.assertFalse(telemetry.is_running())
+        self.assertTrue(5 <= len(polls) <= 15)
+
+    def test_invalid_rate(self):
+        self.assertFalse(Telemetry(lambda: None, 0).start())
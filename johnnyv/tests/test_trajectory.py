@@ -0,0 +1,94 @@
+from unittest import TestCase
+
+from johnnyv.core.Controller import Controller
+from johnnyv.core.ServoBank import ServoBank
+from johnnyv.core.ServoMotor import ServoMotor
+from johnnyv.core.Trajectory import Trajectory
+from johnnyv.testing.EmulatedBoards import EmulatedBoards
+
+
+class TestTrajectory(TestCase):
+    def setUp(self):
+        self.servos = {16: ServoMotor([], 16, 180, 0, 180, 0, 1000, 90),
+                       17: ServoMotor([], 17, 120, 30, 180, 0, 500, 45)}
+
+    def test_min_jerk(self):
+        trajectory = Trajectory([(1.0, {16: 180})], self.servos, rate=50)
+        self.assertEqual(len(trajectory), 51)
+        self.assertEqual(trajectory.setpoints[0].tolist(), [90])
+        self.assertEqual(trajectory.setpoints[25].tolist(), [135])
+        self.assertEqual(trajectory.setpoints[-1].tolist(), [180])
+        self.assertTrue(all(later >= earlier for (earlier, later) in
+                            zip(trajectory.setpoints[:, 0], trajectory.setpoints[1:, 0])))
+        self.assertEqual(trajectory.frames[-1][0].data, b' #16 P2500 T20')
+
+    def test_convert_degree(self):
+        trajectory = Trajectory([(1.0, {16: 180})], self.servos, rate=50)
+        pulses = [command.pulse for frame in trajectory.frames for command in frame]
+        self.assertEqual(pulses, [Controller.convert_degree(degree) for degree in trajectory.setpoints[:, 0]])
+
+    def test_cubic(self):
+        trajectory = Trajectory([(0, {16: 0, 17: 150}), (0.5, {16: 90}), (1.0, {16: 180})], self.servos, rate=10,
+                                interpolation='cubic')
+        self.assertEqual(trajectory.pins, [16, 17])
+        self.assertEqual(trajectory.setpoints[:, 1].tolist(), [120] * 11)
+        self.assertAlmostEqual(trajectory.setpoints[5, 0], 90)
+        self.assertGreater(trajectory.setpoints[6, 0] - trajectory.setpoints[5, 0], 0)
+
+    def test_changed(self):
+        trajectory = Trajectory([(0, {16: 90, 17: 45}), (0.5, {16: 180}), (1.0, {16: 180})], self.servos, rate=10)
+        self.assertEqual([command.pin for command in trajectory.changes[0]], [16, 17])
+        self.assertEqual([command.pin for command in trajectory.changes[1]], [16])
+        self.assertEqual(trajectory.changes[-1], [])
+
+    def test_rate_lowered(self):
+        with EmulatedBoards([9600]):
+            trajectory = Trajectory([(0, {16: 0, 17: 30}), (1.0, {16: 180, 17: 120})], self.servos, rate=50)
+            self.assertTrue(trajectory.prepare())
+            self.assertLess(trajectory.rate, 50)
+            self.assertEqual(len(trajectory), trajectory.rate + 1)
+            self.assertTrue(all(board.transfer_time(len(data)) * trajectory.rate <= 1
+                                for line in trajectory.lines for (board, data, duration) in line))
+
+    def test_failing_board(self):
+        class FailingBoard:
+            def transfer_time(self, size):
+                return size * 10 / 115200
+
+            def exec_line(self, data, duration, wait=True):
+                raise OSError('Write failed.')
+
+            def close(self):
+                return True
+
+        with EmulatedBoards() as boards:
+            boards.registry.add('main', FailingBoard(), 0)
+            trajectory = Trajectory([(0.2, {16: 180})], self.servos, rate=50)
+            self.assertRaises(OSError, trajectory.play)
+            self.assertTrue(trajectory.finished.is_set())
+            self.assertIsNone(trajectory.stream)
+            self.assertEqual(trajectory.sent, -1)
+            self.assertEqual(self.servos[16].current_position, 90)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, Trajectory, [(1.0, {18: 90})], self.servos)
+        self.assertRaises(ValueError, Trajectory, [(1.0, {16: 90}), (0.5, {16: 0})], self.servos)
+        self.assertRaises(ValueError, Trajectory, [(1.0, {16: 90})], self.servos, interpolation='linear')
+
+    def test_play(self):
+        bank = ServoBank()
+        servos = {16: ServoMotor([], 16, 180, 0, 180, 0, 1000, 90, bank),
+                  40: ServoMotor([], 40, 180, 0, 180, 0, 1000, 90, bank)}
+
+        with EmulatedBoards([115200, 115200], confirm_motion=True) as boards:
+            emulators = boards.emulators
+            trajectory = Trajectory([(0.2, {16: 180, 40: 0})], servos, rate=50)
+            self.assertTrue(trajectory.play())
+            self.assertTrue(Controller.boards.wait_for_motion())
+
+            second = Controller.boards.board_of(40)
+            self.assertEqual([data for line in trajectory.lines for (board, data, duration) in line
+                              if board is second][-1], b' #8 P500 T20 \r')
+            self.assertEqual((emulators[0].position(16), emulators[1].position(8)), (2500, 500))
+            self.assertEqual((servos[16].current_position, servos[40].current_position), (180, 0))
+            self.assertEqual(Controller.last_sent[40], (500, 20))
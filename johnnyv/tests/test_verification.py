@@ -1,6 +1,36 @@
+import copy
 from unittest import TestCase
 
+from johnnyv.core.Configuration import Configuration
+from johnnyv.core.Verification import Verification
+
 
 class TestVerification(TestCase):
+    def setUp(self):
+        self.constants = copy.deepcopy(Configuration.constants())
+        self.servos = self.constants['components']['left_arm']['servo_list']
+
     def test_validate(self):
         self.fail()
+
+    def test_memoized(self):
+        Verification.clear()
+        self.assertTrue(Verification.validate(self.constants))
+        validator = Verification.validator
+        self.assertTrue(Verification.validate(copy.deepcopy(self.constants)))
+        self.assertIs(Verification.validator, validator)
+        self.assertEqual(len(Verification.results), 1)
+
+    def test_double_used_pin(self):
+        self.servos['finger_servo']['pin'] = self.constants['components']['head']['servo_list']['head_servo']['pin']
+        self.assertFalse(Verification.validate(self.constants))
+
+    def test_double_used_color_scheme(self):
+        self.servos['finger_servo']['color_scheme'] = self.servos['thumb_servo']['color_scheme']
+        self.assertFalse(Verification.validate(self.constants))
+
+    def test_schema_failure(self):
+        self.servos['finger_servo']['max_pulse'] = 200
+        (valid, message) = Verification.check(self.constants)
+        self.assertFalse(valid)
+        self.assertIn('greater than the maximum', message)
@@ -72,5 +72,6 @@ setuptools.setup(
 
     install_requires=[
         "testpackage ~= 2.26",
+        "numpy >= 1.13",
     ]
 )